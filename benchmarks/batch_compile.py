@@ -0,0 +1,81 @@
+# Measures how long compiling every program of some directories takes with a new ooplc process for each of
+# them against a single ooplc process that compiles all of them across a pool of workers.
+#
+# Usage: python -m benchmarks.batch_compile [paths...]
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+
+from src.batch_compile import expand_inputs
+
+default_paths = ["goodExamples", "revisionExamples"]
+
+
+def measure_processes(paths: list[str], runs: int) -> float:
+    """
+    Get the shortest time in seconds that compiling every file takes with an ooplc process for each of them.
+
+    Arguments:
+    paths: list[str] -- Paths of OOPL source files and directories.
+    runs: int -- Number of times to compile all of them.
+    """
+    best = float("inf")
+    with tempfile.TemporaryDirectory() as output_dir:
+        for _ in range(runs):
+            start = time.perf_counter()
+            for source in expand_inputs(paths):
+                subprocess.run(
+                    [
+                        sys.executable,
+                        "ooplc.py",
+                        str(source),
+                        "-o",
+                        f"{output_dir}/{source.stem}.ooplobj",
+                    ],
+                    check=True,
+                )
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure_batch(paths: list[str], jobs: int | None, runs: int) -> float:
+    """
+    Get the shortest time in seconds that a single ooplc process takes to compile every file.
+
+    Arguments:
+    paths: list[str] -- Paths of OOPL source files and directories.
+    jobs: int | None -- Number of worker processes, or None for one per CPU.
+    runs: int -- Number of times to compile all of them.
+    """
+    options = [] if jobs is None else ["-j", str(jobs)]
+    best = float("inf")
+    with tempfile.TemporaryDirectory() as output_dir:
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run(
+                [sys.executable, "ooplc.py", *paths, "-o", output_dir, *options],
+                check=True,
+                stdout=subprocess.DEVNULL,
+            )
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument("paths", nargs="*", default=default_paths)
+    argparser.add_argument("-n", "--runs", type=int, default=3)
+    args = argparser.parse_args()
+
+    files = len(expand_inputs(args.paths))
+    processes = measure_processes(args.paths, args.runs)
+    print(f"{files} files")
+    print(f"{'mode':<24}{'ms':>10}{'speedup':>10}")
+    print(f"{'process per file':<24}{processes * 1000:>10.1f}{1:>9.2f}x")
+    for jobs in [1, None]:
+        batch = measure_batch(args.paths, jobs, args.runs)
+        mode = "batch, 1 job" if jobs == 1 else "batch, 1 job per CPU"
+        print(f"{mode:<24}{batch * 1000:>10.1f}{processes / batch:>9.2f}x")
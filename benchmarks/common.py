@@ -0,0 +1,66 @@
+import contextlib
+import io
+import sys
+
+from src.lexer import Lexer
+from src.parser import Parser
+from src.loader import load
+from src.vm import VM
+
+
+def compile_source(source: str) -> list[str]:
+    """
+    Compile OOPL source code in memory and get the lines of the resulting object file.
+
+    Arguments:
+    source: str -- Contents of an OOPL source file.
+    """
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        parser = Parser(Lexer(), False)
+        parser.parse(source)
+        parser.print_object()
+    return output.getvalue().splitlines()
+
+
+def compile_object(source: str) -> bytes:
+    """
+    Compile OOPL source code in memory and get the resulting binary object file.
+
+    Arguments:
+    source: str -- Contents of an OOPL source file.
+    """
+    output = io.BytesIO()
+    parser = Parser(Lexer(), False)
+    parser.parse(source)
+    parser.write_object(output)
+    return output.getvalue()
+
+
+def load_vm(lines: list[str]) -> VM:
+    """
+    Get a VM ready to run the given object file.
+
+    Arguments:
+    lines: list[str] -- Lines of the object file.
+    """
+    vm = VM()
+    load(vm, lines)
+    return vm
+
+
+def run_quietly(vm: VM, stdin: str) -> None:
+    """
+    Run a program feeding it a fixed input and discarding its output.
+
+    Arguments:
+    vm: VM -- VM with the program already loaded.
+    stdin: str -- Text that the program will read.
+    """
+    previous_stdin = sys.stdin
+    sys.stdin = io.StringIO(stdin)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            vm.run()
+    finally:
+        sys.stdin = previous_stdin
@@ -0,0 +1,60 @@
+# Measures how long compiling every program of some directories takes with an ooplc process for each of them
+# when the object files are compiled, against when they are already in the compilation cache.
+#
+# Usage: python -m benchmarks.compile_cache [paths...]
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+
+from src.batch_compile import expand_inputs
+
+default_paths = ["goodExamples", "revisionExamples"]
+
+
+def measure(paths: list[str], options: list[str], runs: int) -> float:
+    """
+    Get the shortest time in seconds that compiling every file takes with an ooplc process for each of them.
+
+    Arguments:
+    paths: list[str] -- Paths of OOPL source files and directories.
+    options: list[str] -- Options given to every ooplc process.
+    runs: int -- Number of times to compile all of them.
+    """
+    best = float("inf")
+    with tempfile.TemporaryDirectory() as output_dir:
+        for _ in range(runs):
+            start = time.perf_counter()
+            for source in expand_inputs(paths):
+                subprocess.run(
+                    [
+                        sys.executable,
+                        "ooplc.py",
+                        str(source),
+                        "-o",
+                        f"{output_dir}/{source.stem}.ooplobj",
+                        *options,
+                    ],
+                    check=True,
+                )
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument("paths", nargs="*", default=default_paths)
+    argparser.add_argument("-n", "--runs", type=int, default=3)
+    args = argparser.parse_args()
+
+    files = len(expand_inputs(args.paths))
+    compiled = measure(args.paths, ["--no-cache"], args.runs)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # The first run fills the cache, so the best one only has hits.
+        cached = measure(args.paths, ["--cache-dir", cache_dir], args.runs + 1)
+    print(f"{files} files")
+    print(f"{'mode':<24}{'ms':>10}{'speedup':>10}")
+    print(f"{'compiled':<24}{compiled * 1000:>10.1f}{1:>9.2f}x")
+    print(f"{'cached':<24}{cached * 1000:>10.1f}{compiled / cached:>9.2f}x")
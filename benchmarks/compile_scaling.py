@@ -0,0 +1,79 @@
+# Measures how the compile time grows with the number of distinct constants and jump targets of a program.
+#
+# Usage: python -m benchmarks.compile_scaling [-s SIZES...]
+
+import argparse
+import contextlib
+import io
+import time
+
+from src.lexer import Lexer
+from src.parser import Parser
+
+default_sizes = [100, 200, 400, 800]
+
+# Statements per function, so the temporaries of a function fit in its memory.
+statements_per_function = 50
+
+
+def generate_program(size: int) -> str:
+    """
+    Get the source of a program with a given amount of distinct int, float and string constants, and an if
+    statement every few of them that adds new jump targets.
+
+    Arguments:
+    size: int -- Number of distinct constants of each type.
+    """
+    source = []
+    functions = 0
+    for start in range(0, size, statements_per_function):
+        source.append(
+            f"void f{functions}() {{\nint a; float b; string c;\na = 0; b = 0.0;"
+        )
+        for constant in range(start, min(start + statements_per_function, size)):
+            source.append(
+                f'a = a + {constant + 1}; b = b * {constant}.5; c = "s{constant}";'
+            )
+            if constant % 10 == 0:
+                source.append("if (a > b) {\na = a - 1;\n}")
+        source.append("}")
+        functions += 1
+    source.append("int main() {")
+    source.extend(f"f{function}();" for function in range(functions))
+    source.append("return 0;\n}")
+    return "\n".join(source)
+
+
+def measure(source: str, runs: int) -> float:
+    """
+    Get the shortest time in seconds that compiling a program takes, not counting building the parser.
+
+    Arguments:
+    source: str -- Contents of an OOPL source file.
+    runs: int -- Number of compilations to measure.
+    """
+    best = float("inf")
+    for _ in range(runs):
+        parser = Parser(Lexer(), False)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            parser.parse(source)
+            parser.print_object()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument("-s", "--sizes", type=int, nargs="+", default=default_sizes)
+    argparser.add_argument("-n", "--runs", type=int, default=5)
+    args = argparser.parse_args()
+
+    print(f"{'constants':>10}{'lines':>8}{'ms':>10}{'us/line':>10}")
+    for size in args.sizes:
+        source = generate_program(size)
+        lines = source.count("\n") + 1
+        elapsed = measure(source, args.runs)
+        print(
+            f"{size:>10}{lines:>8}{elapsed * 1000:>10.1f}{elapsed * 1e6 / lines:>10.1f}"
+        )
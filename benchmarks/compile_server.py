@@ -0,0 +1,84 @@
+# Measures how long compiling small programs takes with a new ooplc process for each of them against sending
+# them to a running compile server.
+#
+# Usage: python -m benchmarks.compile_server [files...]
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src.compile_server import CompileClient
+
+default_files = [
+    "revisionExamples/calcFibFact.oopl",
+    "revisionExamples/operMat.oopl",
+    "revisionExamples/sortFindVector.oopl",
+]
+
+
+def measure_processes(file: str, runs: int) -> float:
+    """
+    Get the average time in seconds that an ooplc process takes to compile a file.
+
+    Arguments:
+    file: str -- Path of the OOPL source file.
+    runs: int -- Number of compilations to measure.
+    """
+    with tempfile.TemporaryDirectory() as output_dir:
+        output = os.path.join(output_dir, "a.ooplobj")
+        start = time.perf_counter()
+        for _ in range(runs):
+            subprocess.run([sys.executable, "ooplc.py", file, "-o", output], check=True)
+        return (time.perf_counter() - start) / runs
+
+
+def measure_server(client: CompileClient, file: str, runs: int) -> float:
+    """
+    Get the average time in seconds that the compile server takes to answer a request for a file.
+
+    Arguments:
+    client: CompileClient -- Connection to the server.
+    file: str -- Path of the OOPL source file.
+    runs: int -- Number of compilations to measure.
+    """
+    start = time.perf_counter()
+    for _ in range(runs):
+        header, _ = client.compile(Path(file))
+        assert header["status"] == "ok", header
+    return (time.perf_counter() - start) / runs
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument("files", nargs="*", default=default_files)
+    argparser.add_argument("-n", "--runs", type=int, default=20)
+    args = argparser.parse_args()
+
+    with tempfile.TemporaryDirectory() as socket_dir:
+        socket_path = Path(socket_dir) / "ooplc.sock"
+        server = subprocess.Popen(
+            [sys.executable, "ooplc.py", "--serve", str(socket_path)]
+        )
+        try:
+            client = None
+            while client is None:
+                try:
+                    client = CompileClient(socket_path)
+                except (ConnectionRefusedError, FileNotFoundError):
+                    # The server is still starting.
+                    time.sleep(0.01)
+            print(f"{'program':<40}{'process ms':>12}{'server ms':>12}{'speedup':>10}")
+            for file in args.files:
+                process = measure_processes(file, args.runs)
+                served = measure_server(client, file, args.runs)
+                print(
+                    f"{file:<40}{process * 1000:>12.1f}{served * 1000:>12.1f}{process / served:>9.1f}x"
+                )
+            client.close()
+        finally:
+            server.terminate()
+            server.wait()
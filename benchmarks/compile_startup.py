@@ -0,0 +1,86 @@
+# Measures how long ooplc takes to compile small programs when the parse tables have to be generated (cold)
+# against when they are loaded from the cache (warm), both for a whole ooplc process and for building the
+# parser alone.
+#
+# Usage: python -m benchmarks.compile_startup [files...]
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src.lexer import Lexer
+from src.parser import Parser
+
+default_files = [
+    "revisionExamples/calcFibFact.oopl",
+    "revisionExamples/operMat.oopl",
+    "revisionExamples/sortFindVector.oopl",
+]
+
+
+def measure_process(file: str, tables_dir: Path, cold: bool, runs: int) -> float:
+    """
+    Get the shortest time in seconds that an ooplc process takes to compile a file.
+
+    Arguments:
+    file: str -- Path of the OOPL source file.
+    tables_dir: Path -- Cache directory given to ooplc.
+    cold: bool -- Whether to empty the cache before each run.
+    runs: int -- Number of compilations to measure.
+    """
+    env = {**os.environ, "XDG_CACHE_HOME": str(tables_dir)}
+    best = float("inf")
+    with tempfile.TemporaryDirectory() as output_dir:
+        output = os.path.join(output_dir, "a.ooplobj")
+        for _ in range(runs):
+            if cold:
+                for table in tables_dir.glob("ooplc/parsetab-*"):
+                    table.unlink()
+            start = time.perf_counter()
+            subprocess.run(
+                [sys.executable, "ooplc.py", file, "-o", output], env=env, check=True
+            )
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure_parser(tables_dir: Path | None, runs: int) -> float:
+    """
+    Get the shortest time in seconds that building the lexer and the parser takes.
+
+    Arguments:
+    tables_dir: Path | None -- Directory of the cached tables, or None to generate them.
+    runs: int -- Number of parsers to build.
+    """
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        Parser(Lexer(), False, tables_dir=tables_dir)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument("files", nargs="*", default=default_files)
+    argparser.add_argument("-n", "--runs", type=int, default=5)
+    args = argparser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        tables_dir = Path(cache_dir)
+        cold = measure_parser(None, args.runs)
+        measure_parser(tables_dir / "ooplc", 1)
+        warm = measure_parser(tables_dir / "ooplc", args.runs)
+        print(f"parser build: cold {cold * 1000:.1f} ms, warm {warm * 1000:.1f} ms\n")
+
+        print(f"{'program':<40}{'cold ms':>10}{'warm ms':>10}{'speedup':>10}")
+        for file in args.files:
+            cold = measure_process(file, tables_dir, True, args.runs)
+            warm = measure_process(file, tables_dir, False, args.runs)
+            print(
+                f"{file:<40}{cold * 1000:>10.1f}{warm * 1000:>10.1f}{cold / warm:>9.2f}x"
+            )
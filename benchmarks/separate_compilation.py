@@ -0,0 +1,95 @@
+# Measures how long rebuilding a program split in relocatable modules takes when only one of the modules
+# changed, against compiling every module again, both followed by linking them with oopllink.
+#
+# Usage: python -m benchmarks.separate_compilation [directory] [changed module]
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src.batch_compile import expand_inputs
+
+
+def compile_module(source: Path, output_dir: str) -> None:
+    """
+    Compile a source file as a relocatable module with its own ooplc process.
+
+    Arguments:
+    source: Path -- Path of the OOPL source file.
+    output_dir: str -- Directory of the modules.
+    """
+    subprocess.run(
+        [
+            sys.executable,
+            "ooplc.py",
+            "-c",
+            str(source),
+            "-o",
+            f"{output_dir}/{source.stem}.ooplmod",
+        ],
+        check=True,
+    )
+
+
+def link(sources: list[Path], output_dir: str) -> None:
+    """
+    Link the modules of every source file into a program.
+
+    Arguments:
+    sources: list[Path] -- Paths of the OOPL source files.
+    output_dir: str -- Directory of the modules.
+    """
+    subprocess.run(
+        [
+            sys.executable,
+            "oopllink.py",
+            *[f"{output_dir}/{source.stem}.ooplmod" for source in sources],
+            "-o",
+            f"{output_dir}/a.ooplobj",
+        ],
+        check=True,
+    )
+
+
+def measure(sources: list[Path], changed: list[Path], runs: int) -> float:
+    """
+    Get the shortest time in seconds that compiling some of the modules again and linking all of them takes.
+
+    Arguments:
+    sources: list[Path] -- Paths of the OOPL source files of the program.
+    changed: list[Path] -- Paths of the source files to compile again.
+    runs: int -- Number of times to rebuild the program.
+    """
+    best = float("inf")
+    with tempfile.TemporaryDirectory() as output_dir:
+        for source in sources:
+            compile_module(source, output_dir)
+        for _ in range(runs):
+            start = time.perf_counter()
+            for source in changed:
+                compile_module(source, output_dir)
+            link(sources, output_dir)
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument("directory", nargs="?", default="moduleExamples")
+    argparser.add_argument("changed", nargs="?", default="main.oopl")
+    argparser.add_argument("-n", "--runs", type=int, default=3)
+    args = argparser.parse_args()
+
+    sources = expand_inputs([args.directory])
+    changed = [source for source in sources if source.name == args.changed]
+    full = measure(sources, sources, args.runs)
+    incremental = measure(sources, changed, args.runs)
+    print(f"{len(sources)} modules, {args.changed} changed")
+    print(f"{'rebuild':<24}{'ms':>10}{'speedup':>10}")
+    print(f"{'every module':<24}{full * 1000:>10.1f}{1:>9.2f}x")
+    print(
+        f"{'changed module':<24}{incremental * 1000:>10.1f}{full / incremental:>9.2f}x"
+    )
@@ -0,0 +1,118 @@
+# Measures the time from loading an object file until the program finishes, comparing the text object files
+# loaded eagerly with readlines() against the binary ones mapped in memory and decoded lazily.
+#
+# Usage: python -m benchmarks.startup_latency [files...]
+
+import argparse
+import os
+import tempfile
+import time
+
+from src.loader import load, load_file
+from src.vm import VM
+
+from .common import compile_object, compile_source, run_quietly
+
+default_files = [
+    "revisionExamples/calcFibFact.oopl",
+    "revisionExamples/operMat.oopl",
+    "revisionExamples/sortFindVector.oopl",
+]
+default_input = "2\n3\n4\n5\n6\n"
+
+
+def generate_program(functions: int) -> str:
+    """
+    Get the source of a program with many functions where only one of them is called, like large programs
+    that only use a fraction of their code in each run.
+
+    Arguments:
+    functions: int -- Number of functions of the program.
+    """
+    source = []
+    for function in range(functions):
+        source.append(f"int f{function}(int a) {{\nint b;\nb = a * 2;")
+        source.append("if (b > 10) {\nb = b - 1;\n} else {\nb = b + 1;\n}")
+        source.append("return a + b;\n}")
+    source.append('int main() {\nprint(f0(1), "\\n");\nreturn 0;\n}')
+    return "\n".join(source)
+
+
+def eager_text(path: str) -> None:
+    """
+    Load a text object file and decode all of its quadruples before running it.
+
+    Arguments:
+    path: str -- Path of the object file.
+    """
+    vm = VM()
+    with open(path, "r") as file:
+        load(vm, file.readlines())
+    vm.decode()
+    run_quietly(vm, default_input)
+
+
+def lazy_binary(path: str) -> None:
+    """
+    Map a binary object file and run it, decoding each function when it is called.
+
+    Arguments:
+    path: str -- Path of the object file.
+    """
+    vm = VM()
+    load_file(vm, path)
+    run_quietly(vm, default_input)
+
+
+def measure(launch, path: str, runs: int) -> float:
+    """
+    Get the shortest time in seconds that loading and running a program takes.
+
+    Arguments:
+    launch -- Function that loads and runs the object file.
+    path: str -- Path of the object file.
+    runs: int -- Number of runs to measure.
+    """
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        launch(path)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument("files", nargs="*", default=default_files)
+    argparser.add_argument("-n", "--runs", type=int, default=50)
+    argparser.add_argument(
+        "-f",
+        "--functions",
+        type=int,
+        default=25,
+        help="functions of the generated program that only calls one of them",
+    )
+    args = argparser.parse_args()
+
+    programs = []
+    for file_name in args.files:
+        with open(file_name, "r") as file:
+            programs.append((file_name, file.read()))
+    programs.append(
+        (f"generated ({args.functions} functions)", generate_program(args.functions))
+    )
+
+    print(f"{'program':<40}{'text ms':>10}{'binary ms':>12}{'speedup':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, source in programs:
+            text_path = os.path.join(directory, "program.txt")
+            binary_path = os.path.join(directory, "program.obj")
+            with open(text_path, "w") as file:
+                file.write("\n".join(compile_source(source)) + "\n")
+            with open(binary_path, "wb") as file:
+                file.write(compile_object(source))
+            text = measure(eager_text, text_path, args.runs)
+            binary = measure(lazy_binary, binary_path, args.runs)
+            print(
+                f"{name:<40}{text * 1000:>10.3f}{binary * 1000:>12.3f}{text / binary:>9.1f}x"
+            )
@@ -0,0 +1,72 @@
+# Measures how many quadruples per second the VM executes.
+#
+# Usage: python -m benchmarks.vm_throughput [files...]
+
+import argparse
+import time
+
+from .common import compile_source, load_vm, run_quietly
+
+default_files = [
+    "revisionExamples/operMat.oopl",
+    "revisionExamples/sortFindVector.oopl",
+]
+default_input = "2\n3\n4\n5\n6\n"
+
+
+def count_quads(lines: list[str]) -> int:
+    """
+    Get the number of quadruples executed by one run of a program.
+
+    Arguments:
+    lines: list[str] -- Lines of the object file.
+    """
+    vm = load_vm(lines)
+    vm.decode()
+    counter = [0]
+
+    def counted(step):
+        def wrapper():
+            counter[0] += 1
+            return step()
+
+        return wrapper
+
+    vm.program = [counted(step) for step in vm.program]
+    run_quietly(vm, default_input)
+    return counter[0]
+
+
+def measure(lines: list[str], runs: int) -> float:
+    """
+    Get the average time in seconds that running a program takes, not counting the loading and decoding.
+
+    Arguments:
+    lines: list[str] -- Lines of the object file.
+    runs: int -- Number of runs to average.
+    """
+    total = 0.0
+    for _ in range(runs):
+        vm = load_vm(lines)
+        vm.decode()
+        start = time.perf_counter()
+        run_quietly(vm, default_input)
+        total += time.perf_counter() - start
+    return total / runs
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument("files", nargs="*", default=default_files)
+    argparser.add_argument("-n", "--runs", type=int, default=50)
+    args = argparser.parse_args()
+
+    print(f"{'program':<40}{'quads/run':>12}{'ms/run':>10}{'quads/s':>14}")
+    for file_name in args.files:
+        with open(file_name, "r") as file:
+            lines = compile_source(file.read())
+        quads = count_quads(lines)
+        elapsed = measure(lines, args.runs)
+        print(
+            f"{file_name:<40}{quads:>12}{elapsed * 1000:>10.3f}{quads / elapsed:>14,.0f}"
+        )
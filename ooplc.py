@@ -11,14 +11,19 @@
 
 # Libraries
 import argparse
+import io
 import sys
+import time
 from pathlib import Path
 from math import floor, ceil
 
 # Internal modules
-from src.lexer import Lexer
-from src.parser import Parser
-from src.utils.errors import CError
+# The parser is only imported when something has to be compiled, since loading it takes longer than getting
+# an object file from the cache.
+from src.compile_cache import CompileCache, cache_key, default_cache_dir
+from src.passes.pass_manager import PassManager, levels
+from src.utils.enums import Passes
+from src.utils.errors import CError, find_column
 
 
 def clamp(num: int, min_num: int, max_num: int) -> int:
@@ -31,20 +36,38 @@ def printing_range(line_number: int, number_of_lines: int, context: int) -> rang
     return range(min_num, max_num + 1)
 
 
-def find_column(file_content: list[str], lexpos: int, line_no: int) -> int:
-    for line in range(0, line_no - 1):
-        lexpos -= len(file_content[line])
-    return lexpos
-
-
 if __name__ == "__main__":
     argparser = argparse.ArgumentParser()
-    argparser.add_argument("file", help="OOPL source file")
+    argparser.add_argument(
+        "files",
+        help="OOPL source files, or directories to compile every OOPL source file in them",
+        nargs="*",
+    )
     argparser.add_argument(
         "-o",
         "--output",
-        help="object file to generate, defaults to a.ooplobj",
-        default="a.ooplobj",
+        help="object file to generate, defaults to a.ooplobj, or a.ooplmod with -c; when compiling several "
+        "files, the directory for their object files, which defaults to the directory of each source file",
+    )
+    argparser.add_argument(
+        "-c",
+        "--module",
+        dest="relocatable",
+        help="generate a relocatable module, which can call the functions it only declares, to be linked "
+        "with other modules by oopllink",
+        action="store_true",
+    )
+    argparser.add_argument(
+        "-j",
+        "--jobs",
+        help="number of processes that compile several files, defaults to one per CPU",
+        type=int,
+    )
+    argparser.add_argument(
+        "-t",
+        "--text",
+        help="generate a text object file, meant for debugging",
+        action="store_true",
     )
     argparser.add_argument(
         "-v",
@@ -52,23 +75,206 @@ if __name__ == "__main__":
         help="show additional information of the compilation process",
         action="store_true",
     )
+    argparser.add_argument(
+        "-O",
+        dest="level",
+        help="optimization level, from 0 for faster compilation to 2 for faster programs, defaults to 2",
+        type=int,
+        choices=sorted(levels),
+        default=2,
+    )
+    argparser.add_argument(
+        "--pass",
+        dest="enabled",
+        help="run an optimization pass even if the level does not include it",
+        choices=[optimization.value for optimization in Passes],
+        action="append",
+        default=[],
+    )
+    argparser.add_argument(
+        "--no-pass",
+        dest="disabled",
+        help="skip an optimization pass even if the level includes it",
+        choices=[optimization.value for optimization in Passes],
+        action="append",
+        default=[],
+    )
+    argparser.add_argument(
+        "--time-passes",
+        help="show how long each optimization pass took and how many quadruples it removed",
+        action="store_true",
+    )
+    argparser.add_argument(
+        "--cache-dir",
+        help="directory where object files are cached by the hash of their source, the compiler and the "
+        "flags, defaults to objects inside the cache directory of ooplc",
+        type=Path,
+    )
+    argparser.add_argument(
+        "--cache-size",
+        help="megabytes the cached object files can take before the least recently used ones are removed, "
+        "defaults to 64",
+        type=int,
+        default=64,
+    )
+    argparser.add_argument(
+        "--no-cache",
+        help="always compile, without looking for the object files in the cache or adding them to it",
+        action="store_true",
+    )
+    argparser.add_argument(
+        "--cache-stats",
+        help="show the cache hits and misses of this run and since the cache was created",
+        action="store_true",
+    )
+    argparser.add_argument(
+        "--serve",
+        help="keep compiling the requests received through a Unix domain socket at this path",
+        metavar="SOCKET",
+    )
     args = argparser.parse_args()
-    # To execute lexer and parser, user will add the file to be tested as an argument
+    if args.serve is not None:
+        from src.compile_server import CompileServer
+        from src.parse_tables import default_tables_dir
+
+        server = CompileServer(Path(args.serve), default_tables_dir())
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        sys.exit(0)
+    if args.cache_size < 0:
+        argparser.error("the size of the cache can't be negative")
+    cache = None
+    if not args.no_cache:
+        cache = CompileCache(
+            args.cache_dir or default_cache_dir(), args.cache_size * 1024 * 1024
+        )
+    if len(args.files) == 0:
+        if args.cache_stats and cache is not None:
+            cache.print_stats(0, 0)
+            sys.exit(0)
+        argparser.error("the following arguments are required: files")
+    if args.jobs is not None and args.jobs < 1:
+        argparser.error("the number of jobs must be at least 1")
+    if args.relocatable and args.text:
+        argparser.error("relocatable modules can't be text object files")
+    enabled = [Passes(optimization) for optimization in args.enabled]
+    disabled = [Passes(optimization) for optimization in args.disabled]
+    # The information of the compilation process and the times of the passes come from compiling, so they
+    # are never taken from the cache.
+    if args.verbose or args.time_passes:
+        cache = None
 
-    # Build the lexer object
-    lexer = Lexer()
+    if len(args.files) > 1 or Path(args.files[0]).is_dir():
+        from src.batch_compile import compile_batch, expand_inputs, print_summary
+        from src.parse_tables import default_tables_dir
+
+        sources = expand_inputs(args.files)
+        output_dir = None if args.output is None else Path(args.output)
+        names = [source.with_suffix("").name for source in sources]
+        if output_dir is not None and len(set(names)) < len(names):
+            argparser.error(
+                "several source files have the same name, so their object files have to be next to them"
+            )
+        start = time.perf_counter()
+        results = compile_batch(
+            sources,
+            output_dir,
+            args.jobs,
+            args.text,
+            args.relocatable,
+            args.verbose,
+            args.level,
+            enabled,
+            disabled,
+            default_tables_dir(),
+            cache,
+        )
+        for result in results:
+            if result.log:
+                print(f"# {result.source}")
+                print(result.log, end="")
+        print_summary(results, time.perf_counter() - start)
+        if args.time_passes:
+            passes = PassManager(args.level, enabled, disabled)
+            for result in results:
+                if result.passes is not None:
+                    for optimization, seconds in result.passes.seconds.items():
+                        passes.record(
+                            optimization, seconds, result.passes.removed[optimization]
+                        )
+            passes.print_times()
+        if cache is not None:
+            hits = sum(result.cached for result in results)
+            cache.record(hits, len(results) - hits, cache.evict())
+            if args.cache_stats:
+                cache.print_stats(hits, len(results) - hits)
+        sys.exit(int(any(result.error is not None for result in results)))
+
+    # To execute lexer and parser, user will add the file to be tested as an argument
+    if args.output is not None:
+        output = args.output
+    else:
+        output = "a.ooplmod" if args.relocatable else "a.ooplobj"
 
     # Build the parser
-    parser = Parser(lexer, args.verbose)
+    passes = PassManager(args.level, enabled, disabled)
     try:
-        with open(args.file, "r") as file:
+        with open(args.files[0], "r") as file:
             file_lines = file.readlines()
             file_content = "".join(file_lines)
+            key = None
+            if cache is not None:
+                key = cache_key(file_content, args.text, args.relocatable, passes)
+                if (data := cache.get(key)) is not None:
+                    with open(output, "wb") as file_out:
+                        file_out.write(data)
+                    cache.record(1, 0, 0)
+                    if args.cache_stats:
+                        cache.print_stats(1, 0)
+                    sys.exit(0)
+            from src.lexer import Lexer
+            from src.parse_tables import default_tables_dir
+            from src.parser import Parser
+
+            # Build the lexer object
+            lexer = Lexer()
+            # The object file is generated in memory and only written once it is complete, so a compilation
+            # that fails leaves no partial file behind.
             try:
-                if args.output:
-                    file_out = open(args.output, "w")
-                    sys.stdout = file_out
-                parser.parse(file_content)
+                if args.text:
+                    stream = io.StringIO()
+                    parser = Parser(
+                        lexer, args.verbose, passes, default_tables_dir(), stream
+                    )
+                    parser.parse(file_content)
+                    parser.print_object()
+                    with open(output, "w") as file_out:
+                        file_out.write(stream.getvalue())
+                else:
+                    parser = Parser(
+                        lexer,
+                        args.verbose,
+                        passes,
+                        default_tables_dir(),
+                        relocatable=args.relocatable,
+                    )
+                    parser.parse(file_content)
+                    buffer = io.BytesIO()
+                    if args.relocatable:
+                        parser.write_module(buffer)
+                    else:
+                        parser.write_object(buffer)
+                    with open(output, "wb") as file_out:
+                        file_out.write(buffer.getvalue())
+                if key is not None:
+                    with open(output, "rb") as file_out:
+                        cache.put(key, file_out.read())
+                if args.time_passes:
+                    passes.print_times()
             except CError as e:
                 col = find_column(file_lines, e.char_pos, e.line_number)
                 print(f"\nError in {file.name}")
@@ -78,5 +284,9 @@ if __name__ == "__main__":
                     print(f"\t{line_no}\t| {line_to_print}")
                     if line_no == e.line_number:
                         print(f"\t\t  {''.join([' '] * col)}^^^")
+            if cache is not None:
+                cache.record(0, 1, cache.evict())
+                if args.cache_stats:
+                    cache.print_stats(0, 1)
     except (EOFError, FileNotFoundError) as e:
         print(e)
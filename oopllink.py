@@ -0,0 +1,35 @@
+import argparse
+import sys
+
+from src import relocatable
+from src.linker import Linker
+from src.utils.errors import LinkError
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "files", help="relocatable modules generated by ooplc -c", nargs="+"
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="object file to generate, defaults to a.ooplobj",
+        default="a.ooplobj",
+    )
+    args = parser.parse_args()
+
+    try:
+        modules = []
+        for path in args.files:
+            with open(path, "rb") as file:
+                modules.append(relocatable.read(file.read(), path))
+        linker = Linker(modules)
+        linker.run()
+        with open(args.output, "wb") as file_out:
+            linker.write(file_out)
+    except LinkError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    except FileNotFoundError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
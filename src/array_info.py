@@ -1,3 +1,30 @@
+from typing import Tuple
+
+from .utils.types import MemoryAddress
+
+
+def array_type(var_type: str, dims: int) -> str:
+    """
+    Get the type of a whole array, used by array parameters and the arrays passed to them.
+
+    Arguments:
+    var_type: str -- Type of the elements of the array.
+    dims: int -- Number of dimensions of the array.
+    """
+    return var_type + "[]" * dims
+
+
+def element_type(var_type: str) -> Tuple[str, int]:
+    """
+    Get the type of the elements and the number of dimensions of the type of a whole array.
+
+    Arguments:
+    var_type: str -- Type of the array, which is the type of a simple variable if it has no dimensions.
+    """
+    dims = var_type.count("[]")
+    return var_type.removesuffix("[]" * dims), dims
+
+
 class DimInfo:
     lim_s: int
     R: int
@@ -13,13 +40,31 @@ class DimInfo:
 
 
 class ArrayInfo:
+    descriptor: list[Tuple[MemoryAddress, MemoryAddress]] | None
     table: list[DimInfo]
     size: int
 
     def __init__(self) -> None:
+        self.descriptor = None
         self.table = []
         self.size = 0
 
+    @classmethod
+    def parameter(
+        cls, descriptor: list[Tuple[MemoryAddress, MemoryAddress]]
+    ) -> "ArrayInfo":
+        """
+        Create the information of an array parameter, whose dimensions are only known while running. They are
+        passed along with the array, as the addresses of the ints with lim_s and m of each dimension.
+
+        Arguments:
+        descriptor: list[Tuple[MemoryAddress, MemoryAddress]] -- Addresses of lim_s and m of each dimension.
+        """
+        array_info = cls()
+        array_info.descriptor = descriptor
+        array_info.table = [DimInfo() for _ in descriptor]
+        return array_info
+
     def add_dim(self, lim_s: int) -> DimInfo:
         """
         Insert the information of a new dimension corresponding to an array.
@@ -0,0 +1,43 @@
+from typing import TextIO
+
+from .utils.types import ArrayDescriptor
+
+
+class ArrayTable:
+    descriptors: list[ArrayDescriptor]
+    numbers: dict[ArrayDescriptor, int]
+
+    def __init__(self) -> None:
+        self.descriptors = []
+        self.numbers = {}
+
+    def add(self, descriptor: ArrayDescriptor) -> int:
+        """
+        Insert the descriptor of an array access, unless the same one is already in the table, and get its
+        number.
+
+        Arguments:
+        descriptor: ArrayDescriptor -- Base address of the array and, for each dimension, the address of the
+        index, lim_s, m and whether the index has to be checked.
+        """
+        if (number := self.numbers.get(descriptor)) is None:
+            number = self.numbers[descriptor] = len(self.descriptors)
+            self.descriptors.append(descriptor)
+        return number
+
+    def print(self, verbose: bool, stream: TextIO | None = None) -> None:
+        """
+        Print every descriptor as its base address followed by the values of each dimension.
+
+        Arguments:
+        verbose: bool -- Whether to add the number of each descriptor as a comment.
+        stream: TextIO | None -- Stream to print to, the standard output if it is None.
+        """
+        for number, (base, dims) in enumerate(self.descriptors):
+            values = ",".join(
+                f"{index},{lim_s},{m},{int(checked)}"
+                for index, lim_s, m, checked in dims
+            )
+            if verbose:
+                print(f"# {number}\t{base},{values}", file=stream)
+            print(f"{base},{values}", file=stream)
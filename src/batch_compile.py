@@ -0,0 +1,266 @@
+import io
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import TextIO
+
+from .compile_cache import CompileCache, cache_key
+from .lexer import Lexer
+from .parser import Parser
+from .passes.pass_manager import PassManager
+from .utils.enums import Passes
+from .utils.errors import CError, find_column
+
+
+class BatchResult:
+    cached: bool
+    error: str | None
+    log: str
+    output: Path
+    passes: PassManager | None
+    seconds: float
+    source: Path
+
+    def __init__(
+        self,
+        source: Path,
+        output: Path,
+        seconds: float,
+        error: str | None = None,
+        log: str = "",
+        passes: PassManager | None = None,
+        cached: bool = False,
+    ) -> None:
+        """
+        Outcome of compiling one of the files of a batch.
+
+        Arguments:
+        source: Path -- Path of the OOPL source file.
+        output: Path -- Path of its object file.
+        seconds: float -- Time the compilation took.
+        error: str | None -- Why the file could not be compiled, or None if it was.
+        log: str -- Verbose information of a binary compilation, which is not part of the object file.
+        passes: PassManager | None -- Passes that ran, with their times, if the file was compiled.
+        cached: bool -- Whether the object file was taken from the cache instead of compiling the file.
+        """
+        self.cached = cached
+        self.error = error
+        self.log = log
+        self.output = output
+        self.passes = passes
+        self.seconds = seconds
+        self.source = source
+
+
+def expand_inputs(paths: list[str]) -> list[Path]:
+    """
+    Get the source files to compile from the paths given to ooplc, where a directory stands for the OOPL
+    source files directly inside it.
+
+    Arguments:
+    paths: list[str] -- Paths of source files and directories.
+    """
+    sources = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            sources.extend(sorted(path.glob("*.oopl")))
+        else:
+            sources.append(path)
+    return sources
+
+
+def output_path(source: Path, output_dir: Path | None, relocatable: bool) -> Path:
+    """
+    Get the path of the object file of a source file of a batch.
+
+    Arguments:
+    source: Path -- Path of the OOPL source file.
+    output_dir: Path | None -- Directory for the object files, or None to put each one next to its source.
+    relocatable: bool -- Whether the object file is a relocatable module.
+    """
+    name = source.with_suffix(".ooplmod" if relocatable else ".ooplobj").name
+    return source.with_name(name) if output_dir is None else output_dir / name
+
+
+def warm_up(tables_dir: Path | None) -> None:
+    """
+    Load the parse tables in a worker before it gets any file, so every file it compiles only binds them to
+    its own parser.
+
+    Arguments:
+    tables_dir: Path | None -- Directory of the cached parse tables.
+    """
+    Parser(Lexer(), False, tables_dir=tables_dir)
+
+
+def compile_file(
+    source: Path,
+    output: Path,
+    text: bool,
+    relocatable: bool,
+    verbose: bool,
+    level: int,
+    enabled: list[Passes],
+    disabled: list[Passes],
+    tables_dir: Path | None,
+    cache: CompileCache | None,
+) -> BatchResult:
+    """
+    Compile a source file of a batch with a new parser, so nothing is shared with the other files compiled
+    by the same process.
+
+    Arguments:
+    source: Path -- Path of the OOPL source file.
+    output: Path -- Path of the object file to generate.
+    text: bool -- Whether to generate a text object file.
+    relocatable: bool -- Whether to generate a relocatable module.
+    verbose: bool -- Whether to add the information of the compilation process.
+    level: int -- Optimization level.
+    enabled: list[Passes] -- Passes to run besides the ones of the level.
+    disabled: list[Passes] -- Passes not to run even if they are part of the level.
+    tables_dir: Path | None -- Directory of the cached parse tables.
+    cache: CompileCache | None -- Cache of object files, or None to always compile the file.
+    """
+    start = time.perf_counter()
+    lines = []
+    log = io.StringIO()
+    passes = PassManager(level, enabled, disabled)
+    try:
+        with open(source, "r") as file:
+            lines = file.readlines()
+        key = None
+        if cache is not None:
+            key = cache_key("".join(lines), text, relocatable, passes)
+            if (data := cache.get(key)) is not None:
+                with open(output, "wb") as file_out:
+                    file_out.write(data)
+                return BatchResult(
+                    source, output, time.perf_counter() - start, cached=True
+                )
+        # The object file is only written once it is complete, so a file that fails leaves no partial one.
+        if text:
+            stream = io.StringIO()
+            parser = Parser(Lexer(), verbose, passes, tables_dir, stream)
+            parser.parse("".join(lines))
+            parser.print_object()
+            with open(output, "w") as file_out:
+                file_out.write(stream.getvalue())
+        else:
+            parser = Parser(Lexer(), verbose, passes, tables_dir, log, relocatable)
+            parser.parse("".join(lines))
+            buffer = io.BytesIO()
+            if relocatable:
+                parser.write_module(buffer)
+            else:
+                parser.write_object(buffer)
+            with open(output, "wb") as file_out:
+                file_out.write(buffer.getvalue())
+        if key is not None:
+            cache.put(key, output.read_bytes())
+    except CError as e:
+        col = find_column(lines, e.char_pos, e.line_number)
+        return BatchResult(
+            source,
+            output,
+            time.perf_counter() - start,
+            f"{source.name}:{e.line_number}:{col}: {e}",
+            log.getvalue(),
+        )
+    except (EOFError, OSError) as e:
+        return BatchResult(source, output, time.perf_counter() - start, str(e))
+    except Exception as e:
+        # Errors the compiler doesn't report as a CError only stop the file that caused them, whether it is
+        # compiled by a worker or by this process.
+        return BatchResult(
+            source, output, time.perf_counter() - start, f"internal error: {e}"
+        )
+    return BatchResult(
+        source, output, time.perf_counter() - start, None, log.getvalue(), passes
+    )
+
+
+def compile_batch(
+    sources: list[Path],
+    output_dir: Path | None,
+    jobs: int | None,
+    text: bool,
+    relocatable: bool,
+    verbose: bool,
+    level: int,
+    enabled: list[Passes],
+    disabled: list[Passes],
+    tables_dir: Path | None,
+    cache: CompileCache | None,
+) -> list[BatchResult]:
+    """
+    Compile source files across a pool of processes, each of which loads the parse tables once, and get
+    their results in the same order as the files.
+
+    Arguments:
+    sources: list[Path] -- Paths of the OOPL source files.
+    output_dir: Path | None -- Directory for the object files, or None to put each one next to its source.
+    jobs: int | None -- Number of processes, or None for one per CPU. With one, the files are compiled by
+    this process.
+    text: bool -- Whether to generate text object files.
+    relocatable: bool -- Whether to generate relocatable modules.
+    verbose: bool -- Whether to add the information of the compilation process.
+    level: int -- Optimization level.
+    enabled: list[Passes] -- Passes to run besides the ones of the level.
+    disabled: list[Passes] -- Passes not to run even if they are part of the level.
+    tables_dir: Path | None -- Directory of the cached parse tables.
+    cache: CompileCache | None -- Cache of object files, or None to always compile the files.
+    """
+    if output_dir is not None:
+        output_dir.mkdir(parents=True, exist_ok=True)
+    outputs = [output_path(source, output_dir, relocatable) for source in sources]
+    options = (text, relocatable, verbose, level, enabled, disabled, tables_dir, cache)
+    if jobs == 1:
+        return [
+            compile_file(source, output, *options)
+            for source, output in zip(sources, outputs)
+        ]
+
+    results = []
+    with ProcessPoolExecutor(jobs, initializer=warm_up, initargs=(tables_dir,)) as pool:
+        futures = [
+            pool.submit(compile_file, source, output, *options)
+            for source, output in zip(sources, outputs)
+        ]
+        for source, output, future in zip(sources, outputs, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                # A worker that stopped, or a result that couldn't be sent back, only fails its own file.
+                results.append(BatchResult(source, output, 0, f"internal error: {e}"))
+    return results
+
+
+def print_summary(
+    results: list[BatchResult], seconds: float, file: TextIO = sys.stdout
+) -> None:
+    """
+    Print how long each file of a batch took to compile and why the ones that failed did.
+
+    Arguments:
+    results: list[BatchResult] -- Results of the files.
+    seconds: float -- Time the whole batch took.
+    file: TextIO -- Stream to print to.
+    """
+    width = max([len(str(result.source)) for result in results] + [len("file")]) + 2
+    print(f"{'file':<{width}}{'ms':>10}  status", file=file)
+    for result in results:
+        if result.error is not None:
+            status = result.error
+        else:
+            status = "cached" if result.cached else "ok"
+        print(
+            f"{str(result.source):<{width}}{result.seconds * 1000:>10.1f}  {status}",
+            file=file,
+        )
+    errors = sum(result.error is not None for result in results)
+    cached = sum(result.cached for result in results)
+    print(
+        f"{len(results)} files, {errors} errors, {cached} cached, {seconds * 1000:.1f} ms in total",
+        file=file,
+    )
@@ -1,3 +1,5 @@
+from typing import TextIO
+
 from .class_info import ClassInfo
 from .containers.dir import Dir
 
@@ -18,12 +20,16 @@ class ClassDir(Dir[ClassInfo]):
         else:
             self.dir[name] = ClassInfo(name)
 
-    def print(self, verbose: bool) -> None:
+    def print(self, verbose: bool, stream: TextIO | None = None) -> None:
         """
         Print information of the directory depending on verbose flag value.
+
+        Arguments:
+        verbose: bool -- Whether to add the details as comments.
+        stream: TextIO | None -- Stream to print to, the standard output if it is None.
         """
         for value in self.values():
             if verbose:
-                print(f"# {value.name}")
-            value.func_dir.print(verbose)
-            value.var_table.print(f"Class {value.name} VarTable", verbose)
+                print(f"# {value.name}", file=stream)
+            value.func_dir.print(verbose, stream)
+            value.var_table.print(f"Class {value.name} VarTable", verbose, stream)
@@ -1,3 +1,4 @@
+from .var_info import VarInfo
 from .var_table import VarTable
 from .func_dir import CFuncDir
 
@@ -11,3 +12,33 @@ class ClassInfo:
         self.name = name
         self.var_table = VarTable()
         self.funcs = []
+
+    def first_field(self, type: str) -> VarInfo | None:
+        """
+        Get the first attribute of a type. The attributes of each type of an object are stored one after the
+        other in the same order they were declared, so its address is where those attributes start.
+
+        Arguments:
+        type: str -- Type of the attribute.
+        """
+        for value in self.var_table.values():
+            if value.type == type:
+                return value
+        return None
+
+    def field_offset(self, name: str) -> int:
+        """
+        Get the distance between the address of an attribute and the address of the first attribute of its
+        type, which is the same for every object of the class.
+
+        Arguments:
+        name: str -- Name of the attribute.
+        """
+        field = self.var_table.get(name)
+        offset = 0
+        for value in self.var_table.values():
+            if value is field:
+                break
+            if value.type == field.type:
+                offset += 1 if value.array_info is None else value.array_info.size
+        return offset
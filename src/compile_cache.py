@@ -0,0 +1,221 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Tuple
+
+from .passes.pass_manager import PassManager
+
+# Version of the layout of the cache, which must change every time the way entries are keyed or stored does.
+VERSION = 1
+
+# Size the cached object files can take by default before the least recently used ones are removed.
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+
+# Suffix of the files of the cached object files, which tells them apart from the statistics and from files
+# still being written.
+ENTRY_SUFFIX = ".obj"
+
+STATS_FILE = "stats.json"
+
+# Hash of the source files of the compiler loaded by this process, by the directory they are in.
+versions: dict[Path, str] = {}
+
+
+def default_cache_dir() -> Path:
+    """
+    Get the directory where object files are cached by default, next to the cached parse tables. It is not
+    taken from default_tables_dir, since loading the parser to find it would take longer than a cache hit.
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "ooplc" / "objects"
+
+
+def compiler_version() -> str:
+    """
+    Get a hash of the source files of the compiler, which stands for its version, since a change to any of
+    them can change the object files it generates.
+    """
+    src_dir = Path(__file__).parent
+    if (version := versions.get(src_dir)) is None:
+        digest = hashlib.sha256()
+        for path in sorted(src_dir.rglob("*.py")):
+            digest.update(path.relative_to(src_dir).as_posix().encode() + b"\0")
+            digest.update(path.read_bytes() + b"\0")
+        version = versions[src_dir] = digest.hexdigest()
+    return version
+
+
+def cache_key(source: str, text: bool, relocatable: bool, passes: PassManager) -> str:
+    """
+    Get the key of the object file of a source file, which is a hash of everything it depends on: the
+    source, the version of the compiler and the flags that change the output.
+
+    Arguments:
+    source: str -- Contents of the OOPL source file.
+    text: bool -- Whether the object file is a text object file.
+    relocatable: bool -- Whether the object file is a relocatable module.
+    passes: PassManager -- Passes that run, regardless of the flags used to choose them.
+    """
+    flags = repr(
+        (
+            VERSION,
+            text,
+            relocatable,
+            sorted(optimization.value for optimization in passes.enabled),
+        )
+    )
+    digest = hashlib.sha256()
+    for part in [compiler_version(), flags, source]:
+        digest.update(part.encode() + b"\0")
+    return digest.hexdigest()
+
+
+class CompileCache:
+    directory: Path
+    max_size: int
+
+    def __init__(self, directory: Path, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        """
+        Object files kept in a directory by the hash of what they were compiled from, so compiling the same
+        source again with the same compiler and flags only copies them. When they take more than a size, the
+        least recently used ones are removed.
+
+        Arguments:
+        directory: Path -- Directory of the cached object files.
+        max_size: int -- Bytes the cached object files can take.
+        """
+        self.directory = directory
+        self.max_size = max_size
+
+    def get(self, key: str) -> bytes | None:
+        """
+        Get a cached object file, marking it as the most recently used, or None if it is not cached.
+
+        Arguments:
+        key: str -- Key of the object file.
+        """
+        path = self.directory / f"{key}{ENTRY_SUFFIX}"
+        try:
+            data = path.read_bytes()
+            # The modification time is when it was last used, which is what eviction looks at.
+            os.utime(path)
+        except OSError:
+            return None
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """
+        Cache an object file.
+
+        Arguments:
+        key: str -- Key of the object file.
+        data: bytes -- Contents of the object file.
+        """
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Written to a temporary file first, so compilers running at the same time never read half of it.
+            with tempfile.NamedTemporaryFile(
+                "wb", dir=self.directory, suffix=".tmp", delete=False
+            ) as file:
+                file.write(data)
+            os.replace(file.name, self.directory / f"{key}{ENTRY_SUFFIX}")
+        except OSError:
+            # Compiling doesn't need the cache, so a directory that can't be written is ignored.
+            pass
+
+    def entries(self) -> list[Tuple[float, int, Path]]:
+        """
+        Get the last time each cached object file was used, its size and its path, from the least recently
+        used.
+        """
+        result = []
+        for path in self.directory.glob(f"*{ENTRY_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                # Removed by another compiler since it was listed.
+                continue
+            result.append((stat.st_mtime, stat.st_size, path))
+        return sorted(result)
+
+    def evict(self) -> int:
+        """
+        Remove the least recently used object files until the rest fit in the size of the cache, and get how
+        many were removed.
+        """
+        entries = self.entries()
+        size = sum(entry_size for _, entry_size, _ in entries)
+        removed = 0
+        for _, entry_size, path in entries:
+            if size <= self.max_size:
+                break
+            try:
+                path.unlink()
+                removed += 1
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+        return removed
+
+    def stats(self) -> dict[str, int]:
+        """
+        Get the hits, misses and evictions recorded since the cache was created.
+        """
+        stats = {"hits": 0, "misses": 0, "evictions": 0}
+        try:
+            with open(self.directory / STATS_FILE, "r") as file:
+                stats.update(json.load(file))
+        except (OSError, ValueError):
+            pass
+        return stats
+
+    def record(self, hits: int, misses: int, evictions: int) -> None:
+        """
+        Add the hits, misses and evictions of a run of the compiler to the ones of the cache. Runs that end
+        at the same time can overwrite each other's counts, which are only statistics.
+
+        Arguments:
+        hits: int -- Object files that were cached.
+        misses: int -- Object files that were compiled.
+        evictions: int -- Object files that were removed.
+        """
+        stats = self.stats()
+        stats["hits"] += hits
+        stats["misses"] += misses
+        stats["evictions"] += evictions
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w", dir=self.directory, suffix=".tmp", delete=False
+            ) as file:
+                json.dump(stats, file)
+            os.replace(file.name, self.directory / STATS_FILE)
+        except OSError:
+            pass
+
+    def print_stats(self, hits: int, misses: int) -> None:
+        """
+        Print the hits and misses of this run of the compiler, the ones since the cache was created, and
+        what the cache holds.
+
+        Arguments:
+        hits: int -- Object files of this run that were cached.
+        misses: int -- Object files of this run that were compiled.
+        """
+        stats = self.stats()
+        entries = self.entries()
+        total = stats["hits"] + stats["misses"]
+        rate = 0 if total == 0 else stats["hits"] / total * 100
+        size = sum(entry_size for _, entry_size, _ in entries)
+        print(f"cache {self.directory}")
+        print(f"  this run     {hits} hits, {misses} misses")
+        print(
+            f"  in total     {stats['hits']} hits, {stats['misses']} misses ({rate:.1f}% hits), "
+            f"{stats['evictions']} evictions"
+        )
+        print(
+            f"  holds        {len(entries)} object files, {size / 1024:.1f} of "
+            f"{self.max_size / 1024:.0f} KiB"
+        )
@@ -0,0 +1,271 @@
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import struct
+from pathlib import Path
+from typing import Any, Tuple
+
+from .lexer import Lexer
+from .parser import Parser
+from .passes.pass_manager import PassManager, levels
+from .utils.enums import Passes
+from .utils.errors import CError, find_column
+
+# Requests and responses are messages made of the lengths of a JSON header and of a payload (u32 each, little
+# endian), followed by the header and the payload.
+#
+#   request     header with "path" to compile a source file, or with "name" to compile the source code in the
+#               payload, and optionally "text" (bool) for a text object file, "relocatable" (bool) for a
+#               relocatable module, "level" (int), and "enabled" and "disabled" (list of pass names) as in ooplc
+#   response    header {"status": "ok"} with the object file as the payload, or {"status": "error", "error":
+#               {"type", "message", "file", "line", "column"}} with an empty payload, where line and column are
+#               null for errors that are not in the source code
+#
+# A connection can send any number of requests, which are answered in order, until it is closed.
+MESSAGE_HEADER = struct.Struct("<II")
+
+Message = Tuple[dict[str, Any], bytes]
+
+
+def send_message(
+    connection: socket.socket, header: dict[str, Any], payload: bytes = b""
+) -> None:
+    """
+    Send a message through a socket.
+
+    Arguments:
+    connection: socket.socket -- Connected socket.
+    header: dict[str, Any] -- Header of the message.
+    payload: bytes -- Payload of the message.
+    """
+    encoded = json.dumps(header).encode()
+    connection.sendall(
+        MESSAGE_HEADER.pack(len(encoded), len(payload)) + encoded + payload
+    )
+
+
+def receive_message(connection: socket.socket) -> Message | None:
+    """
+    Receive a message from a socket, or None if it was closed before a new message started.
+
+    Arguments:
+    connection: socket.socket -- Connected socket.
+    """
+    lengths = receive_exactly(connection, MESSAGE_HEADER.size)
+    if lengths is None:
+        return None
+    header_length, payload_length = MESSAGE_HEADER.unpack(lengths)
+    header = receive_exactly(connection, header_length)
+    payload = receive_exactly(connection, payload_length)
+    if header is None or payload is None:
+        raise ConnectionError("connection closed in the middle of a message")
+    return json.loads(header), payload
+
+
+def receive_exactly(connection: socket.socket, size: int) -> bytes | None:
+    """
+    Receive a number of bytes from a socket, or None if it was closed before sending all of them.
+
+    Arguments:
+    connection: socket.socket -- Connected socket.
+    size: int -- Number of bytes to receive.
+    """
+    data = bytearray()
+    while len(data) < size:
+        chunk = connection.recv(size - len(data))
+        if len(chunk) == 0:
+            return None
+        data.extend(chunk)
+    return bytes(data)
+
+
+def compile_request(
+    header: dict[str, Any], payload: bytes, tables_dir: Path | None
+) -> Message:
+    """
+    Compile the source of a request with a new parser, so nothing is shared with the previous requests, and
+    get the response.
+
+    Arguments:
+    header: dict[str, Any] -- Header of the request.
+    payload: bytes -- Source code to compile, if the request has no path.
+    tables_dir: Path | None -- Directory of the cached parse tables.
+    """
+    name = header.get("path", header.get("name", "<source>"))
+    if (level := header.get("level", 2)) not in levels:
+        return (
+            error_response("request", f"unknown optimization level {level}", name),
+            b"",
+        )
+    relocatable = header.get("relocatable", False)
+    if relocatable and header.get("text", False):
+        return (
+            error_response(
+                "request", "relocatable modules can't be text object files", name
+            ),
+            b"",
+        )
+    try:
+        passes = PassManager(
+            level,
+            [Passes(optimization) for optimization in header.get("enabled", [])],
+            [Passes(optimization) for optimization in header.get("disabled", [])],
+        )
+        if "path" in header:
+            with open(header["path"], "r") as file:
+                source = file.read()
+        else:
+            source = payload.decode()
+    except (KeyError, ValueError, OSError) as e:
+        return error_response("request", str(e), name), b""
+
+    try:
+        if header.get("text", False):
+            output = io.StringIO()
+            parser = Parser(Lexer(), False, passes, tables_dir, output)
+            parser.parse(source)
+            parser.print_object()
+            return {"status": "ok"}, output.getvalue().encode()
+        output = io.BytesIO()
+        parser = Parser(Lexer(), False, passes, tables_dir, relocatable=relocatable)
+        parser.parse(source)
+        if relocatable:
+            parser.write_module(output)
+        else:
+            parser.write_object(output)
+        return {"status": "ok"}, output.getvalue()
+    except CError as e:
+        lines = source.splitlines(keepends=True)
+        return (
+            error_response(
+                e.type.value,
+                e.message,
+                name,
+                e.line_number,
+                find_column(lines, e.char_pos, e.line_number),
+            ),
+            b"",
+        )
+    except Exception as e:
+        # Errors the compiler doesn't report as a CError still have to be answered without stopping the server.
+        return error_response("internal", str(e), name), b""
+
+
+def error_response(
+    type: str,
+    message: str,
+    file: str,
+    line: int | None = None,
+    column: int | None = None,
+) -> dict[str, Any]:
+    """
+    Get the header of a response for a request that could not be compiled.
+
+    Arguments:
+    type: str -- Type of the error.
+    message: str -- Description of the error.
+    file: str -- Path or name of the source.
+    line: int | None -- Line of the error in the source, if it is in the source code.
+    column: int | None -- Column of the error in the line.
+    """
+    return {
+        "status": "error",
+        "error": {
+            "type": type,
+            "message": message,
+            "file": file,
+            "line": line,
+            "column": column,
+        },
+    }
+
+
+class CompileHandler(socketserver.BaseRequestHandler):
+    server: "CompileServer"
+
+    def handle(self) -> None:
+        """
+        Answer the requests of a connection until it is closed.
+        """
+        while (message := receive_message(self.request)) is not None:
+            send_message(
+                self.request, *compile_request(*message, self.server.tables_dir)
+            )
+
+
+class CompileServer(socketserver.UnixStreamServer):
+    tables_dir: Path | None
+
+    def __init__(self, socket_path: Path, tables_dir: Path | None) -> None:
+        """
+        Server that compiles the requests received through a Unix domain socket, one at a time, in a process
+        that has already imported the compiler and loaded its parse tables.
+
+        Arguments:
+        socket_path: Path -- Path of the socket, which is replaced if it already exists.
+        tables_dir: Path | None -- Directory of the cached parse tables.
+        """
+        self.tables_dir = tables_dir
+        # Load the tables once, so every request only binds them to its own parser.
+        Parser(Lexer(), False, tables_dir=tables_dir)
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(socket_path)
+        super().__init__(str(socket_path), CompileHandler)
+
+    def server_close(self) -> None:
+        """
+        Stop listening and remove the socket.
+        """
+        super().server_close()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.server_address)
+
+
+class CompileClient:
+    connection: socket.socket
+
+    def __init__(self, socket_path: Path) -> None:
+        """
+        Connection to a compile server, which can send any number of requests.
+
+        Arguments:
+        socket_path: Path -- Path of the socket of the server.
+        """
+        self.connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.connection.connect(str(socket_path))
+
+    def compile(
+        self,
+        path: Path | None = None,
+        source: str | None = None,
+        name: str = "<source>",
+        **options: Any,
+    ) -> Message:
+        """
+        Compile a source file, or source code, and get the header and the payload of the response.
+
+        Arguments:
+        path: Path | None -- Path of the source file, which is made absolute for the server.
+        source: str | None -- Source code to compile if there is no path.
+        name: str -- Name of the source code, used in its errors.
+        options: Any -- Other fields of the request, like text or level.
+        """
+        if path is not None:
+            header = {"path": str(Path(path).resolve()), **options}
+            payload = b""
+        else:
+            header = {"name": name, **options}
+            payload = (source or "").encode()
+        send_message(self.connection, header, payload)
+        if (message := receive_message(self.connection)) is None:
+            raise ConnectionError("the compile server closed the connection")
+        return message
+
+    def close(self) -> None:
+        """
+        Close the connection.
+        """
+        self.connection.close()
@@ -0,0 +1,174 @@
+import math
+
+from .memory import Memory
+from .memory_layout import converters
+from .nodes.constant import Constant
+from .semantic_cube import SemanticCube
+from .utils.enums import Operations, Types
+from .utils.types import MemoryAddress, MemoryType, MemoryTypeNames, TypeAddress
+from .vm import binary_operations, typed_operations
+
+# Constants are stored as 64 bit integers in the object file.
+int_range = range(-(2**63), 2**63)
+
+
+class ConstantFolder:
+    enabled: bool
+    folded: int
+    function_memory: Memory
+    global_memory: Memory
+    known: dict[MemoryAddress, MemoryAddress]
+    sem_cube: SemanticCube
+
+    def __init__(
+        self, global_memory: Memory, function_memory: Memory, enabled: bool = True
+    ) -> None:
+        """
+        Evaluate operations between constants while compiling, and keep track of the variables whose value
+        is known to be a constant so it can be used in their place.
+
+        Arguments:
+        global_memory: Memory -- Memory with the constants and global variables.
+        function_memory: Memory -- Memory used for the addresses of the functions.
+        enabled: bool -- Whether to fold anything, otherwise every operation is left to the VM.
+        """
+        self.enabled = enabled
+        self.folded = 0
+        self.function_memory = function_memory
+        self.global_memory = global_memory
+        self.known = {}
+        self.sem_cube = SemanticCube()
+
+    def is_constant(self, address: MemoryAddress) -> bool:
+        """
+        Check if an address holds a constant.
+
+        Arguments:
+        address: MemoryAddress -- Address to check.
+        """
+        return (
+            0 < address < self.function_memory.bools.start_address
+            and not self.global_memory.is_ptr(address)
+            and self.global_memory[address] is not None
+        )
+
+    def value_of(self, operand: TypeAddress) -> TypeAddress:
+        """
+        Get the constant that a variable is known to hold at this point of the program, or the operand itself
+        if it is not known.
+
+        Arguments:
+        operand: TypeAddress -- Value being read.
+        """
+        operand_type, address, _ = operand
+        if (constant := self.known.get(address)) is not None:
+            return (operand_type, constant, None)
+        return operand
+
+    def fold(
+        self, left: TypeAddress, op_code: Operations, right: TypeAddress
+    ) -> TypeAddress | None:
+        """
+        Get the constant that results from an operation between two constants, the same way the VM would
+        compute it. Strings are not folded, as their constants keep the escape sequences of the source code,
+        and neither are operations that fail, so they still fail while running.
+
+        Arguments:
+        left: TypeAddress -- Left operand.
+        op_code: Operations -- Operation applied.
+        right: TypeAddress -- Right operand.
+        """
+        l_type, l_addr, _ = left
+        r_type, r_addr, _ = right
+        if (
+            not self.enabled
+            or not (self.is_constant(l_addr) and self.is_constant(r_addr))
+            or Types.STRING.value in (l_type, r_type)
+        ):
+            return None
+        result_type = self.sem_cube.get(l_type, op_code, r_type)
+        typed = self.sem_cube.get_typed(l_type, op_code, r_type)
+        try:
+            if (operation := typed_operations.get(typed)) is None:
+                value = self.__convert(
+                    binary_operations[op_code](
+                        self.global_memory[l_addr], self.global_memory[r_addr]
+                    ),
+                    result_type,
+                )
+            else:
+                value = operation(
+                    self.global_memory[l_addr], self.global_memory[r_addr]
+                )
+        except ArithmeticError:
+            return None
+        if (constant := self.__constant(value, result_type)) is not None:
+            self.folded += 1
+        return constant
+
+    def assign(self, target: TypeAddress, value: TypeAddress) -> None:
+        """
+        Record the value assigned to a variable, which is known from now on if it is a constant.
+
+        Arguments:
+        target: TypeAddress -- Variable assigned.
+        value: TypeAddress -- Value assigned to it.
+        """
+        target_type, address, _ = target
+        value_type, value_addr, _ = value
+        if not self.enabled:
+            return
+        if self.is_constant(value_addr) and value_type == target_type:
+            self.known[address] = value_addr
+            return
+        if self.is_constant(value_addr) and value_type != Types.STRING.value:
+            constant = self.__constant(
+                self.__convert(self.global_memory[value_addr], target_type),
+                target_type,
+            )
+            if constant is not None:
+                self.known[address] = constant[1]
+                return
+        self.forget(address)
+
+    def forget(self, address: MemoryAddress) -> None:
+        """
+        Stop using the value known for a variable, because it was assigned something unknown.
+
+        Arguments:
+        address: MemoryAddress -- Address of the variable.
+        """
+        self.known.pop(address, None)
+
+    def clear(self) -> None:
+        """
+        Stop using every known value, where different paths of the program join or a function is called.
+        """
+        self.known.clear()
+
+    def __convert(self, value: MemoryType, value_type: str) -> MemoryType:
+        """
+        Convert a value to a type as the VM does when storing it.
+
+        Arguments:
+        value: MemoryType -- Value to convert.
+        value_type: str -- Type of the address where the value is stored.
+        """
+        return converters[MemoryTypeNames.index(value_type)](value)
+
+    def __constant(self, value: MemoryType, value_type: str) -> TypeAddress | None:
+        """
+        Get the constant of the pool with a value, adding it if there is none. Values that the pool cannot
+        tell apart from others or that do not fit in the object file are left to be computed while running.
+
+        Arguments:
+        value: MemoryType -- Value of the constant.
+        value_type: str -- Type of the constant.
+        """
+        if value_type == Types.INT.value and value not in int_range:
+            return None
+        if value_type == Types.FLOAT.value and (
+            not math.isfinite(value) or math.copysign(1, value) < 0 and value == 0
+        ):
+            return None
+        return Constant(str(value), value_type, self.global_memory).get()
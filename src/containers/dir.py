@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar
+from typing import Generic, TextIO, TypeVar
 
 T = TypeVar("T")
 
@@ -18,9 +18,13 @@ class Dir(ABC, Generic[T]):
         pass
 
     @abstractmethod
-    def print(self, verbose: bool) -> None:
+    def print(self, verbose: bool, stream: TextIO | None = None) -> None:
         """
         Print the directory.
+
+        Arguments:
+        verbose: bool -- Whether to add the details as comments.
+        stream: TextIO | None -- Stream to print to, the standard output if it is None.
         """
         pass
 
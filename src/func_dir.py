@@ -9,6 +9,8 @@
 #
 #
 
+from typing import TextIO
+
 from .func_info import CFuncInfo, VMFuncInfo
 from .scope import Scope
 from .utils.types import Resources, MemoryAddress
@@ -49,19 +51,26 @@ class CFuncDir(Dir[CFuncInfo]):
             )
             return self.dir[name]
 
-    def print(self, verbose: bool) -> None:
+    def print(self, verbose: bool, stream: TextIO | None = None) -> None:
         """
         Print information of the directory depending on verbose flag value.
+
+        Arguments:
+        verbose: bool -- Whether to add the details as comments.
+        stream: TextIO | None -- Stream to print to, the standard output if it is None.
         """
         for key, value in self.dir.items():
             if verbose:
-                print(f"# Function: {key} with return type: {value.type}")
-                print(f"# Resources: {value.resources}")
-                print(f"# Start quadruple: {value.start_quad}")
-                print(f"# Return address: {value.return_address}")
-                print(f"# Parameters list: {[param for param in value.param_list]}")
-                print(f"# Address: {value.address}")
-            print(value)
+                print(f"# Function: {key} with return type: {value.type}", file=stream)
+                print(f"# Resources: {value.resources}", file=stream)
+                print(f"# Start quadruple: {value.start_quad}", file=stream)
+                print(f"# Return address: {value.return_address}", file=stream)
+                print(
+                    f"# Parameters list: {[param for param in value.param_list]}",
+                    file=stream,
+                )
+                print(f"# Address: {value.address}", file=stream)
+            print(value, file=stream)
 
 class VMFuncDir(Dir[VMFuncInfo]):
     def __init__(self) -> None:
@@ -87,14 +96,18 @@ class VMFuncDir(Dir[VMFuncInfo]):
             self.dir[name] = VMFuncInfo(name, start_quad, resources)
             return self.dir[name]
 
-    def print(self, verbose: bool) -> None:
+    def print(self, verbose: bool, stream: TextIO | None = None) -> None:
         """
         Print information of the directory depending on verbose flag value.
+
+        Arguments:
+        verbose: bool -- Whether to add the details as comments.
+        stream: TextIO | None -- Stream to print to, the standard output if it is None.
         """
         for key, value in self.dir.items():
             if verbose:
-                print(f"# Function: {key}")
-                print(f"# Resources: {value.resources}")
-                print(f"# Start quadruple: {value.start_quad}")
+                print(f"# Function: {key}", file=stream)
+                print(f"# Resources: {value.resources}", file=stream)
+                print(f"# Start quadruple: {value.start_quad}", file=stream)
             else:
-                print(value)
+                print(value, file=stream)
@@ -1,4 +1,4 @@
-from .utils.types import Resources, MemoryAddress, ParamList, ObjPropAddresses
+from .utils.types import Resources, MemoryAddress, ParamList, ThisParams
 from .scope import Scope
 
 
@@ -27,10 +27,10 @@ class CFuncInfo(FuncInfo):
     address: MemoryAddress
     has_return: bool
     is_body_defined: bool
-    obj_addresses: ObjPropAddresses
     param_list: ParamList
     return_address: MemoryAddress
     scope: Scope
+    this_params: ThisParams
     type: str
 
     def __init__(
@@ -45,13 +45,26 @@ class CFuncInfo(FuncInfo):
         self.address = address
         self.has_return = False
         self.is_body_defined = False
-        self.obj_addresses = {}
         self.param_list = []
         self.resources = (0, 0, 0, 0, 0)
         self.return_address = return_address
         self.scope = scope
+        self.this_params = {}
         self.type = type
 
+    def param_addresses(self) -> list[MemoryAddress]:
+        """
+        Get the addresses that every call assigns before the function starts, which are the parameters and the
+        dimensions of the array parameters.
+        """
+        addresses = []
+        for _, address, name in self.param_list:
+            addresses.append(address)
+            if (array_info := self.scope.get(name).array_info) is not None:
+                for lim_addr, m_addr in array_info.descriptor:
+                    addresses.extend((lim_addr, m_addr))
+        return addresses
+
     def __str__(self) -> str:
         """
         Stringify the resources' information for operations.
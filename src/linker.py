@@ -0,0 +1,270 @@
+from typing import BinaryIO, Tuple
+
+from . import object_file
+from .memory import chunk_size, start_function_memory, start_global_memory
+from .relocatable import (
+    ARRAY,
+    FUNCTION,
+    GLOBAL,
+    QUADRUPLE,
+    RETURN,
+    FunctionSymbol,
+    Module,
+)
+from .utils.enums import Operations
+from .utils.errors import LinkError, OOPLErrorTypes
+from .utils.types import (
+    ArrayDescriptor,
+    MemoryAddress,
+    MemoryType,
+    Quadruple,
+    Resources,
+)
+
+# Position of ints in Resources
+INT_INDEX = 2
+
+# Quadruples at the start of every module that call main.
+PROLOGUE_SIZE = 2
+
+
+class Linker:
+    array_offsets: list[int]
+    classes: dict[str, Tuple[str, str]]
+    descriptors: list[ArrayDescriptor]
+    exports: dict[str, Tuple[int, FunctionSymbol]]
+    functions: list[Tuple[str, MemoryAddress, Resources]]
+    initialized: list[int]
+    int_constants: dict[int, MemoryAddress]
+    modules: list[Module]
+    quad_offsets: list[int]
+    quads: list[Quadruple]
+    type_offsets: list[list[int]]
+    values: list[list[MemoryType | None]]
+
+    def __init__(self, modules: list[Module]) -> None:
+        """
+        Merge relocatable modules into a single program, where the global memory of each module comes after
+        the one of the previous module and the same goes for its quadruples and array descriptors.
+
+        Arguments:
+        modules: list[Module] -- Modules of the program.
+        """
+        self.array_offsets = []
+        self.classes = {}
+        self.descriptors = []
+        self.exports = {}
+        self.functions = []
+        self.initialized = []
+        self.int_constants = {}
+        self.modules = modules
+        self.quad_offsets = []
+        self.quads = []
+        self.type_offsets = []
+        self.values = [[] for _ in range(5)]
+
+    def run(self) -> None:
+        """
+        Resolve the functions called by every module, relocate their addresses and merge them.
+        """
+        self.__collect_symbols()
+        for module in self.modules:
+            self.type_offsets.append([len(type_values) for type_values in self.values])
+            for type_values, module_values in zip(self.values, module.values):
+                type_values.extend(module_values)
+        # Constants created by the linker are added after every module, and the ones that already hold the
+        # same value are reused.
+        start = start_global_memory + INT_INDEX * chunk_size
+        for index, value in enumerate(self.values[INT_INDEX]):
+            if value is not None:
+                self.int_constants.setdefault(value, start + index)
+
+        main_module, main = self.exports["main"]
+        main_address = self.__relocate(main_module, main.address)
+        self.quads = [
+            (Operations.ERA, 0, 0, main_address),
+            (Operations.GOSUB, 0, 0, main_address),
+        ]
+        self.initialized = list(self.modules[main_module].initialized[:PROLOGUE_SIZE])
+        for index in range(len(self.modules)):
+            self.quad_offsets.append(len(self.quads) - PROLOGUE_SIZE)
+            self.array_offsets.append(len(self.descriptors))
+            self.__merge(index)
+
+    def __collect_symbols(self) -> None:
+        """
+        Find the module that defines each function and check that every module declares each class with the
+        same attributes.
+        """
+        for index, module in enumerate(self.modules):
+            for symbol in module.functions:
+                if not symbol.defined:
+                    continue
+                if (export := self.exports.get(symbol.name)) is not None:
+                    raise LinkError(
+                        OOPLErrorTypes.DUPLICATE,
+                        f"function {symbol.name} is defined in {self.modules[export[0]].name} and in "
+                        f"{module.name}",
+                    )
+                self.exports[symbol.name] = (index, symbol)
+            for name, layout in module.classes.items():
+                if (declared := self.classes.get(name)) is None:
+                    self.classes[name] = (module.name, layout)
+                elif declared[1] != layout:
+                    raise LinkError(
+                        OOPLErrorTypes.TYPE_MISMATCH,
+                        f"class {name} has different attributes in {declared[0]} and in {module.name}",
+                    )
+        if "main" not in self.exports:
+            raise LinkError(
+                OOPLErrorTypes.UNDEFINED_SYMBOL, "no module defines the main function"
+            )
+
+    def __merge(self, index: int) -> None:
+        """
+        Add the relocated quadruples, array descriptors and functions of a module to the program.
+
+        Arguments:
+        index: int -- Position of the module.
+        """
+        module = self.modules[index]
+        addresses = [address for quad in module.quads for address in quad[1:]]
+        for slot, kind, symbol in module.relocations:
+            addresses[slot] = self.__apply(index, kind, addresses[slot], symbol)
+        for quad_index in range(PROLOGUE_SIZE, len(module.quads)):
+            start = 3 * quad_index
+            self.quads.append(
+                (module.quads[quad_index][0], *addresses[start : start + 3])
+            )
+            self.initialized.append(module.initialized[quad_index])
+
+        for base, dims in module.descriptors:
+            self.descriptors.append(
+                (
+                    self.__relocate(index, base),
+                    tuple(
+                        (self.__relocate(index, dim_index), lim_s, m, checked)
+                        for dim_index, lim_s, m, checked in dims
+                    ),
+                )
+            )
+
+        for symbol in module.functions:
+            if symbol.defined:
+                start_quad = self.__int_constant(
+                    symbol.start_quad + self.quad_offsets[index]
+                )
+                self.functions.append((symbol.name, start_quad, symbol.resources))
+
+    def __apply(
+        self, index: int, kind: int, address: MemoryAddress, symbol: int
+    ) -> MemoryAddress:
+        """
+        Get the address that replaces an address of the quadruples of a module.
+
+        Arguments:
+        index: int -- Position of the module.
+        kind: int -- Kind of relocation.
+        address: MemoryAddress -- Address in the module.
+        symbol: int -- Position of the function it refers to in the functions of the module.
+        """
+        if kind == GLOBAL:
+            return self.__relocate(index, address)
+        elif kind == QUADRUPLE:
+            return self.__int_constant(
+                self.__module_int(index, address) + self.quad_offsets[index]
+            )
+        elif kind == ARRAY:
+            return self.__int_constant(
+                self.__module_int(index, address) + self.array_offsets[index]
+            )
+        elif kind == FUNCTION:
+            export_index, export = self.__resolve(index, symbol)
+            return self.__relocate(export_index, export.address)
+        elif kind == RETURN:
+            export_index, export = self.__resolve(index, symbol)
+            return self.__relocate(export_index, export.return_address)
+        raise LinkError(
+            OOPLErrorTypes.OBJECT_FILE,
+            f"unknown relocation {kind} in {self.modules[index].name}",
+        )
+
+    def __resolve(self, index: int, symbol: int) -> Tuple[int, FunctionSymbol]:
+        """
+        Get the module that defines a function called by a module, and the function as that module defines it.
+
+        Arguments:
+        index: int -- Position of the module that calls the function.
+        symbol: int -- Position of the function in the functions of the module.
+        """
+        module = self.modules[index]
+        called = module.functions[symbol]
+        if (export := self.exports.get(called.name)) is None:
+            raise LinkError(
+                OOPLErrorTypes.UNDEFINED_SYMBOL,
+                f"function {called.name} is called in {module.name} but no module defines it",
+            )
+        export_index, defined = export
+        if defined.signature != called.signature:
+            raise LinkError(
+                OOPLErrorTypes.TYPE_MISMATCH,
+                f"function {called.name} is declared as {called.signature} in {module.name} but defined as "
+                f"{defined.signature} in {self.modules[export_index].name}",
+            )
+        return export
+
+    def __relocate(self, index: int, address: MemoryAddress) -> MemoryAddress:
+        """
+        Move a global address of a module to where the global memory of the module is in the program. Other
+        addresses stay the same.
+
+        Arguments:
+        index: int -- Position of the module.
+        address: MemoryAddress -- Address in the module.
+        """
+        if not start_global_memory <= address < start_function_memory:
+            return address
+        type_index = (address - start_global_memory) // chunk_size
+        return address + self.type_offsets[index][type_index]
+
+    def __module_int(self, index: int, address: MemoryAddress) -> int:
+        """
+        Get the value of an int constant of a module.
+
+        Arguments:
+        index: int -- Position of the module.
+        address: MemoryAddress -- Address of the constant in the module.
+        """
+        start = start_global_memory + INT_INDEX * chunk_size
+        return int(self.modules[index].values[INT_INDEX][address - start])
+
+    def __int_constant(self, value: int) -> MemoryAddress:
+        """
+        Get the address of an int constant of the program with a value, adding it if there is none.
+
+        Arguments:
+        value: int -- Value of the constant.
+        """
+        if (address := self.int_constants.get(value)) is None:
+            ints = self.values[INT_INDEX]
+            address = start_global_memory + INT_INDEX * chunk_size + len(ints)
+            ints.append(value)
+            self.int_constants[value] = address
+        return address
+
+    def write(self, stream: BinaryIO) -> None:
+        """
+        Write the linked program as a binary object file.
+
+        Arguments:
+        stream: BinaryIO -- Stream where the object file is written.
+        """
+        object_file.write_program(
+            stream,
+            tuple(len(type_values) for type_values in self.values),
+            self.values,
+            self.functions,
+            self.descriptors,
+            self.quads,
+            self.initialized,
+        )
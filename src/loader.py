@@ -0,0 +1,96 @@
+import mmap
+from typing import Iterable
+
+from . import object_file
+from .vm import VM
+from .utils.enums import Segments, Operations
+
+
+def load(vm: VM, lines: Iterable[str]) -> None:
+    """
+    Read the contents of an object file into the VM.
+
+    Arguments:
+    vm: VM -- The virtual machine that will receive the program.
+    lines: Iterable[str] -- Lines of the object file, as generated by the compiler.
+    """
+    segment = None
+    segments = [s.value for s in Segments]
+
+    for line in lines:
+        line = line.removesuffix("\n")
+
+        if line[0] == "#":
+            # Skip comments and debug information.
+            continue
+        elif line in segments:
+            segment = Segments(line)
+            continue
+
+        match segment:
+            case Segments.ADDRESS_SPACE:
+                line = line.split(",")
+                vm.init_address_space(int(line[0]), int(line[1]), int(line[2]))
+            case Segments.GLOBAL_MEMORY:
+                index = line.find(",")
+                line = [line[:index], line[index + 1 :]]
+                line[1] = line[1].replace("\\n", "\n").replace("\\t", "\t")
+                if line[1] != "None":
+                    vm.set_global_variable(int(line[0]), line[1])
+            case Segments.FUNCTIONS:
+                line = line.split(",")
+                vm.add_function(
+                    line[0],
+                    int(line[1]),
+                    (
+                        int(line[2]),
+                        int(line[3]),
+                        int(line[4]),
+                        int(line[5]),
+                        int(line[6]),
+                    ),
+                )
+            case Segments.ARRAYS:
+                values = [int(value) for value in line.split(",")]
+                dims = zip(
+                    values[1::4], values[2::4], values[3::4], map(bool, values[4::4])
+                )
+                vm.add_array((values[0], tuple(dims)))
+            case Segments.QUADRUPLES:
+                line = line.split(",")
+                addr1 = int(line[1])
+                addr2 = int(line[2])
+                addr3 = int(line[3])
+                # Object files without the mask of initialized addresses check all of them.
+                initialized = int(line[4]) if len(line) > 4 else 0
+                vm.add_quadruple(
+                    (Operations(line[0]), addr1, addr2, addr3), initialized
+                )
+            case Segments.GLOBAL_RESOURCES:
+                line = line.split(",")
+                vm.init_global_memory(
+                    (
+                        int(line[0]),
+                        int(line[1]),
+                        int(line[2]),
+                        int(line[3]),
+                        int(line[4]),
+                    )
+                )
+
+
+def load_file(vm: VM, path: str) -> None:
+    """
+    Read an object file into the VM, either a binary one or a text one.
+
+    Arguments:
+    vm: VM -- The virtual machine that will receive the program.
+    path: str -- Path of the object file.
+    """
+    with open(path, "rb") as file:
+        if object_file.is_object_file(file.read(len(object_file.MAGIC))):
+            # The mapping stays open after closing the file, while the VM reads quadruples from it.
+            object_file.load(vm, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+        else:
+            file.seek(0)
+            load(vm, file.read().decode().splitlines(keepends=True))
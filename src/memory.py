@@ -1,8 +1,15 @@
-from typing import Optional, TypeVar, Generic
+from typing import Optional, TextIO, TypeVar, Generic
 
 from .utils.types import MemoryType, MemoryAddress
 from .utils.enums import Types
 from .utils.types import Resources
+
+# Layout of the address space. Each segment has a chunk of addresses for every type, in the same order as
+# Resources, so the type of an address only depends on its chunk.
+start_global_memory = 1
+chunk_size = 1 << 24
+start_function_memory = start_global_memory + chunk_size * 5
+
 # Generic definition of every accepted var type
 T = TypeVar(
     "T", None, bool | None, float | None, int | None, str | None, MemoryAddress | None
@@ -10,17 +17,49 @@ T = TypeVar(
 
 # Contains a collection of values for a specific type
 class MemoryList(Generic[T]):
+    addresses: dict[T, MemoryAddress]
     values: list[T]
     start_address: int
 
     def __init__(
         self, start: int, size: Optional[int] = None, default_value: Optional[T] = None
     ) -> None:
+        self.addresses = {}
         self.start_address = start
         if size is None:
             self.values = []
         else:
             self.values = [default_value for _ in range(size)]
+            if default_value is not None and size > 0:
+                self.addresses[default_value] = start
+
+    def store(self, index: int, value: T) -> None:
+        """
+        Set the value of an entry, keeping track of the first address that holds each value.
+
+        Arguments:
+        index: int -- Position of the entry in the list.
+        value: T -- Value to store.
+        """
+        previous = self.values[index]
+        self.values[index] = value
+        address = index + self.start_address
+        if previous is not None and self.addresses.get(previous) == address:
+            # Look for the next entry that holds the value that was replaced.
+            del self.addresses[previous]
+            for other, other_value in enumerate(self.values):
+                if other_value == previous:
+                    self.addresses[previous] = other + self.start_address
+                    break
+        if value is not None and self.addresses.get(value, address) >= address:
+            self.addresses[value] = address
+
+    def clear(self) -> None:
+        """
+        Delete all the entries.
+        """
+        self.values.clear()
+        self.addresses.clear()
 
 
 class Memory:
@@ -30,11 +69,12 @@ class Memory:
     ints: MemoryList[int | None]
     strings: MemoryList[str | None]
     ptrs: MemoryList[MemoryAddress | None]
+    temps: set[MemoryAddress]
 
     def __init__(
         self,
         base_address: int,
-        chunk_size: int = 1000,
+        chunk_size: int = chunk_size,
         resources: Optional[Resources] = None,
     ) -> None:
         """
@@ -54,6 +94,7 @@ class Memory:
             self.ints = MemoryList(base_address + self.chunk_size * 2, resources[2])
             self.strings = MemoryList(base_address + self.chunk_size * 3, resources[3])
             self.ptrs = MemoryList(base_address + self.chunk_size * 4, resources[4])
+        self.temps = set()
 
     def __get_list_from_index(self, index: int) -> MemoryList:
         """
@@ -130,7 +171,7 @@ class Memory:
                 self[l.values[index - l.start_address]] = value
                 return
 
-        l.values[index - l.start_address] = value
+        l.store(index - l.start_address, value)
 
     def __append(self, l: MemoryList, value: MemoryType | None) -> MemoryAddress:
         """
@@ -142,9 +183,11 @@ class Memory:
         """
         l.values.append(value)
         l_len = len(l.values) - 1
-        if l_len > self.chunk_size:
+        if l_len >= self.chunk_size:
             raise Exception("Chunk size exceeded!")
         else:
+            if value is not None:
+                l.addresses.setdefault(value, l_len + l.start_address)
             return l_len + l.start_address
 
     def save_ptr(self, index: int, value: int) -> None:
@@ -156,7 +199,7 @@ class Memory:
         value: int -- Last quadruple executed.
         """
         l = self.ptrs
-        l.values[index - l.start_address] = value
+        l.store(index - l.start_address, value)
 
     def append(self, type: str, value: MemoryType) -> MemoryAddress:
         """
@@ -182,6 +225,18 @@ class Memory:
         [self.__append(l, None) for _ in range(size - 1)]
         return initial_address
 
+    def reserve_temp(self, t: str) -> MemoryAddress:
+        """
+        Reserve a space of memory for an intermediate result. Temporaries are only used by the quadruples
+        close to the one that produces them, so they can share their space once the function is complete.
+
+        Arguments:
+        t: str -- Type of the intermediate result.
+        """
+        address = self.reserve(t)
+        self.temps.add(address)
+        return address
+
     def find(self, type: str, value: MemoryType) -> MemoryAddress | None:
         """
         Get address for a specific value type.
@@ -191,19 +246,18 @@ class Memory:
         value: MemoryType -- Type of the value stored.
         """
         l = self.__get_list_from_t(type)
-        try:
-            return l.values.index(value) + l.start_address
-        except ValueError:
-            return None
+        return l.addresses.get(value)
 
     def clear(self) -> None:
         """
         Delete all content of memory lists.
         """
-        self.bools.values.clear()
-        self.floats.values.clear()
-        self.ints.values.clear()
-        self.strings.values.clear()
+        self.bools.clear()
+        self.floats.clear()
+        self.ints.clear()
+        self.strings.clear()
+        self.ptrs.clear()
+        self.temps.clear()
 
     def describe_resources(self) -> Resources:
         """
@@ -227,31 +281,59 @@ class Memory:
         l = self.__get_list_from_index(address)
         return l == self.ptrs
 
-    def print(self, verbose: bool, comment: bool = False):
+    def is_int(self, address: MemoryAddress) -> bool:
+        """
+        Check if the content of a memory address is an int.
+
+        Arguments:
+        address: MemoryAddress -- Address where the entry is stored.
+        """
+        l = self.__get_list_from_index(address)
+        return l == self.ints
+
+    def print(
+        self, verbose: bool, comment: bool = False, stream: TextIO | None = None
+    ) -> None:
         """
         Printing to show information about the memory lists depending on verbose value.
+
+        Arguments:
+        verbose: bool -- Whether to add the type of each list as a comment.
+        comment: bool -- Whether to print every entry as a comment.
+        stream: TextIO | None -- Stream to print to, the standard output if it is None.
         """
         if verbose:
-            print("# bools")
+            print("# bools", file=stream)
         for index, item in enumerate(self.bools.values):
-            print(f"{'# ' if comment else ''}{index + self.bools.start_address},{item}")
+            print(
+                f"{'# ' if comment else ''}{index + self.bools.start_address},{item}",
+                file=stream,
+            )
         if verbose:
-            print("# floats")
+            print("# floats", file=stream)
         for index, item in enumerate(self.floats.values):
             print(
-                f"{'# ' if comment else ''}{index + self.floats.start_address},{item}"
+                f"{'# ' if comment else ''}{index + self.floats.start_address},{item}",
+                file=stream,
             )
         if verbose:
-            print("# ints")
+            print("# ints", file=stream)
         for index, item in enumerate(self.ints.values):
-            print(f"{'# ' if comment else ''}{index + self.ints.start_address},{item}")
+            print(
+                f"{'# ' if comment else ''}{index + self.ints.start_address},{item}",
+                file=stream,
+            )
         if verbose:
-            print("# strings")
+            print("# strings", file=stream)
         for index, item in enumerate(self.strings.values):
             print(
-                f"{'# ' if comment else ''}{index + self.strings.start_address},{item}"
+                f"{'# ' if comment else ''}{index + self.strings.start_address},{item}",
+                file=stream,
             )
         if verbose:
-            print("# ptrs")
+            print("# ptrs", file=stream)
         for index, item in enumerate(self.ptrs.values):
-            print(f"{'# ' if comment else ''}{index + self.ptrs.start_address},{item}")
+            print(
+                f"{'# ' if comment else ''}{index + self.ptrs.start_address},{item}",
+                file=stream,
+            )
@@ -0,0 +1,103 @@
+from typing import Callable
+
+from .utils.types import MemoryAddress, MemoryType, Resources
+
+
+def to_bool(value: MemoryType) -> bool:
+    """
+    Convert a value to be stored in a bool address.
+
+    Arguments:
+    value: MemoryType -- Value to convert, strings come from the object file or the user's input.
+    """
+    return value if isinstance(value, bool) else value == "True"
+
+
+# Conversion applied when storing a value, in the same order as the types of Resources.
+converters: list[Callable[[MemoryType], MemoryType]] = [to_bool, float, int, str, int]
+
+
+Frame = list[MemoryType | None]
+
+
+class MemoryLayout:
+    base_address: int
+    chunk_size: int
+    frames: list[Frame]
+    hits: int
+    misses: int
+    size: int
+    starts: list[int]
+    template: Frame
+
+    def __init__(
+        self, base_address: int, chunk_size: int, resources: Resources
+    ) -> None:
+        """
+        Map the addresses of a memory segment to the position they have in a single flat list, where the
+        values of each type are stored one after the other.
+
+        Arguments:
+        base_address: int -- First address of the segment.
+        chunk_size: int -- Amount of addresses reserved for each type.
+        resources: Resources -- Amount of values of each type that the segment holds.
+        """
+        self.base_address = base_address
+        self.chunk_size = chunk_size
+        self.starts = []
+        self.size = 0
+        for amount in resources:
+            self.starts.append(self.size)
+            self.size += amount
+        self.template = [None] * self.size
+        self.frames = []
+        self.hits = 0
+        self.misses = 0
+
+    def type_index(self, address: MemoryAddress) -> int:
+        """
+        Get the position of the type of an address in Resources.
+
+        Arguments:
+        address: MemoryAddress -- Address in this segment.
+        """
+        return (address - self.base_address) // self.chunk_size
+
+    def offset(self, address: MemoryAddress) -> int:
+        """
+        Get the position of an address in the flat list of the segment.
+
+        Arguments:
+        address: MemoryAddress -- Address in this segment.
+        """
+        type_index, index = divmod(address - self.base_address, self.chunk_size)
+        return self.starts[type_index] + index
+
+    def new_frame(self) -> Frame:
+        """
+        Get a flat list with every value of the segment uninitialized.
+        """
+        return self.template.copy()
+
+    def acquire(self) -> Frame:
+        """
+        Get a frame with every value of the segment uninitialized, reusing one that was released if there is
+        any.
+        """
+        if len(self.frames) > 0:
+            self.hits += 1
+            frame = self.frames.pop()
+            frame[:] = self.template
+            return frame
+        else:
+            self.misses += 1
+            return self.template.copy()
+
+    def release(self, frame: Frame) -> None:
+        """
+        Keep a frame that is no longer used so it can be acquired again.
+
+        Arguments:
+        frame: Frame -- Frame acquired from this layout.
+        """
+        self.frames.append(frame)
@@ -1,3 +1,4 @@
+from ..constant_folder import ConstantFolder
 from ..memory import Memory
 from ..quadruple_list import QuadrupleList
 from ..scope_stack import ScopeStack
@@ -19,21 +20,41 @@ class Expression:
         mem: Memory,
         quads: QuadrupleList,
         scope_stack: ScopeStack,
+        constants: ConstantFolder,
     ) -> None:
+        # Variables whose value is known are replaced by it, so only the value assigned to the left side of an
+        # assignment is replaced.
+        if op_code is not Operations.ASSIGNOP:
+            left = constants.value_of(left)
+        right = constants.value_of(right)
         l_type, l_addr, l_name = left
         r_type, r_addr, _ = right
-        self.type = SemanticCube().get(l_type, op_code, r_type)
+        sem_cube = SemanticCube()
+        self.type = sem_cube.get(l_type, op_code, r_type)
         if op_code is Operations.ASSIGNOP:
             if l_name is not None and scope_stack.has_var(l_name):
                 quads.add((op_code, r_addr, 0, l_addr))
                 self.addr = l_addr
                 self.name = l_name
+                var_info = scope_stack.get_var(l_name)
+                if var_info.array_info is None and var_info.address == l_addr:
+                    constants.assign(left, right)
             else:
                 raise Exception(f"Only variables may be assigned to.")
+        elif (folded := constants.fold(left, op_code, right)) is not None:
+            self.addr = folded[1]
+            self.name = None
         else:
-            self.addr = mem.reserve(self.type)
+            self.addr = mem.reserve_temp(self.type)
             self.name = None
-            quads.add((op_code, l_addr, r_addr, self.addr))
+            quads.add(
+                (
+                    sem_cube.get_typed(l_type, op_code, r_type),
+                    l_addr,
+                    r_addr,
+                    self.addr,
+                )
+            )
 
     def get(self) -> TypeAddress:
         return (self.type, self.addr, self.name)
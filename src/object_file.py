@@ -0,0 +1,546 @@
+import struct
+import sys
+from array import array
+from itertools import repeat
+from typing import BinaryIO, Sequence, Tuple
+
+from .array_table import ArrayTable
+from .func_dir import CFuncDir
+from .memory import (
+    Memory,
+    MemoryList,
+    chunk_size,
+    start_function_memory,
+    start_global_memory,
+)
+from .quadruple_list import QuadrupleList
+from .utils.enums import Operations
+from .utils.errors import VMError, OOPLErrorTypes
+from .utils.types import (
+    ArrayDescriptor,
+    MemoryAddress,
+    MemoryType,
+    Quadruple,
+    Resources,
+)
+from .vm import VM
+
+# Binary object files start with a header made of the magic bytes and the version of the format, which must
+# change every time the layout below does.
+#
+#   header              magic (4 bytes), version (u16)
+#   address space       start of the global memory, start of the function memory and addresses of each
+#                       type (3 x u32)
+#   global resources    5 x u32
+#   constant pool       for each type: addresses (i32 array) and values (typed array, strings are stored as
+#                       their lengths (u32 array) followed by their UTF-8 bytes), then the addresses (i32
+#                       array) and decimal strings of the ints that don't fit in 64 bits
+#   function table      u32 count, then name, start quadruple address (i32) and 5 x u32 resources each
+#   array descriptors   number of dimensions of each one (u32 array), base addresses (i32 array) and index
+#                       address, lim_s, m and whether the index is checked of every dimension (i32 array,
+#                       4 per dimension)
+#   quadruples          operation names used, operation codes (u8 array), addresses (i32 array, 3 per
+#                       quadruple) and masks of initialized addresses (u8 array)
+#
+# Arrays are stored as a u32 length followed by their items in little endian, which start at an offset aligned
+# to ALIGNMENT so they can be read without copying them.
+#
+# Object files of older versions are still loaded, they differ from the current one in:
+#   1   arrays are not aligned, and everything that is missing from version 2
+#   2   no address space, they use the legacy one of the VM
+#   3   no array descriptors
+#   4   no checked flag in the dimensions of the array descriptors, every index is checked
+#   5   no ints that don't fit in 64 bits
+MAGIC = b"OOPL"
+VERSION = 6
+FIRST_VERSION = 1
+ALIGNMENT = 8
+
+header = struct.Struct("<4sH")
+address_space = struct.Struct("<3I")
+resources = struct.Struct("<5I")
+length = struct.Struct("<I")
+function = struct.Struct("<i5I")
+
+# Typecodes of the values of the constant pool, in the same order as the types of Resources. Strings are
+# handled separately.
+value_typecodes = ["b", "d", "q", None, "q"]
+ADDRESS_TYPECODE = "i"
+
+# Range of the ints stored in the arrays of the constant pool, the rest are stored as decimal strings.
+min_int = -(1 << 63)
+max_int = (1 << 63) - 1
+
+
+def is_object_file(data: bytes) -> bool:
+    """
+    Check if some data is a binary object file by looking at its magic bytes.
+
+    Arguments:
+    data: bytes -- Start of the file.
+    """
+    return data[: len(MAGIC)] == MAGIC
+
+
+def unescape(value: str) -> str:
+    """
+    Replace the escape sequences of a string constant with the characters they represent.
+
+    Arguments:
+    value: str -- String as it was written in the source code.
+    """
+    return value.replace("\\n", "\n").replace("\\t", "\t")
+
+
+def padding(offset: int, alignment: int = ALIGNMENT) -> int:
+    """
+    Get the amount of bytes needed after an offset to reach the next aligned offset.
+
+    Arguments:
+    offset: int -- Offset from the start of the file.
+    alignment: int -- Multiple the aligned offsets are of.
+    """
+    return -offset % alignment
+
+
+class Writer:
+    offset: int
+    stream: BinaryIO
+
+    def __init__(self, stream: BinaryIO) -> None:
+        """
+        Write the parts of a binary object file.
+
+        Arguments:
+        stream: BinaryIO -- Stream where the object file is written.
+        """
+        self.offset = 0
+        self.stream = stream
+
+    def write(self, data: bytes) -> None:
+        """
+        Write raw bytes.
+
+        Arguments:
+        data: bytes -- Bytes to write.
+        """
+        self.stream.write(data)
+        self.offset += len(data)
+
+    def pack(self, format: struct.Struct, *values) -> None:
+        """
+        Write values with a fixed layout.
+
+        Arguments:
+        format: struct.Struct -- Layout of the values.
+        values -- Values to write.
+        """
+        self.write(format.pack(*values))
+
+    def array(self, items: array) -> None:
+        """
+        Write an array preceded by its length.
+
+        Arguments:
+        items: array -- Array to write.
+        """
+        self.pack(length, len(items))
+        self.write(bytes(padding(self.offset)))
+        if sys.byteorder == "big":
+            items = array(items.typecode, items)
+            items.byteswap()
+        self.write(items.tobytes())
+
+    def strings(self, values: list[str]) -> None:
+        """
+        Write a list of strings as their lengths followed by their contents.
+
+        Arguments:
+        values: list[str] -- Strings to write.
+        """
+        encoded = [value.encode() for value in values]
+        self.array(array("I", [len(value) for value in encoded]))
+        self.write(b"".join(encoded))
+
+
+class Reader:
+    alignment: int
+    data: memoryview
+    offset: int
+
+    def __init__(self, data: bytes) -> None:
+        """
+        Read the parts of a binary object file in the same order they were written.
+
+        Arguments:
+        data: bytes -- Contents of the object file, any object that supports the buffer protocol works.
+        """
+        # Object files of version 1 don't align their arrays, so it is changed to 1 to read them.
+        self.alignment = ALIGNMENT
+        self.data = memoryview(data)
+        self.offset = 0
+
+    def unpack(self, format: struct.Struct) -> tuple:
+        """
+        Read values with a fixed layout.
+
+        Arguments:
+        format: struct.Struct -- Layout of the values.
+        """
+        values = format.unpack_from(self.data, self.offset)
+        self.offset += format.size
+        return values
+
+    def array(self, typecode: str) -> Sequence:
+        """
+        Read an array preceded by its length. The items are viewed in place when the machine is little endian,
+        otherwise they are copied.
+
+        Arguments:
+        typecode: str -- Type of the items of the array.
+        """
+        (count,) = self.unpack(length)
+        self.offset += padding(self.offset, self.alignment)
+        itemsize = array(typecode).itemsize
+        end = self.offset + count * itemsize
+        data = self.data[self.offset : end]
+        self.offset = end
+        if sys.byteorder == "little":
+            return data.cast(typecode)
+        items = array(typecode)
+        items.frombytes(data)
+        items.byteswap()
+        return items
+
+    def strings(self) -> list[str]:
+        """
+        Read a list of strings written as their lengths followed by their contents.
+        """
+        values = []
+        for size in self.array("I"):
+            end = self.offset + size
+            values.append(str(self.data[self.offset : end], "utf-8"))
+            self.offset = end
+        return values
+
+
+class PackedQuadruples(Sequence[Quadruple]):
+    addresses: Sequence[int]
+    codes: Sequence[int]
+    operations: list[Operations]
+
+    def __init__(
+        self,
+        operations: list[Operations],
+        codes: Sequence[int],
+        addresses: Sequence[int],
+    ) -> None:
+        """
+        Quadruples as they are stored in the object file, which are only unpacked when the VM reads them.
+
+        Arguments:
+        operations: list[Operations] -- Operations used by the quadruples.
+        codes: Sequence[int] -- Position of the operation of each quadruple.
+        addresses: Sequence[int] -- Addresses of all the quadruples, three for each one.
+        """
+        self.addresses = addresses
+        self.codes = codes
+        self.operations = operations
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index: int) -> Quadruple:
+        """
+        Unpack a quadruple.
+
+        Arguments:
+        index: int -- Number of the quadruple.
+        """
+        start = 3 * index
+        return (
+            self.operations[self.codes[index]],
+            self.addresses[start],
+            self.addresses[start + 1],
+            self.addresses[start + 2],
+        )
+
+
+def memory_values(global_memory: Memory) -> list[list[MemoryType | None]]:
+    """
+    Get the values of every address of the global memory, one list for each type in the same order as
+    Resources, where the ones not known at compile time are None and strings have their escape sequences
+    replaced.
+
+    Arguments:
+    global_memory: Memory -- Memory with the constants and global variables.
+    """
+    memory_lists: list[MemoryList] = [
+        global_memory.bools,
+        global_memory.floats,
+        global_memory.ints,
+        global_memory.strings,
+        global_memory.ptrs,
+    ]
+    return [
+        [
+            unescape(value) if typecode is None and value is not None else value
+            for value in memory_list.values
+        ]
+        for memory_list, typecode in zip(memory_lists, value_typecodes)
+    ]
+
+
+def write_constants(writer: Writer, values: list[list[MemoryType | None]]) -> None:
+    """
+    Write the constant pool, which only has the values known at compile time, the rest start uninitialized.
+
+    Arguments:
+    writer: Writer -- Writer of the object file.
+    values: list[list[MemoryType | None]] -- Values of the global memory of each type.
+    """
+    wide_addresses = array(ADDRESS_TYPECODE)
+    wide_values = []
+    for type_index, (type_values, typecode) in enumerate(zip(values, value_typecodes)):
+        start = start_global_memory + type_index * chunk_size
+        addresses = array(ADDRESS_TYPECODE)
+        known = []
+        for index, value in enumerate(type_values):
+            if value is None:
+                continue
+            if typecode == "q" and not min_int <= value <= max_int:
+                wide_addresses.append(start + index)
+                wide_values.append(str(value))
+            else:
+                addresses.append(start + index)
+                known.append(value)
+        writer.array(addresses)
+        if typecode is None:
+            writer.strings(known)
+        else:
+            writer.array(array(typecode, known))
+    writer.array(wide_addresses)
+    writer.strings(wide_values)
+
+
+def read_constants(
+    reader: Reader, has_wide: bool = True
+) -> list[Tuple[Sequence[int], Sequence]]:
+    """
+    Read the constant pool as the addresses and the values of each type.
+
+    Arguments:
+    reader: Reader -- Reader of the object file.
+    has_wide: bool -- Whether the ints that don't fit in 64 bits follow the values of each type.
+    """
+    constants = []
+    for typecode in value_typecodes:
+        addresses = reader.array(ADDRESS_TYPECODE)
+        values = reader.strings() if typecode is None else reader.array(typecode)
+        constants.append((addresses, values))
+    if has_wide:
+        wide_addresses = reader.array(ADDRESS_TYPECODE)
+        wide_values = reader.strings()
+        for address, value in zip(wide_addresses, wide_values):
+            # Only copied when there are any, so the rest are still viewed in place.
+            type_index = (address - start_global_memory) // chunk_size
+            addresses, values = constants[type_index]
+            if not isinstance(values, list):
+                constants[type_index] = addresses, values = list(addresses), list(
+                    values
+                )
+            addresses.append(address)
+            values.append(int(value))
+    return constants
+
+
+def write_arrays(writer: Writer, descriptors: list[ArrayDescriptor]) -> None:
+    """
+    Write the descriptors of the array accesses.
+
+    Arguments:
+    writer: Writer -- Writer of the object file.
+    descriptors: list[ArrayDescriptor] -- Descriptors, by number.
+    """
+    writer.array(array("I", [len(dims) for _, dims in descriptors]))
+    writer.array(array(ADDRESS_TYPECODE, [base for base, _ in descriptors]))
+    writer.array(
+        array(
+            ADDRESS_TYPECODE,
+            [value for _, dims in descriptors for dim in dims for value in dim],
+        )
+    )
+
+
+def read_arrays(reader: Reader, has_checks: bool = True) -> list[ArrayDescriptor]:
+    """
+    Read the descriptors of the array accesses.
+
+    Arguments:
+    reader: Reader -- Reader of the object file.
+    has_checks: bool -- Whether the dimensions have the flag of whether their index is checked, otherwise
+    every index is.
+    """
+    counts = reader.array("I")
+    bases = reader.array(ADDRESS_TYPECODE)
+    values = reader.array(ADDRESS_TYPECODE)
+    width = 4 if has_checks else 3
+    descriptors = []
+    start = 0
+    for count, base in zip(counts, bases):
+        end = start + width * count
+        dims = zip(
+            values[start:end:width],
+            values[start + 1 : end : width],
+            values[start + 2 : end : width],
+            (
+                map(bool, values[start + 3 : end : width])
+                if has_checks
+                else repeat(True, count)
+            ),
+        )
+        descriptors.append((base, tuple(dims)))
+        start = end
+    return descriptors
+
+
+def write_quadruples(
+    writer: Writer, quads: Sequence[Quadruple], initialized: Sequence[int]
+) -> None:
+    """
+    Write the quadruples and the masks of their addresses that are known to be initialized.
+
+    Arguments:
+    writer: Writer -- Writer of the object file.
+    quads: Sequence[Quadruple] -- Quadruples of the whole program.
+    initialized: Sequence[int] -- Mask of each quadruple.
+    """
+    op_codes = {op_code: index for index, op_code in enumerate(Operations)}
+    used = sorted({quad[0] for quad in quads}, key=lambda op: op_codes[op])
+    codes = {op_code: index for index, op_code in enumerate(used)}
+    writer.strings([op_code.name for op_code in used])
+    writer.array(array("B", [codes[quad[0]] for quad in quads]))
+    writer.array(
+        array(ADDRESS_TYPECODE, [address for quad in quads for address in quad[1:]])
+    )
+    writer.array(array("B", initialized))
+
+
+def read_quadruples(reader: Reader) -> Tuple[PackedQuadruples, Sequence[int]]:
+    """
+    Read the quadruples, which stay packed, and the masks of their addresses that are known to be initialized.
+
+    Arguments:
+    reader: Reader -- Reader of the object file.
+    """
+    used = [Operations[name] for name in reader.strings()]
+    quads = PackedQuadruples(used, reader.array("B"), reader.array(ADDRESS_TYPECODE))
+    return quads, reader.array("B")
+
+
+def write_program(
+    stream: BinaryIO,
+    global_resources: Resources,
+    values: list[list[MemoryType | None]],
+    functions: list[Tuple[str, MemoryAddress, Resources]],
+    descriptors: list[ArrayDescriptor],
+    quads: Sequence[Quadruple],
+    initialized: Sequence[int],
+) -> None:
+    """
+    Write a program as a binary object file.
+
+    Arguments:
+    stream: BinaryIO -- Stream where the object file is written.
+    global_resources: Resources -- Amount of addresses of each type of the global memory.
+    values: list[list[MemoryType | None]] -- Values of the global memory of each type.
+    functions: list[Tuple[str, MemoryAddress, Resources]] -- Name, address of the int constant with the start
+    quadruple and resources of each function.
+    descriptors: list[ArrayDescriptor] -- Descriptors of the array accesses.
+    quads: Sequence[Quadruple] -- Quadruples of the whole program.
+    initialized: Sequence[int] -- Mask of the addresses of each quadruple known to be initialized.
+    """
+    writer = Writer(stream)
+    writer.pack(header, MAGIC, VERSION)
+    writer.pack(address_space, start_global_memory, start_function_memory, chunk_size)
+    writer.pack(resources, *global_resources)
+    write_constants(writer, values)
+    writer.pack(length, len(functions))
+    for name, start_quad, func_resources in functions:
+        writer.strings([name])
+        writer.pack(function, start_quad, *func_resources)
+    write_arrays(writer, descriptors)
+    write_quadruples(writer, quads, initialized)
+
+
+def write(
+    stream: BinaryIO,
+    global_memory: Memory,
+    func_dir: CFuncDir,
+    arrays: ArrayTable,
+    quads: QuadrupleList,
+) -> None:
+    """
+    Write a compiled program as a binary object file.
+
+    Arguments:
+    stream: BinaryIO -- Stream where the object file is written.
+    global_memory: Memory -- Memory with the constants and global variables.
+    func_dir: CFuncDir -- Directory with the functions of the program.
+    arrays: ArrayTable -- Descriptors of the array accesses.
+    quads: QuadrupleList -- Quadruples of the whole program.
+    """
+    write_program(
+        stream,
+        global_memory.describe_resources(),
+        memory_values(global_memory),
+        [
+            (name, func_info.start_quad, func_info.resources)
+            for name, func_info in func_dir.dir.items()
+        ],
+        arrays.descriptors,
+        quads.quads,
+        [quads.get_initialized(index) for index in range(len(quads.quads))],
+    )
+
+
+def load(vm: VM, data: bytes) -> None:
+    """
+    Read the contents of a binary object file into the VM.
+
+    Arguments:
+    vm: VM -- The virtual machine that will receive the program.
+    data: bytes -- Contents of the object file, which can be mapped in memory since the quadruples are read
+    from it when each function is called for the first time.
+    """
+    reader = Reader(data)
+    magic, version = reader.unpack(header)
+    if magic != MAGIC or not FIRST_VERSION <= version <= VERSION:
+        raise VMError(
+            OOPLErrorTypes.OBJECT_FILE,
+            f"cannot load object files of version {version}, expected versions {FIRST_VERSION} to "
+            f"{VERSION}",
+        )
+    if version == 1:
+        reader.alignment = 1
+    if version >= 3:
+        vm.init_address_space(*reader.unpack(address_space))
+    vm.init_global_memory(reader.unpack(resources))
+
+    for typecode, (addresses, values) in zip(
+        value_typecodes, read_constants(reader, version >= 6)
+    ):
+        for address, value in zip(addresses, values):
+            vm.set_global_variable(address, bool(value) if typecode == "b" else value)
+
+    (count,) = reader.unpack(length)
+    for _ in range(count):
+        [name] = reader.strings()
+        start_quad, *func_resources = reader.unpack(function)
+        vm.add_function(name, start_quad, tuple(func_resources))
+
+    if version >= 4:
+        for descriptor in read_arrays(reader, version >= 5):
+            vm.add_array(descriptor)
+
+    vm.set_quadruples(*read_quadruples(reader))
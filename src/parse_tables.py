@@ -0,0 +1,177 @@
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from .libs.ply import __version__ as ply_version
+from .libs.ply import yacc
+
+# Version of the format of the cached tables, which must change every time the layout of CachedTables does.
+VERSION = 1
+
+# Tables already loaded by this process, by the hash of their grammar.
+loaded: dict[str, "CachedTables"] = {}
+
+
+def default_tables_dir() -> Path:
+    """
+    Get the directory where the parse tables are cached by default, inside the cache directory of the user.
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "ooplc"
+
+
+def grammar_hash(module: Any) -> str:
+    """
+    Get a hash of everything the parse tables are generated from: the tokens, the precedence and the rules
+    of the grammar in the order they are defined, along with the version of PLY and of the cached format.
+
+    Arguments:
+    module: Any -- Object with the tokens and the p_ functions of the grammar.
+    """
+    rules = sorted(
+        (
+            getattr(module, name).__code__.co_firstlineno,
+            name,
+            getattr(module, name).__doc__,
+        )
+        for name in dir(module)
+        if name.startswith("p_") and name != "p_error"
+    )
+    source = repr(
+        (
+            VERSION,
+            ply_version,
+            list(module.tokens),
+            getattr(module, "precedence", None),
+            getattr(module, "start", None),
+            [(name, doc) for _, name, doc in rules],
+        )
+    )
+    return hashlib.sha256(source.encode()).hexdigest()
+
+
+class CachedProduction:
+    callable: Any
+    func: str | None
+    len: int
+    name: str
+    str: str
+
+    def __init__(self, name: str, length: int, func: str | None, text: str) -> None:
+        """
+        Production of the grammar with only what the parser needs to reduce it.
+
+        Arguments:
+        name: str -- Nonterminal the production reduces to.
+        length: int -- Number of symbols of the production.
+        func: str | None -- Name of the function that runs when it is reduced.
+        text: str -- Production as written in the grammar, shown when debugging.
+        """
+        self.callable = None
+        self.func = func
+        self.len = length
+        self.name = name
+        self.str = text
+
+    def __str__(self) -> str:
+        return self.str
+
+    def copy(self) -> "CachedProduction":
+        """
+        Get a copy of the production that is not bound to any function yet.
+        """
+        return CachedProduction(self.name, self.len, self.func, self.str)
+
+    def bind(self, module: Any) -> None:
+        """
+        Get the function that runs when the production is reduced.
+
+        Arguments:
+        module: Any -- Object with the p_ functions of the grammar.
+        """
+        if self.func:
+            self.callable = getattr(module, self.func)
+
+
+class CachedTables:
+    lr_action: dict[int, dict[str, int]]
+    lr_goto: dict[int, dict[str, int]]
+    lr_productions: list[CachedProduction]
+
+    def __init__(
+        self,
+        productions: list[CachedProduction],
+        action: dict[int, dict[str, int]],
+        goto: dict[int, dict[str, int]],
+    ) -> None:
+        """
+        LALR tables of a grammar, in the form the PLY parser reads them.
+
+        Arguments:
+        productions: list[CachedProduction] -- Productions of the grammar, by number.
+        action: dict[int, dict[str, int]] -- Action of each state for each token.
+        goto: dict[int, dict[str, int]] -- State to go to from each state after reducing each nonterminal.
+        """
+        self.lr_action = action
+        self.lr_goto = goto
+        self.lr_productions = productions
+
+
+def build_parser(module: Any, tables_dir: Path | None) -> yacc.LRParser:
+    """
+    Get a parser for the grammar of a module. When the tables of the grammar were cached in the directory, or
+    already loaded by this process, the grammar is neither read nor validated again, otherwise they are
+    generated and cached there.
+
+    Arguments:
+    module: Any -- Object with the tokens and the p_ functions of the grammar.
+    tables_dir: Path | None -- Directory of the cached tables, or None to always generate them.
+    """
+    if tables_dir is None:
+        return yacc.yacc(module=module)
+
+    key = grammar_hash(module)
+    path = tables_dir / f"parsetab-{key}.pickle"
+    if (tables := loaded.get(key)) is None:
+        try:
+            with open(path, "rb") as file:
+                tables = pickle.load(file)
+        except Exception:
+            # Tables that are missing or can't be read are generated again.
+            tables = None
+    if isinstance(tables, CachedTables):
+        loaded[key] = tables
+        # Every parser gets its own productions, bound to its own functions.
+        productions = [production.copy() for production in tables.lr_productions]
+        for production in productions:
+            production.bind(module)
+        return yacc.LRParser(
+            CachedTables(productions, tables.lr_action, tables.lr_goto),
+            module.p_error,
+        )
+
+    parser = yacc.yacc(module=module)
+    tables = CachedTables(
+        [
+            CachedProduction(
+                production.name, production.len, production.func, production.str
+            )
+            for production in parser.productions
+        ],
+        parser.action,
+        parser.goto,
+    )
+    loaded[key] = tables
+    try:
+        tables_dir.mkdir(parents=True, exist_ok=True)
+        # Written to a temporary file first, so compilers running at the same time never read half of it.
+        with tempfile.NamedTemporaryFile("wb", dir=tables_dir, delete=False) as file:
+            pickle.dump(tables, file, pickle.HIGHEST_PROTOCOL)
+        os.replace(file.name, path)
+    except OSError:
+        # Compiling doesn't need the cache, so a directory that can't be written is ignored.
+        pass
+    return parser
@@ -1,54 +1,93 @@
 # OOPL parser
 
 from copy import deepcopy
+from pathlib import Path
+from typing import BinaryIO, TextIO, Tuple
 
-# Import libraries
-from .libs.ply import yacc
-
-from .array_info import ArrayInfo
+from . import object_file, relocatable
+from .array_info import ArrayInfo, array_type, element_type
+from .array_table import ArrayTable
 from .class_dir import ClassDir
+from .constant_folder import ConstantFolder
 from .func_dir import CFuncDir
+from .func_info import CFuncInfo
 from .lexer import Lexer
-from .memory import Memory
+from .memory import Memory, start_global_memory, start_function_memory, chunk_size
 from .nodes.constant import Constant
 from .nodes.expression import Expression
+from .parse_tables import build_parser
+from .passes.bounds_check import BoundsCheckElimination
+from .passes.definite_assignment import DefiniteAssignment
+from .passes.pass_manager import PassManager
+from .passes.peephole import (
+    CompareAndBranch,
+    JumpThreading,
+    Peephole,
+    RedundantCopies,
+)
+from .passes.temporary_allocation import TemporaryAllocation
 from .quadruple_list import QuadrupleList
 from .scope import Scope
 from .scope_stack import ScopeStack
-from .utils.enums import Types, Operations, ScopeTypes, Segments
+from .semantic_cube import SemanticCube
+from .var_info import VarInfo
+from .utils.enums import Types, Operations, Passes, ScopeTypes, Segments
 from .utils.errors import OOPLErrorTypes, CError
-from .utils.types import TokenList, MemoryAddress
+from .utils.types import (
+    ArrayDimension,
+    ForLoop,
+    MemoryAddress,
+    MemoryTypeNames,
+    TokenList,
+    TypeAddress,
+)
 from .containers.stack import Stack
 
-start_global_memory = 1
-start_function_memory = 5001
-chunk_size = 1000
-
 
 class Parser:
+    arrays: ArrayTable
     break_counter: list[int]
     break_stack: list[int]
     class_dir: ClassDir
     class_stack: Stack[str]
+    constants: ConstantFolder
     func_dir: CFuncDir
     function_memory: Memory
     function_stack: list[str]
     global_memory: Memory
     jump_stack: list[MemoryAddress]
     lexer: Lexer
+    loops: list[ForLoop]
+    passes: PassManager
     quads: QuadrupleList
+    relocatable: bool
     scope_stack: ScopeStack
+    stream: TextIO | None
     tokens: TokenList
     verbose: bool
 
-    def __init__(self, lexer, verbose: bool):
+    def __init__(
+        self,
+        lexer,
+        verbose: bool,
+        passes: PassManager | None = None,
+        tables_dir: Path | None = None,
+        stream: TextIO | None = None,
+        relocatable: bool = False,
+    ):
         self.lexer = lexer
         self.tokens = lexer.tokens
-        self.parser = yacc.yacc(module=self)
+        self.parser = build_parser(self, tables_dir)
 
         # Memory
         self.global_memory = Memory(start_global_memory, chunk_size)
         self.function_memory = Memory(start_function_memory, chunk_size)
+        self.passes = PassManager() if passes is None else passes
+        self.constants = ConstantFolder(
+            self.global_memory,
+            self.function_memory,
+            self.passes.is_enabled(Passes.CONSTANT_FOLDING),
+        )
 
         # Scopes
         self.scope_stack = ScopeStack()
@@ -58,11 +97,13 @@ class Parser:
         self.quads = QuadrupleList(self.global_memory)
         self.quads.add((Operations.ERA, 0, 0, 0))
         self.quads.add((Operations.GOSUB, 0, 0, 0))
+        self.arrays = ArrayTable()
 
         # Jumps
         self.break_counter = []
         self.break_stack = []
         self.jump_stack = []
+        self.loops = []
 
         # Functions
         self.func_dir = CFuncDir()
@@ -70,13 +111,20 @@ class Parser:
 
         # Options
         self.verbose = verbose
+        # Where the text object file and the verbose information are printed, the standard output if it is
+        # None, so compiling never has to replace sys.stdout.
+        self.stream = stream
+        # Relocatable modules are linked with other modules, so they don't need a main function and can call
+        # functions that are only declared.
+        self.relocatable = relocatable
 
         # Classes
         self.class_stack = Stack()
         self.class_dir = ClassDir()
 
     def parse(self, p):
-        self.parser.parse(p, tracking=True)
+        # The lexer is given explicitly, otherwise PLY uses the last one built by the process.
+        self.parser.parse(p, lexer=self.lexer.lexer, tracking=True)
 
     # Write functions for each grammar rule which is
     # specified in the docstring.
@@ -98,21 +146,23 @@ class Parser:
         """
         finish  :
         """
-        self.quads.quads[0] = (
-            Operations.ERA,
-            0,
-            0,
-            self.func_dir.get("main").address,
-        )
-        self.quads.quads[1] = (
-            Operations.GOSUB,
-            0,
-            0,
-            self.func_dir.get("main").address,
-        )
+        if not self.relocatable or self.func_dir.has("main"):
+            self.quads.quads[0] = (
+                Operations.ERA,
+                0,
+                0,
+                self.func_dir.get("main").address,
+            )
+            self.quads.quads[1] = (
+                Operations.GOSUB,
+                0,
+                0,
+                self.func_dir.get("main").address,
+            )
         for quad in self.quads:
             op, _, _, func_addr = quad
-            if op is Operations.GOSUB:
+            # The linker checks that the functions called by a relocatable module are defined by some module.
+            if op is Operations.GOSUB and not self.relocatable:
                 if func_addr != 0 and not (
                     (func_name := self.global_memory[func_addr]) is not None
                     and isinstance(func_name, str)
@@ -125,18 +175,68 @@ class Parser:
                         p.lexpos(0),
                         f"Function {func_name} was called but its body was not defined.",
                     )
-        print(Segments.GLOBAL_RESOURCES.value)
+        if self.passes.is_enabled(Passes.DEFINITE_ASSIGNMENT):
+            self.quads.initialized = self.passes.run(
+                Passes.DEFINITE_ASSIGNMENT,
+                self.quads,
+                DefiniteAssignment(
+                    self.quads, self.global_memory, self.function_memory, self.func_dir
+                ).run,
+            )
+        self.passes.record(Passes.CONSTANT_FOLDING, 0, self.constants.folded)
+
+    def print_object(self) -> None:
+        """
+        Print the compiled program as a text object file, which is meant for debugging, to the stream of the
+        parser.
+        """
+        print(Segments.ADDRESS_SPACE.value, file=self.stream)
+        print(
+            f"{start_global_memory},{start_function_memory},{chunk_size}",
+            file=self.stream,
+        )
+        print(Segments.GLOBAL_RESOURCES.value, file=self.stream)
         print(
             str(self.global_memory.describe_resources())
             .removeprefix("(")
-            .removesuffix(")")
+            .removesuffix(")"),
+            file=self.stream,
+        )
+        print(Segments.GLOBAL_MEMORY.value, file=self.stream)
+        self.global_memory.print(self.verbose, stream=self.stream)
+        print(Segments.FUNCTIONS.value, file=self.stream)
+        self.func_dir.print(self.verbose, self.stream)
+        print(Segments.ARRAYS.value, file=self.stream)
+        self.arrays.print(self.verbose, self.stream)
+        print(Segments.QUADRUPLES.value, file=self.stream)
+        self.quads.print(self.verbose, self.stream)
+
+    def write_object(self, stream: BinaryIO) -> None:
+        """
+        Write the compiled program as a binary object file.
+
+        Arguments:
+        stream: BinaryIO -- Stream where the object file is written.
+        """
+        object_file.write(
+            stream, self.global_memory, self.func_dir, self.arrays, self.quads
+        )
+
+    def write_module(self, stream: BinaryIO) -> None:
+        """
+        Write the compiled module as a relocatable module file, to be linked with other modules.
+
+        Arguments:
+        stream: BinaryIO -- Stream where the module is written.
+        """
+        relocatable.write(
+            stream,
+            self.global_memory,
+            self.func_dir,
+            self.class_dir,
+            self.arrays,
+            self.quads,
         )
-        print(Segments.GLOBAL_MEMORY.value)
-        self.global_memory.print(self.verbose)
-        print(Segments.FUNCTIONS.value)
-        self.func_dir.print(self.verbose)
-        print(Segments.QUADRUPLES.value)
-        self.quads.print(self.verbose)
 
     def p_class(self, p):
         """
@@ -224,39 +324,62 @@ class Parser:
                     p.lexpos(0),
                     "missing return statement for non void function",
                 )
-            func_info.resources = self.function_memory.describe_resources()
-
             if self.quads[self.quads.ptr_address(-1)][0] != Operations.ENDSUB:
-                for (
-                    name,
-                    (local_address, global_address),
-                ) in func_info.obj_addresses.items():
-                    obj_prop = self.scope_stack.get_var(name)
-                    if obj_prop.array_info is not None:
-                        for offset in range(0, obj_prop.array_info.size):
-                            self.quads.add(
-                                (
-                                    Operations.OPT_ASSIGN,
-                                    local_address + offset,
-                                    0,
-                                    global_address + offset,
-                                )
-                            )
-                    else:
-                        self.quads.add(
-                            (
-                                Operations.OPT_ASSIGN,
-                                local_address,
-                                0,
-                                global_address,
-                            )
-                        )
                 # Only add an ENDSUB quadruple if there is no return after the current one and it is the end of the function.
                 self.quads.add((Operations.ENDSUB, 0, 0, 0))
+            start = int(self.global_memory[func_info.start_quad])
+            if self.passes.is_enabled(Passes.BOUNDS_CHECK_ELIMINATION):
+                self.passes.run(
+                    Passes.BOUNDS_CHECK_ELIMINATION,
+                    self.quads,
+                    BoundsCheckElimination(
+                        self.quads,
+                        self.arrays,
+                        self.global_memory,
+                        self.function_memory,
+                        self.loops,
+                    ).run,
+                )
+            self.loops.clear()
+            peephole = Peephole(
+                self.quads,
+                self.arrays,
+                self.global_memory,
+                self.function_memory,
+                start,
+                {info.return_address for info in self.func_dir.dir.values()},
+                [
+                    rule
+                    for rule in [JumpThreading(), RedundantCopies(), CompareAndBranch()]
+                    if self.passes.is_enabled(rule.name)
+                ],
+            )
+            removed = peephole.run()
+            for rule_name, count in removed.items():
+                self.passes.record(rule_name, peephole.seconds[rule_name], count)
+            if self.passes.is_enabled(Passes.TEMPORARY_ALLOCATION):
+                func_info.resources = self.passes.run(
+                    Passes.TEMPORARY_ALLOCATION,
+                    self.quads,
+                    TemporaryAllocation(
+                        self.quads,
+                        self.arrays,
+                        self.global_memory,
+                        self.function_memory,
+                        start,
+                    ).run,
+                )
+            else:
+                func_info.resources = self.function_memory.describe_resources()
             if self.verbose:
-                print(f"# Function: {func_name}")
-                print(f"# Memory map:")
-                self.function_memory.print(True, True)
+                print(f"# Function: {func_name}", file=self.stream)
+                for rule_name, count in removed.items():
+                    print(
+                        f"# Peephole {rule_name.value}: {count} quadruples removed",
+                        file=self.stream,
+                    )
+                print(f"# Memory map:", file=self.stream)
+                self.function_memory.print(True, True, self.stream)
         elif len(p) == 5 and func_name == "main":
             # Special logic for main function.
             raise CError(
@@ -266,6 +389,7 @@ class Parser:
                 "main function cannot be declared via forward declaration",
             )
         self.function_memory.clear()
+        self.constants.clear()
         self.scope_stack.pop()
 
     # Considers both functions and methods
@@ -280,16 +404,13 @@ class Parser:
             class_info = self.class_dir.get(self.class_stack.top())
             self.scope_stack.top().add("this", class_info.name, None)
             for value in class_info.var_table.values():
-                # Save the variables with the this keyword directly.
-                _, address, name = self.scope_stack.top().add(
-                    f"this.{value.name}", value.type, value.array_info
+                # The attributes are not copied into the method, they are reached through the this pointers,
+                # so they only need to be known as variables.
+                self.scope_stack.top().var_table.add(
+                    f"this.{value.name}", value.type, 0, value.array_info
                 )
-                # Reserve the space needed for each variable of the class.
-                global_address = self.global_memory.reserve(
-                    value.type, 1 if value.array_info is None else value.array_info.size
-                )
-                func_info.obj_addresses[str(name)] = address, global_address
         func_info.start_quad = self.quads.ptr_address()
+        self.constants.clear()
 
     def p_register_function(self, p):
         """
@@ -341,8 +462,10 @@ class Parser:
                         f"the new function signature of {func_name} does not match the previously defined signature",
                     )
                 else:
-                    self.function_memory.reserve(sp_type)
+                    self.__reserve_param(sp_type)
             self.scope_stack.push(func_info.scope)
+            if self.scope_stack.is_in_class():
+                self.__reserve_this(func_info)
         else:
             # If it is a new function (no header defined before) generate its information and update scope.
             return_address = (
@@ -367,12 +490,114 @@ class Parser:
             self.scope_stack.push(func_scope)
             for param_type, param_name in func_params:
                 # Add parameters to variable table of the latest scope (which is the function being registered)
-                _, var_address, _ = self.scope_stack.top().add(
-                    param_name, param_type, None
+                var_address, array_info = self.__reserve_param(param_type)
+                var_type, _ = element_type(param_type)
+                self.scope_stack.top().var_table.add(
+                    param_name, var_type, var_address, array_info
                 )
                 func_info.param_list.append((param_type, var_address, param_name))
+            if self.scope_stack.is_in_class():
+                self.__reserve_this(func_info)
         self.function_stack.append(func_name)
 
+    def __reserve_param(
+        self, param_type: str
+    ) -> Tuple[MemoryAddress, ArrayInfo | None]:
+        """
+        Reserve the memory of a parameter. Arrays are passed as a pointer to their first element followed by
+        the lim_s and m of each dimension.
+
+        Arguments:
+        param_type: str -- Type of the parameter.
+        """
+        var_type, dims = element_type(param_type)
+        if dims == 0:
+            return self.function_memory.reserve(var_type), None
+        address = self.function_memory.reserve(Types.PTR.value)
+        descriptor = [
+            (
+                self.function_memory.reserve(Types.INT.value),
+                self.function_memory.reserve(Types.INT.value),
+            )
+            for _ in range(dims)
+        ]
+        return address, ArrayInfo.parameter(descriptor)
+
+    def __pass_array(self, arg: TypeAddress, param: VarInfo) -> None:
+        """
+        Pass an array to an array parameter, which receives a pointer to its first element and its dimensions.
+
+        Arguments:
+        arg: TypeAddress -- The whole array.
+        param: VarInfo -- The array parameter.
+        """
+        _, arg_addr, arg_name = arg
+        array_info = self.scope_stack.get_var(arg_name).array_info
+        self.quads.add((Operations.PARAMPTR, arg_addr, 0, param.address))
+        for (lim_addr, m_addr), (p_lim_addr, p_m_addr) in zip(
+            self.__descriptor(array_info), param.array_info.descriptor
+        ):
+            self.quads.add((Operations.PARAM, lim_addr, 0, p_lim_addr))
+            self.quads.add((Operations.PARAM, m_addr, 0, p_m_addr))
+
+    def __descriptor(
+        self, array_info: ArrayInfo
+    ) -> list[Tuple[MemoryAddress, MemoryAddress]]:
+        """
+        Get the addresses of the ints with lim_s and m of each dimension of an array.
+
+        Arguments:
+        array_info: ArrayInfo -- Information of the array.
+        """
+        if array_info.descriptor is not None:
+            return array_info.descriptor
+        descriptor = []
+        for dim in array_info.table:
+            _, lim_addr, _ = Constant(
+                str(dim.lim_s), Types.INT.value, self.global_memory
+            ).get()
+            _, m_addr, _ = Constant(
+                str(dim.m), Types.INT.value, self.global_memory
+            ).get()
+            descriptor.append((lim_addr, m_addr))
+        return descriptor
+
+    def __reserve_this(self, func_info: CFuncInfo) -> None:
+        """
+        Reserve the pointers of a method to where the attributes of each type of its object start. They come
+        right after the parameters, so the header and the body of a method get the same ones.
+
+        Arguments:
+        func_info: CFuncInfo -- Information of the method.
+        """
+        func_info.this_params = {
+            var_type: self.function_memory.reserve(Types.PTR.value)
+            for var_type in MemoryTypeNames
+        }
+
+    def __pass_this(self, base_name: str, func_info: CFuncInfo) -> None:
+        """
+        Pass the pointers to the attributes of an object to a method called on it.
+
+        Arguments:
+        base_name: str -- Name of the object, or this if it is the object of the current method.
+        func_info: CFuncInfo -- Information of the method called.
+        """
+        if base_name == "this":
+            class_info = self.class_dir.get(self.class_stack.top())
+            this_params = self.func_dir.get(self.function_stack[-1]).this_params
+        else:
+            class_info = self.class_dir.get(self.scope_stack.get_var(base_name).type)
+        for var_type, param_address in func_info.this_params.items():
+            if (field := class_info.first_field(var_type)) is None:
+                continue
+            if base_name == "this":
+                # The pointer of the current method is passed as it is.
+                address = this_params[var_type]
+            else:
+                address = self.scope_stack.get_var(f"{base_name}.{field.name}").address
+            self.quads.add((Operations.PARAMPTR, address, 0, param_address))
+
     def p_empty_list(self, p):
         """
         function_parameters : LPAREN RPAREN
@@ -396,12 +621,21 @@ class Parser:
         after_expr_false = self.jump_stack.pop()
         before_expr = self.jump_stack.pop()
         self.quads.add((Operations.GOTO, 0, 0, before_second_assign))
+        self.loops.append(
+            (
+                int(self.global_memory[before_expr]),
+                int(self.global_memory[before_second_assign]),
+                int(self.global_memory[before_block]),
+                self.quads.ptr - 1,
+            )
+        )
         op_code, _, _, _ = self.quads[second_assign]
         self.quads[second_assign] = (op_code, 0, 0, before_expr)
         op_code, addr, _, _ = self.quads[after_expr_false]
         self.quads[after_expr_false] = (op_code, addr, 0, self.quads.ptr_address())
         op_code, addr, _, _ = self.quads[after_expr_true]
         self.quads[after_expr_true] = (op_code, addr, 0, before_block)
+        self.constants.clear()
 
     def p_for_loop_assign(self, p):
         """
@@ -409,6 +643,8 @@ class Parser:
                         |
         """
         self.jump_stack.append(self.quads.ptr_address())
+        # The condition and the body are also reached by jumping from the end of the loop.
+        self.constants.clear()
 
     def p_empty_goto(self, p):
         """
@@ -421,7 +657,7 @@ class Parser:
         loop_expr  :
         """
         # Add evaluation of expression that must be fulfilled to continue a loop.
-        expr_type, expr_addr, _ = p[-1]
+        expr_type, expr_addr, _ = self.constants.value_of(p[-1])
         if expr_type == Types.BOOL.value:
             self.jump_stack.append(self.quads.ptr_address())
             self.quads.add((Operations.GOTOF, expr_addr, 0, 0))
@@ -515,12 +751,15 @@ class Parser:
         self.quads.add((Operations.GOTO, 0, 0, before_expr))
         op_code, addr, _, _ = self.quads[after_expr]
         self.quads[after_expr] = (op_code, addr, 0, self.quads.ptr_address())
+        self.constants.clear()
 
     def p_ptr_to_jump_stack(self, p):
         """
         ptr_to_jump_stack  :
         """
         self.jump_stack.append(self.quads.ptr_address())
+        # Jumps lead here, so the values known before may not hold.
+        self.constants.clear()
 
     def p_if_statement(self, p):
         """
@@ -529,6 +768,7 @@ class Parser:
         end = self.jump_stack.pop()
         op_code, addr, _, _ = self.quads[end]
         self.quads[end] = (op_code, addr, 0, self.quads.ptr_address())
+        self.constants.clear()
 
     # To evaluate different conditional combinations.
     def p_if_alternative(self, p):
@@ -549,6 +789,7 @@ class Parser:
         false = self.jump_stack.pop()
         op_code, addr, _, _ = self.quads[false]
         self.quads[false] = (op_code, addr, 0, self.quads.ptr_address())
+        self.constants.clear()
 
     # To add the final jump outside of the conditional in case the last if or elseif statement was true
     def p_if_alternative_neural_point_4(self, p):
@@ -560,6 +801,7 @@ class Parser:
         self.jump_stack.append(self.quads.ptr_address(-1))
         op_code, addr, _, _ = self.quads[false]
         self.quads[false] = (op_code, addr, 0, self.quads.ptr_address())
+        self.constants.clear()
 
     def p_break(self, p):
         """
@@ -581,7 +823,7 @@ class Parser:
         """
         return  : RETURN expr
         """
-        expr_type, expr_address, _ = p[2]
+        expr_type, expr_address, _ = self.constants.value_of(p[2])
         func_name = self.function_stack[-1]
         if self.func_dir.has(func_name):
             func_info = self.func_dir.get(func_name)
@@ -602,30 +844,6 @@ class Parser:
                         func_info.return_address,
                     )
                 )
-                for (
-                    name,
-                    (local_address, global_address),
-                ) in func_info.obj_addresses.items():
-                    obj_prop = self.scope_stack.get_var(name)
-                    if obj_prop.array_info is not None:
-                        for offset in range(0, obj_prop.array_info.size):
-                            self.quads.add(
-                                (
-                                    Operations.OPT_ASSIGN,
-                                    local_address + offset,
-                                    0,
-                                    global_address + offset,
-                                )
-                            )
-                    else:
-                        self.quads.add(
-                            (
-                                Operations.OPT_ASSIGN,
-                                local_address,
-                                0,
-                                global_address,
-                            )
-                        )
                 self.quads.add((Operations.ENDSUB, 0, 0, 0))
                 func_info.has_return = True
             else:
@@ -645,8 +863,8 @@ class Parser:
 
     def p_type_addr_list(self, p):
         """
-        params      : simple_type_id COMMA params
-                    | simple_type_id
+        params      : param COMMA params
+                    | param
         arguments   : expr COMMA arguments
                     | expr
         """
@@ -655,6 +873,24 @@ class Parser:
         else:
             p[0] = [p[1]]
 
+    def p_param(self, p):
+        """
+        param   : simple_type_id
+                | simple_type_id open_dimension
+        """
+        if len(p) == 3:
+            param_type, param_name = p[1]
+            p[0] = (array_type(param_type, p[2]), param_name)
+        else:
+            p[0] = p[1]
+
+    def p_open_dimension(self, p):
+        """
+        open_dimension  : LBRACK RBRACK open_dimension
+                        | LBRACK RBRACK
+        """
+        p[0] = 1 if len(p) == 3 else 1 + p[3]
+
     def p_type_id(self, p):
         """
         simple_type_id      : simple_type ID
@@ -728,13 +964,16 @@ class Parser:
                 self.quads.add((Operations.ERA, 0, 0, func_info.address))
                 for arg, param in zip(func_args, param_list):
                     p_type, p_addr, p_name = param
-                    arg_type, arg_addr, _ = arg
+                    arg_type, arg_addr, _ = self.constants.value_of(arg)
                     if (
                         p_type == arg_type
                         or (p_type == Types.INT.value and arg_type == Types.FLOAT.value)
                         or (p_type == Types.FLOAT.value and arg_type == Types.INT.value)
                     ):
-                        self.quads.add((Operations.PARAM, arg_addr, 0, p_addr))
+                        if element_type(p_type)[1] > 0:
+                            self.__pass_array(arg, func_info.scope.get(p_name))
+                        else:
+                            self.quads.add((Operations.PARAM, arg_addr, 0, p_addr))
                     else:
                         raise CError(
                             OOPLErrorTypes.TYPE_MISMATCH,
@@ -742,36 +981,15 @@ class Parser:
                             p.lexpos(1),
                             f"wrong parameter {p_name} in call to {func_name}; expected {p_type} but received {arg_type}",
                         )
-                for (
-                    property_name,
-                    (local_address, _),
-                ) in func_info.obj_addresses.items():
-                    [_, prop_name] = property_name.split(".")
-                    obj_prop_name = f"{base_name}.{prop_name}"
-                    if self.scope_stack.has_var(obj_prop_name):
-                        obj_prop = self.scope_stack.get_var(obj_prop_name)
-                        if obj_prop.array_info is not None:
-                            for offset in range(0, obj_prop.array_info.size):
-                                self.quads.add(
-                                    (
-                                        Operations.OPT_PARAM,
-                                        obj_prop.address + offset,
-                                        0,
-                                        local_address + offset,
-                                    )
-                                )
-                        else:
-                            self.quads.add(
-                                (
-                                    Operations.OPT_PARAM,
-                                    obj_prop.address,
-                                    0,
-                                    local_address,
-                                )
-                            )
+                # Methods reach the attributes of the object through a pointer to where the attributes of
+                # each type start, so calling them does not depend on the size of the object.
+                if base_name != "":
+                    self.__pass_this(base_name, func_info)
                 self.quads.add((Operations.GOSUB, 0, 0, func_info.address))
+                # The function may change global variables and the attributes of the objects it receives.
+                self.constants.clear()
                 if func_info.type != Types.VOID.value:
-                    var_addr = self.function_memory.reserve(func_info.type)
+                    var_addr = self.function_memory.reserve_temp(func_info.type)
                     self.quads.add(
                         (
                             Operations.ASSIGNOP,
@@ -782,33 +1000,6 @@ class Parser:
                     )
                 else:
                     var_addr = func_info.return_address
-                for (
-                    property_name,
-                    (_, global_address),
-                ) in func_info.obj_addresses.items():
-                    [_, prop_name] = property_name.split(".")
-                    obj_prop_name = f"{base_name}.{prop_name}"
-                    if self.scope_stack.has_var(obj_prop_name):
-                        obj_prop = self.scope_stack.get_var(obj_prop_name)
-                        if obj_prop.array_info is not None:
-                            for offset in range(0, obj_prop.array_info.size):
-                                self.quads.add(
-                                    (
-                                        Operations.OPT_ASSIGN,
-                                        global_address + offset,
-                                        0,
-                                        obj_prop.address + offset,
-                                    )
-                                )
-                        else:
-                            self.quads.add(
-                                (
-                                    Operations.OPT_ASSIGN,
-                                    global_address,
-                                    0,
-                                    obj_prop.address,
-                                )
-                            )
                 p[0] = (func_info.type, var_addr, None)
         else:
             raise CError(
@@ -845,9 +1036,11 @@ class Parser:
         else:
             var_name = p[1]
             dim = p[2]
+        dim = [self.constants.value_of(index) for index in dim]
 
         if not self.scope_stack.has_var(var_name) or (
-            var_info := self.scope_stack.get_var(var_name).address == 0
+            self.scope_stack.get_var(var_name).address == 0
+            and not var_name.startswith("this.")
         ):
             raise CError(
                 OOPLErrorTypes.UNDECLARED_IDENTIFIER,
@@ -856,83 +1049,212 @@ class Parser:
                 f"use of undeclared variable {var_name}",
             )
         var_info = self.scope_stack.get_var(var_name)
-        if var_info.array_info is None:
-            p[0] = (var_info.type, var_info.address, var_info.name)
-        elif (array_info := var_info.array_info) is not None and len(dim) == len(
-            array_info.table
-        ):
-            _, lower_lim_addr, _ = Constant(
-                "0", Types.INT.value, self.global_memory
+        array_info = var_info.array_info
+        if array_info is not None and len(dim) not in (0, len(array_info.table)):
+            # Variable has dimensions there's a mismatch with the dimensions passed.
+            raise CError(
+                OOPLErrorTypes.ARRAY,
+                p.lineno(1),
+                p.lexpos(1),
+                f"wrong indexing when trying to access {var_info.name}",
+            )
+        # An array without indexes is the whole array, which can only be passed to array parameters.
+        if array_info is not None and len(dim) == 0:
+            var_type = array_type(var_info.type, len(array_info.table))
+            array_info = None
+        else:
+            var_type = var_info.type
+
+        if var_name.startswith("this."):
+            # Attributes are reached from the pointer of the method to where the attributes of their type start.
+            class_info = self.class_dir.get(self.class_stack.top())
+            _, offset_addr, _ = Constant(
+                str(class_info.field_offset(p[3])), Types.INT.value, self.global_memory
             ).get()
-            _, addres_address, _ = Constant(
-                str(var_info.address), Types.INT.value, self.global_memory
+            if array_info is not None:
+                offset_addr = self.__array_index(var_info, dim, offset_addr, p)
+            this_params = self.func_dir.get(self.function_stack[-1]).this_params
+            temp_addr = self.function_memory.reserve_temp(Types.PTR.value)
+            self.quads.add(
+                (
+                    Operations.FIELDPTR,
+                    this_params[var_info.type],
+                    offset_addr,
+                    temp_addr,
+                )
+            )
+            p[0] = (var_type, temp_addr, var_info.name)
+        elif array_info is None:
+            p[0] = (var_type, var_info.address, var_info.name)
+        elif array_info.descriptor is not None:
+            # Array parameters hold a pointer to their first element.
+            index_addr = self.__array_index(var_info, dim, None, p)
+            temp_addr = self.function_memory.reserve_temp(Types.PTR.value)
+            self.quads.add(
+                (Operations.FIELDPTR, var_info.address, index_addr, temp_addr)
+            )
+            p[0] = (var_info.type, temp_addr, var_info.name)
+        else:
+            # The bounds and the position of the element are computed by a single quadruple, from the
+            # descriptor of the access.
+            dims = []
+            for dim_info, (param_type, param_address, _) in zip(array_info.table, dim):
+                self.__check_index(var_info, param_type, p)
+                dims.append((param_address, dim_info.lim_s, dim_info.m, True))
+            if (position := self.__constant_position(dims)) is not None:
+                p[0] = (var_info.type, var_info.address + position, var_info.name)
+                return
+            _, number_addr, _ = Constant(
+                str(self.arrays.add((var_info.address, tuple(dims)))),
+                Types.INT.value,
+                self.global_memory,
             ).get()
-
-            addr_stack = []
-            for index, (dim, param) in enumerate(zip(array_info.table, dim)):
-                param_type, param_address, _ = param
-                addr_stack.append(param_address)
-                if not (
-                    param_type == Types.INT.value or param_type == Types.FLOAT.value
-                ):
-                    raise CError(
-                        OOPLErrorTypes.SEMANTIC,
-                        p.lineno(1),
-                        p.lexpos(1),
-                        f"can't index {var_info.name} with non numeric expression",
+            temp_addr = self.function_memory.reserve_temp(Types.PTR.value)
+            self.quads.add((Operations.INDEX, number_addr, 0, temp_addr))
+            p[0] = (var_info.type, temp_addr, var_info.name)
+
+    def __array_index(
+        self, var_info: VarInfo, dims: list, base_address: MemoryAddress | None, p
+    ) -> MemoryAddress:
+        """
+        Add the quadruples that check the indexes used to access an element of an array and compute its
+        position, and get the address of the int where it is stored.
+
+        Arguments:
+        var_info: VarInfo -- Information of the array.
+        dims: list -- Expressions used as indexes.
+        base_address: MemoryAddress | None -- Address of the int constant added to the position of the element,
+        if any.
+        p -- Production being parsed, used to report errors.
+        """
+        array_info = var_info.array_info
+        _, lower_lim_addr, _ = Constant("0", Types.INT.value, self.global_memory).get()
+        descriptor = self.__descriptor(array_info)
+
+        # Indexes can be floats, so the types of the addresses are kept to know when the
+        # operations that compute the index can be typed.
+        addr_stack = []
+        for index, ((upper_lim_addr, m_addr), param) in enumerate(
+            zip(descriptor, dims)
+        ):
+            param_type, param_address, _ = param
+            addr_stack.append((param_type, param_address))
+            self.__check_index(var_info, param_type, p)
+            self.quads.add(
+                (
+                    Operations.VER,
+                    param_address,
+                    lower_lim_addr,
+                    upper_lim_addr,
+                )
+            )
+            if index < len(descriptor) - 1:
+                temp_type1, temp_addr1 = addr_stack.pop()
+                temp_addr2 = self.function_memory.reserve_temp(Types.INT.value)
+                self.quads.add(
+                    (
+                        self.__index_operation(
+                            Operations.TIMES, temp_type1, Types.INT.value
+                        ),
+                        temp_addr1,
+                        m_addr,
+                        temp_addr2,
                     )
-                else:
-                    _, upper_lim_addr, _ = Constant(
-                        str(dim.lim_s), Types.INT.value, self.global_memory
-                    ).get()
-                    _, m_addr, _ = Constant(
-                        str(dim.m), Types.INT.value, self.global_memory
-                    ).get()
-                    self.quads.add(
-                        (
-                            Operations.VER,
-                            param_address,
-                            lower_lim_addr,
-                            upper_lim_addr,
-                        )
+                )
+                addr_stack.append((Types.INT.value, temp_addr2))
+            if index > 0:
+                temp_type2, temp_addr2 = addr_stack.pop()
+                temp_type1, temp_addr1 = addr_stack.pop()
+                temp_addr3 = self.function_memory.reserve_temp(Types.INT.value)
+                self.quads.add(
+                    (
+                        self.__index_operation(Operations.PLUS, temp_type1, temp_type2),
+                        temp_addr1,
+                        temp_addr2,
+                        temp_addr3,
                     )
-                    if index < len(array_info.table) - 1:
-                        temp_addr1 = self.function_memory.reserve(Types.INT.value)
-                        self.quads.add(
-                            (Operations.TIMES, addr_stack.pop(), m_addr, temp_addr1)
-                        )
-                        addr_stack.append(temp_addr1)
-                    if index > 0:
-                        temp_addr2 = addr_stack.pop()
-                        temp_addr1 = addr_stack.pop()
-                        temp_addr3 = self.function_memory.reserve(Types.INT.value)
-                        self.quads.add(
-                            (Operations.PLUS, temp_addr1, temp_addr2, temp_addr3)
-                        )
-                        addr_stack.append(temp_addr3)
-
-            temp_addr1 = self.function_memory.reserve(Types.INT.value)
-            self.quads.add(
-                (Operations.PLUS, addr_stack.pop(), addres_address, temp_addr1)
+                )
+                addr_stack.append((Types.INT.value, temp_addr3))
+
+        index_type, index_addr = addr_stack.pop()
+        if base_address is None:
+            return index_addr
+        temp_addr = self.function_memory.reserve_temp(Types.INT.value)
+        self.quads.add(
+            (
+                self.__index_operation(Operations.PLUS, index_type, Types.INT.value),
+                index_addr,
+                base_address,
+                temp_addr,
             )
-            temp_addr2 = self.function_memory.reserve(Types.PTR.value)
-            self.quads.add((Operations.SAVEPTR, temp_addr1, 0, temp_addr2))
-            p[0] = (var_info.type, temp_addr2, var_info.name)
-        else:
-            # Variable has dimensions there's a mismatch with the dimensions passed.
+        )
+        return temp_addr
+
+    def __constant_position(self, dims: list[ArrayDimension]) -> int | None:
+        """
+        Get the position of an array element from the dimensions of its access, when every index is a constant
+        within the bounds of its dimension, so the element can be used directly.
+
+        Arguments:
+        dims: list[ArrayDimension] -- Index address, size and m of each dimension.
+        """
+        position = 0
+        for index_addr, lim_s, m, _ in dims:
+            if not self.constants.is_constant(index_addr):
+                return None
+            value = self.global_memory[index_addr]
+            if not (0 <= value and value < lim_s):
+                return None
+            position += int(value * m)
+        return position
+
+    def __check_index(self, var_info: VarInfo, index_type: str, p) -> None:
+        """
+        Check that an expression used as the index of an array is a number.
+
+        Arguments:
+        var_info: VarInfo -- Information of the array.
+        index_type: str -- Type of the expression.
+        p -- Production being parsed, used to report errors.
+        """
+        if not (index_type == Types.INT.value or index_type == Types.FLOAT.value):
             raise CError(
-                OOPLErrorTypes.ARRAY,
+                OOPLErrorTypes.SEMANTIC,
                 p.lineno(1),
                 p.lexpos(1),
-                f"wrong indexing when trying to access {var_info.name}",
+                f"can't index {var_info.name} with non numeric expression",
             )
 
+    def __index_operation(
+        self, op_code: Operations, left_type: str, right_type: str
+    ) -> Operations:
+        """
+        Get the operation used to compute the index of an array element, which is always stored as an int.
+        Only operations between ints can be typed, as float indexes have to be truncated by the VM.
+
+        Arguments:
+        op_code: Operations -- Generic operation.
+        left_type: str -- Type of the left operand.
+        right_type: str -- Type of the right operand.
+        """
+        if left_type == Types.INT.value and right_type == Types.INT.value:
+            return SemanticCube().get_typed(left_type, op_code, right_type)
+        return op_code
+
     def p_read(self, p):
         """
         read : READ LPAREN variable RPAREN SEMICOLON
         """
-        _, expr_addr, _ = p[3]
+        expr_type, expr_addr, _ = p[3]
+        if element_type(expr_type)[1] > 0:
+            raise CError(
+                OOPLErrorTypes.ARRAY,
+                p.lineno(1),
+                p.lexpos(1),
+                "can't read a whole array",
+            )
         self.quads.add((Operations.READ, 0, 0, expr_addr))
+        self.constants.forget(expr_addr)
 
     def p_write(self, p):
         """
@@ -940,7 +1262,15 @@ class Parser:
         """
         print_args = p[2]
         for print_arg in print_args:
-            self.quads.add((Operations.PRINT, print_arg[1], 0, 0))
+            if element_type(print_arg[0])[1] > 0:
+                raise CError(
+                    OOPLErrorTypes.ARRAY,
+                    p.lineno(1),
+                    p.lexpos(1),
+                    "can't print a whole array",
+                )
+            _, arg_addr, _ = self.constants.value_of(print_arg)
+            self.quads.add((Operations.PRINT, arg_addr, 0, 0))
 
     def p_var_decl(self, p):
         """
@@ -1007,8 +1337,6 @@ class Parser:
     def p_operators(self, p):
         """
         expr        : or_expr ASSIGNOP expr
-        or_expr     : or_expr OR and_expr
-        and_expr    : and_expr AND comp_expr
         comp_expr   : comp_expr COMPOP rel_expr
         rel_expr    : rel_expr RELOP m_expr
         m_expr      : m_expr PLUS term
@@ -1024,8 +1352,55 @@ class Parser:
             self.function_memory,
             self.quads,
             self.scope_stack,
+            self.constants,
         ).get()
 
+    def p_short_circuit(self, p):
+        """
+        or_expr     : or_expr OR short_circuit_jump and_expr
+        and_expr    : and_expr AND short_circuit_jump comp_expr
+        """
+        left, result, jump = p[3]
+        l_type, l_addr, _ = left
+        r_type, r_addr, _ = self.constants.value_of(p[4])
+        expr_type = SemanticCube().get(l_type, Operations(p[2]), r_type)
+        if jump is None:
+            # The left side is a constant that doesn't decide the result.
+            p[0] = (expr_type, r_addr, None)
+            return
+        if result is None:
+            # The left side is a constant that decides the result, so the right side is never evaluated.
+            p[0] = (expr_type, l_addr, None)
+        else:
+            self.quads.add((Operations.ASSIGNOP, r_addr, 0, result))
+            p[0] = (expr_type, result, None)
+        op_code, addr, _, _ = self.quads[jump]
+        self.quads[jump] = (op_code, addr, 0, self.quads.ptr_address())
+        # The right side may have been skipped, so the values it assigned may not hold.
+        self.constants.clear()
+
+    def p_short_circuit_jump(self, p):
+        """
+        short_circuit_jump  :
+        """
+        # Skip the right side of && when the left one is false, and the one of || when it is true.
+        left = self.constants.value_of(p[-2])
+        l_type, l_addr, _ = left
+        skip_when = Operations(p[-1]) is Operations.OR
+        if l_type == Types.BOOL.value and self.constants.is_constant(l_addr):
+            if self.global_memory[l_addr] == skip_when:
+                p[0] = (left, None, self.quads.ptr_address())
+                self.quads.add((Operations.GOTO, 0, 0, 0))
+            else:
+                p[0] = (left, None, None)
+            return
+        result = self.function_memory.reserve_temp(Types.BOOL.value)
+        self.quads.add((Operations.ASSIGNOP, l_addr, 0, result))
+        p[0] = (left, result, self.quads.ptr_address())
+        self.quads.add(
+            (Operations.GOTOT if skip_when else Operations.GOTOF, result, 0, 0)
+        )
+
     # Operations or operators used to compare or express identities
     def p_identity(self, p):
         """
@@ -0,0 +1,192 @@
+from typing import Tuple
+
+from ..array_table import ArrayTable
+from ..memory import Memory
+from ..nodes.constant import Constant
+from ..quadruple_list import QuadrupleList
+from ..semantic_cube import SemanticCube
+from ..utils.enums import Operations, Types
+from ..utils.types import ForLoop, MemoryAddress
+from ..vm import fused_comparisons
+
+# Comparisons of a loop condition with the amount they add to the constant to get the exclusive limit.
+comparisons = {Operations.LT: 0, Operations.EQLT: 1}
+
+# Quadruples whose result is an address of the function being called instead of the current one.
+callee_results = [Operations.OPT_PARAM, Operations.PARAM, Operations.PARAMPTR]
+
+jumps = [Operations.GOTO, Operations.GOTOF, Operations.GOTOT, *fused_comparisons]
+
+
+class BoundsCheckElimination:
+    arrays: ArrayTable
+    function_memory: Memory
+    global_memory: Memory
+    loops: list[ForLoop]
+    quads: QuadrupleList
+    sem_cube: SemanticCube
+
+    def __init__(
+        self,
+        quads: QuadrupleList,
+        arrays: ArrayTable,
+        global_memory: Memory,
+        function_memory: Memory,
+        loops: list[ForLoop],
+    ) -> None:
+        """
+        Remove the bounds checks of the array accesses indexed by the induction variable of a for loop, when
+        the limit of the loop is a constant that is within the bounds of the array.
+
+        Arguments:
+        quads: QuadrupleList -- Quadruples of the whole program, where the loops are.
+        arrays: ArrayTable -- Descriptors of the array accesses.
+        global_memory: Memory -- Memory with the constants and global variables.
+        function_memory: Memory -- Memory used for the addresses of the functions.
+        loops: list[ForLoop] -- Quadruples of each for loop to check.
+        """
+        self.arrays = arrays
+        self.function_memory = function_memory
+        self.global_memory = global_memory
+        self.loops = loops
+        self.quads = quads
+        self.sem_cube = SemanticCube()
+
+    def run(self) -> int:
+        """
+        Rewrite the INDEX quadruples of every loop and get the number of checks removed.
+        """
+        targets: dict[int, int] = {}
+        for index, quad in enumerate(self.quads.quads):
+            if quad[0] in jumps:
+                target = self.quads.target(index)
+                targets[target] = targets.get(target, 0) + 1
+
+        removed = 0
+        for loop in self.loops:
+            # The condition must only be reached from the initialization and the update, otherwise the
+            # variable could have any value.
+            if targets.get(loop[0], 0) == 1 and (induction := self.__induction(loop)):
+                removed += self.__remove_checks(loop, *induction)
+        return removed
+
+    def __is_constant(self, address: MemoryAddress) -> bool:
+        """
+        Check if an address is an int constant.
+
+        Arguments:
+        address: MemoryAddress -- Address to check.
+        """
+        return (
+            0 < address < self.function_memory.bools.start_address
+            and self.global_memory.is_int(address)
+            and self.global_memory[address] is not None
+        )
+
+    def __is_variable(self, address: MemoryAddress) -> bool:
+        """
+        Check if an address is an int variable, which is not a pointer nor a constant.
+
+        Arguments:
+        address: MemoryAddress -- Address to check.
+        """
+        if address >= self.function_memory.bools.start_address:
+            return self.function_memory.is_int(address)
+        return self.global_memory.is_int(address) and not self.__is_constant(address)
+
+    def __induction(self, loop: ForLoop) -> Tuple[MemoryAddress, int] | None:
+        """
+        Get the induction variable of a loop and the limit it is always below of in the body, if the loop has
+        the form for (i = a; i < b; i = i + c) with constants a >= 0, c > 0 and b, and the body does not change
+        the variable.
+
+        Arguments:
+        loop: ForLoop -- Quadruples of the loop.
+        """
+        condition, update, body, end = loop
+        quads = self.quads.quads
+        if condition < 1 or update - condition < 3 or body - update != 3:
+            return None
+
+        op_code, initial, _, variable = quads[condition - 1]
+        if not (
+            op_code is Operations.ASSIGNOP
+            and self.__is_variable(variable)
+            and self.__is_constant(initial)
+            and int(self.global_memory[initial]) >= 0
+        ):
+            return None
+
+        op_code, left, right, result = quads[update - 3]
+        comparison = self.sem_cube.get_generic(op_code)
+        if not (
+            comparison in comparisons
+            and left == variable
+            and self.__is_constant(right)
+            and quads[update - 2][:2] == (Operations.GOTOF, result)
+        ):
+            return None
+        limit = int(self.global_memory[right]) + comparisons[comparison]
+
+        op_code, left, step, result = quads[update]
+        if not (
+            self.sem_cube.get_generic(op_code) is Operations.PLUS
+            and left == variable
+            and self.__is_constant(step)
+            and int(self.global_memory[step]) > 0
+            and quads[update + 1] == (Operations.ASSIGNOP, result, 0, variable)
+        ):
+            return None
+
+        # Nothing else can change the variable while the condition and the body run. Functions can change
+        # global variables, and methods can change the attributes of the objects passed to them.
+        is_global = variable < self.function_memory.bools.start_address
+        has_calls = False
+        has_references = False
+        for quad in quads[condition : update - 3] + quads[body:end]:
+            if quad[3] == variable and quad[0] not in callee_results:
+                return None
+            has_calls = has_calls or quad[0] is Operations.GOSUB
+            has_references = has_references or quad[0] is Operations.PARAMPTR
+        if has_calls and (is_global or has_references):
+            return None
+        return variable, limit
+
+    def __remove_checks(
+        self, loop: ForLoop, variable: MemoryAddress, limit: int
+    ) -> int:
+        """
+        Stop checking the dimensions indexed by the induction variable of a loop in its body, where the limit
+        of the loop is within the bounds of the dimension.
+
+        Arguments:
+        loop: ForLoop -- Quadruples of the loop.
+        variable: MemoryAddress -- Address of the induction variable.
+        limit: int -- Value the variable is always below of in the body.
+        """
+        _, _, body, end = loop
+        removed = 0
+        for index in range(body, end):
+            op_code, number_addr, addr2, addr3 = self.quads.quads[index]
+            if op_code is not Operations.INDEX:
+                continue
+            base, dims = self.arrays.descriptors[int(self.global_memory[number_addr])]
+            new_dims = tuple(
+                (
+                    address,
+                    lim_s,
+                    m,
+                    checked and not (address == variable and limit <= lim_s),
+                )
+                for address, lim_s, m, checked in dims
+            )
+            if new_dims == dims:
+                continue
+            removed += sum(old[3] and not new[3] for old, new in zip(dims, new_dims))
+            _, number_addr, _ = Constant(
+                str(self.arrays.add((base, new_dims))),
+                Types.INT.value,
+                self.global_memory,
+            ).get()
+            self.quads.quads[index] = (op_code, number_addr, addr2, addr3)
+        return removed
@@ -0,0 +1,223 @@
+from ..memory import Memory
+from ..nodes.constant import Constant
+from ..quadruple_list import QuadrupleList
+from ..utils.enums import Operations, Types
+from ..utils.types import MemoryAddress, Quadruple
+from .bounds_check import jumps
+
+Live = frozenset[MemoryAddress]
+
+
+class BasicBlock:
+    predecessors: list[int]
+    quads: list[Quadruple]
+    start: int
+    successors: list[int]
+    target: int | None
+
+    def __init__(self, start: int, quads: list[Quadruple]) -> None:
+        """
+        Quadruples that always run one after the other, since only the first one is the target of jumps and
+        only the last one can jump.
+
+        Arguments:
+        start: int -- Number of the first quadruple when the graph was built.
+        quads: list[Quadruple] -- Quadruples of the block.
+        """
+        self.predecessors = []
+        self.quads = quads
+        self.start = start
+        self.successors = []
+        self.target = None
+
+    def falls_through(self) -> bool:
+        """
+        Check if the block can continue with the one that follows it.
+        """
+        return len(self.quads) == 0 or self.quads[-1][0] not in [
+            Operations.ENDSUB,
+            Operations.GOTO,
+        ]
+
+    def jumps(self) -> bool:
+        """
+        Check if the block ends with a jump.
+        """
+        return len(self.quads) > 0 and self.quads[-1][0] in jumps
+
+
+class ControlFlowGraph:
+    blocks: list[BasicBlock]
+    global_memory: Memory
+    quads: QuadrupleList
+    start: int
+
+    def __init__(self, quads: QuadrupleList, global_memory: Memory, start: int) -> None:
+        """
+        Split the quadruples of a function into basic blocks, connected to the blocks that can run after them.
+        The first block is the entry of the function, and a block number equal to the number of blocks is the
+        end of the function.
+
+        Arguments:
+        quads: QuadrupleList -- Quadruples of the whole program, where the function is the last one.
+        global_memory: Memory -- Memory with the constants, where the jumps keep their targets.
+        start: int -- First quadruple of the function.
+        """
+        self.blocks = []
+        self.global_memory = global_memory
+        self.quads = quads
+        self.start = start
+
+        end = len(quads.quads)
+        leaders = {start}
+        for index in range(start, end):
+            if quads.quads[index][0] in jumps:
+                leaders.update([index + 1, quads.target(index)])
+            elif quads.quads[index][0] is Operations.ENDSUB:
+                leaders.add(index + 1)
+        leaders = sorted(leader for leader in leaders if start <= leader < end)
+        numbers = {leader: number for number, leader in enumerate(leaders)}
+        for leader, next_leader in zip(leaders, [*leaders[1:], end]):
+            self.blocks.append(BasicBlock(leader, quads.quads[leader:next_leader]))
+
+        for number, block in enumerate(self.blocks):
+            if block.jumps():
+                # Jumps past the last quadruple go to the end of the function.
+                block.target = numbers.get(
+                    quads.target(block.start + len(block.quads) - 1), self.end()
+                )
+                block.successors.append(block.target)
+            if block.falls_through() and number + 1 not in block.successors:
+                block.successors.append(number + 1)
+            block.successors = [
+                successor for successor in block.successors if successor < self.end()
+            ]
+            for successor in block.successors:
+                self.blocks[successor].predecessors.append(number)
+
+    def end(self) -> int:
+        """
+        Get the number that stands for the end of the function.
+        """
+        return len(self.blocks)
+
+    def reachable(self) -> set[int]:
+        """
+        Get the blocks that can run when the function is called.
+        """
+        if len(self.blocks) == 0:
+            return set()
+        reachable = {0}
+        pending = [0]
+        while len(pending) > 0:
+            for successor in self.blocks[pending.pop()].successors:
+                if successor not in reachable:
+                    reachable.add(successor)
+                    pending.append(successor)
+        return reachable
+
+    def dominators(self) -> dict[int, set[int]]:
+        """
+        Get the blocks that are in every path from the entry to each block that can be reached, including the
+        block itself.
+        """
+        reachable = self.reachable()
+        dominators = {number: set(reachable) for number in reachable}
+        if len(reachable) > 0:
+            dominators[0] = {0}
+        changed = True
+        while changed:
+            changed = False
+            for number in sorted(reachable - {0}):
+                new = set.intersection(
+                    *[
+                        dominators[predecessor]
+                        for predecessor in self.blocks[number].predecessors
+                        if predecessor in reachable
+                    ]
+                ) | {number}
+                if new != dominators[number]:
+                    dominators[number] = new
+                    changed = True
+        return dominators
+
+    def liveness(self, uses: list[Live], defs: list[Live]) -> list[Live]:
+        """
+        Get the addresses that are read later, before being stored again, after each quadruple.
+
+        Arguments:
+        uses: list[Live] -- Addresses read by each quadruple of the function, in order.
+        defs: list[Live] -- Addresses stored by each quadruple of the function, in order.
+        """
+        # Addresses each block reads before storing them, and the ones it stores.
+        block_uses: list[Live] = []
+        block_defs: list[Live] = []
+        for block in self.blocks:
+            used: Live = frozenset()
+            stored: Live = frozenset()
+            for index in reversed(self.__indexes(block)):
+                used = uses[index] | (used - defs[index])
+                stored = stored | defs[index]
+            block_uses.append(used)
+            block_defs.append(stored)
+
+        live_in: list[Live] = [frozenset() for _ in self.blocks]
+        live_out: list[Live] = [frozenset() for _ in self.blocks]
+        worklist = list(range(len(self.blocks)))
+        pending = set(worklist)
+        while len(worklist) > 0:
+            number = worklist.pop()
+            pending.discard(number)
+            live_out[number] = frozenset().union(
+                *[live_in[successor] for successor in self.blocks[number].successors]
+            )
+            new_in = block_uses[number] | (live_out[number] - block_defs[number])
+            if new_in != live_in[number]:
+                live_in[number] = new_in
+                for predecessor in self.blocks[number].predecessors:
+                    if predecessor not in pending:
+                        pending.add(predecessor)
+                        worklist.append(predecessor)
+
+        quad_live_out: list[Live] = [frozenset() for _ in uses]
+        for number, block in enumerate(self.blocks):
+            live = live_out[number]
+            for index in reversed(self.__indexes(block)):
+                quad_live_out[index] = live
+                live = uses[index] | (live - defs[index])
+        return quad_live_out
+
+    def serialize(self) -> None:
+        """
+        Replace the quadruples of the function with the ones of the blocks, in order, making the jumps at the
+        end of the blocks go to the new number of their targets.
+        """
+        starts = []
+        position = self.start
+        for block in self.blocks:
+            starts.append(position)
+            position += len(block.quads)
+        starts.append(position)
+
+        quads = []
+        for block in self.blocks:
+            quads.extend(block.quads)
+            if block.jumps():
+                op_code, addr1, addr2, _ = quads[-1]
+                _, target_addr, _ = Constant(
+                    str(starts[block.target]), Types.INT.value, self.global_memory
+                ).get()
+                quads[-1] = (op_code, addr1, addr2, target_addr)
+        self.quads.quads[self.start :] = quads
+        self.quads.ptr = len(self.quads.quads)
+
+    def __indexes(self, block: BasicBlock) -> range:
+        """
+        Get the positions of the quadruples of a block in the function, as they were when the graph was built.
+
+        Arguments:
+        block: BasicBlock -- Block to check.
+        """
+        return range(
+            block.start - self.start, block.start - self.start + len(block.quads)
+        )
@@ -0,0 +1,208 @@
+from typing import Tuple
+
+from ..func_dir import CFuncDir
+from ..memory import Memory
+from ..quadruple_list import QuadrupleList
+from ..semantic_cube import SemanticCube
+from ..utils.enums import Operations
+from ..utils.types import MemoryAddress, Quadruple
+from ..vm import fused_comparisons
+
+binary_operations = [
+    Operations.AND,
+    Operations.DIFF,
+    Operations.DIVIDES,
+    Operations.EQ,
+    Operations.EQGT,
+    Operations.EQLT,
+    Operations.GT,
+    Operations.LT,
+    Operations.MINUS,
+    Operations.OR,
+    Operations.PLUS,
+    Operations.TIMES,
+]
+
+# Positions of the addresses of each quadruple that the VM reads and checks to be initialized.
+checked_reads: dict[Operations, Tuple[int, ...]] = {
+    Operations.ASSIGNOP: (1,),
+    Operations.FIELDPTR: (2,),
+    Operations.GOTOF: (1,),
+    Operations.GOTOT: (1,),
+    Operations.PARAM: (1,),
+    Operations.PRINT: (1,),
+    Operations.SAVEPTR: (1,),
+    Operations.VER: (1, 2, 3),
+}
+checked_reads.update({op_code: (1, 2) for op_code in fused_comparisons})
+
+# Quadruples that store a value in the address of their result in the current function memory.
+assignments = [Operations.ASSIGNOP, Operations.READ, Operations.SAVEPTR]
+
+Initialized = frozenset[MemoryAddress]
+
+
+class DefiniteAssignment:
+    func_dir: CFuncDir
+    function_memory: Memory
+    global_memory: Memory
+    quads: QuadrupleList
+    sem_cube: SemanticCube
+
+    def __init__(
+        self,
+        quads: QuadrupleList,
+        global_memory: Memory,
+        function_memory: Memory,
+        func_dir: CFuncDir,
+    ) -> None:
+        """
+        Find which addresses read by each quadruple are initialized in every path that reaches it, so the VM
+        does not need to check them while running.
+
+        Arguments:
+        quads: QuadrupleList -- Quadruples of the whole program.
+        global_memory: Memory -- Memory with the constants and global variables.
+        function_memory: Memory -- Memory used for the addresses of the functions.
+        func_dir: CFuncDir -- Directory with the functions of the program.
+        """
+        self.func_dir = func_dir
+        self.function_memory = function_memory
+        self.global_memory = global_memory
+        self.quads = quads
+        self.sem_cube = SemanticCube()
+
+    def run(self) -> list[int]:
+        """
+        Get the mask of the addresses known to be initialized for every quadruple, where the first address is
+        the lowest bit.
+        """
+        masks = [0 for _ in self.quads.quads]
+        entries: dict[int, Initialized] = {}
+        for func_info in self.func_dir.dir.values():
+            if func_info.is_body_defined:
+                # Parameters are always passed, and PARAM already checked their values.
+                entries[int(self.global_memory[func_info.start_quad])] = frozenset(
+                    func_info.param_addresses()
+                )
+        bounds = sorted({0, *entries, len(masks)})
+        for start, end in zip(bounds, bounds[1:]):
+            self.__analyze(start, end, entries.get(start, frozenset()), masks)
+        return masks
+
+    def __is_ptr(self, address: MemoryAddress) -> bool:
+        """
+        Check if an address holds a pointer, so its value can't be known.
+
+        Arguments:
+        address: MemoryAddress -- Address to check.
+        """
+        if address >= self.function_memory.bools.start_address:
+            return self.function_memory.is_ptr(address)
+        else:
+            return self.global_memory.is_ptr(address)
+
+    def __is_constant(self, address: MemoryAddress) -> bool:
+        """
+        Check if an address is a global address, other than a pointer, with a value known at compile time.
+
+        Arguments:
+        address: MemoryAddress -- Address to check.
+        """
+        return (
+            0 < address < self.function_memory.bools.start_address
+            and not self.global_memory.is_ptr(address)
+            and self.global_memory[address] is not None
+        )
+
+    def __reads(self, quad: Quadruple) -> list[MemoryAddress]:
+        """
+        Get the direct addresses that a quadruple reads and checks.
+
+        Arguments:
+        quad: Quadruple -- Quadruple to check.
+        """
+        op_code = self.sem_cube.get_generic(quad[0])
+        positions = (
+            (1, 2) if op_code in binary_operations else checked_reads.get(op_code, ())
+        )
+        return [
+            quad[position]
+            for position in positions
+            if quad[position] != 0 and not self.__is_ptr(quad[position])
+        ]
+
+    def __transfer(self, index: int, initialized: Initialized) -> Initialized:
+        """
+        Get the addresses initialized after running a quadruple. The ones it reads are initialized as well,
+        otherwise the VM would have stopped.
+
+        Arguments:
+        index: int -- Number of the quadruple.
+        initialized: Initialized -- Addresses initialized before running the quadruple.
+        """
+        quad = self.quads.quads[index]
+        op_code = self.sem_cube.get_generic(quad[0])
+        new = self.__reads(quad)
+        if (op_code in binary_operations or op_code in assignments) and not (
+            self.__is_ptr(quad[3])
+        ):
+            new.append(quad[3])
+        return initialized.union(new)
+
+    def __successors(self, index: int, start: int, end: int) -> list[int]:
+        """
+        Get the quadruples of the same function that can run after a quadruple.
+
+        Arguments:
+        index: int -- Number of the quadruple.
+        start: int -- First quadruple of the function.
+        end: int -- Quadruple after the last one of the function.
+        """
+        match self.quads.quads[index][0]:
+            case Operations.GOTO:
+                successors = [self.quads.target(index)]
+            case Operations.GOTOF | Operations.GOTOT:
+                successors = [index + 1, self.quads.target(index)]
+            case op_code if op_code in fused_comparisons:
+                successors = [index + 1, self.quads.target(index)]
+            case Operations.ENDSUB:
+                successors = []
+            case _:
+                successors = [index + 1]
+        return [successor for successor in successors if start <= successor < end]
+
+    def __analyze(
+        self, start: int, end: int, entry: Initialized, masks: list[int]
+    ) -> None:
+        """
+        Fill the masks of the quadruples of a function. Quadruples that can't be reached keep an empty mask.
+
+        Arguments:
+        start: int -- First quadruple of the function.
+        end: int -- Quadruple after the last one of the function.
+        entry: Initialized -- Addresses initialized when the function starts.
+        masks: list[int] -- Masks of every quadruple of the program.
+        """
+        if start >= end:
+            return
+        states = {start: entry}
+        worklist = [start]
+        while len(worklist) > 0:
+            index = worklist.pop()
+            initialized = self.__transfer(index, states[index])
+            for successor in self.__successors(index, start, end):
+                if successor not in states:
+                    states[successor] = initialized
+                    worklist.append(successor)
+                elif not states[successor] <= initialized:
+                    # An address is only initialized if it is in every path.
+                    states[successor] = states[successor] & initialized
+                    worklist.append(successor)
+
+        for index, initialized in states.items():
+            quad = self.quads.quads[index]
+            for position in (1, 2, 3):
+                address = quad[position]
+                if address in initialized or self.__is_constant(address):
+                    masks[index] |= 1 << (position - 1)
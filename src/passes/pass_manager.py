@@ -0,0 +1,107 @@
+import sys
+from time import perf_counter
+from typing import Callable, TextIO, TypeVar
+
+from ..quadruple_list import QuadrupleList
+from ..utils.enums import Passes
+
+T = TypeVar("T")
+
+# Passes enabled by each optimization level.
+levels: dict[int, set[Passes]] = {
+    0: set(),
+    1: {
+        Passes.CONSTANT_FOLDING,
+        Passes.JUMP_THREADING,
+        Passes.TEMPORARY_ALLOCATION,
+        Passes.DEFINITE_ASSIGNMENT,
+    },
+    2: set(Passes),
+}
+
+# Passes that run while the program is parsed, whose time is part of parsing.
+inline_passes = [Passes.CONSTANT_FOLDING]
+
+
+class PassManager:
+    enabled: set[Passes]
+    removed: dict[Passes, int]
+    seconds: dict[Passes, float]
+
+    def __init__(
+        self,
+        level: int = 2,
+        enabled: list[Passes] | None = None,
+        disabled: list[Passes] | None = None,
+    ) -> None:
+        """
+        Choose the optimizations run by the compiler, and keep how long each of them took and how many
+        quadruples it removed.
+
+        Arguments:
+        level: int -- Optimization level, from 0 for none to 2 for all of them.
+        enabled: list[Passes] | None -- Passes to run besides the ones of the level.
+        disabled: list[Passes] | None -- Passes not to run even if they are part of the level.
+        """
+        self.enabled = (set(levels[level]) | set(enabled or [])) - set(disabled or [])
+        self.removed = {}
+        self.seconds = {}
+
+    def is_enabled(self, optimization: Passes) -> bool:
+        """
+        Check if a pass has to run.
+
+        Arguments:
+        optimization: Passes -- Pass to check.
+        """
+        return optimization in self.enabled
+
+    def run(
+        self, optimization: Passes, quads: QuadrupleList, action: Callable[[], T]
+    ) -> T:
+        """
+        Run a pass, recording how long it took and how many quadruples it removed, and get its result.
+
+        Arguments:
+        optimization: Passes -- Pass being run.
+        quads: QuadrupleList -- Quadruples of the program that the pass changes.
+        action: Callable[[], T] -- Function that runs the pass.
+        """
+        size = len(quads.quads)
+        start = perf_counter()
+        result = action()
+        self.record(optimization, perf_counter() - start, size - len(quads.quads))
+        return result
+
+    def record(self, optimization: Passes, seconds: float, removed: int) -> None:
+        """
+        Add the time and the quadruples removed by a run of a pass, which runs once for every function.
+
+        Arguments:
+        optimization: Passes -- Pass that ran.
+        seconds: float -- Time it took.
+        removed: int -- Quadruples it removed.
+        """
+        self.seconds[optimization] = self.seconds.get(optimization, 0) + seconds
+        self.removed[optimization] = self.removed.get(optimization, 0) + removed
+
+    def print_times(self, file: TextIO = sys.stderr) -> None:
+        """
+        Print how long each enabled pass took and how many quadruples it removed.
+
+        Arguments:
+        file: TextIO -- Stream to print to, which is not the standard output so it can be the object file.
+        """
+        print(f"{'pass':<28}{'ms':>10}{'quads removed':>16}", file=file)
+        for optimization in Passes:
+            if not self.is_enabled(optimization):
+                continue
+            time = (
+                "inline"
+                if optimization in inline_passes
+                else f"{self.seconds.get(optimization, 0) * 1000:.3f}"
+            )
+            print(
+                f"{optimization.value:<28}{time:>10}{self.removed.get(optimization, 0):>16}",
+                file=file,
+            )
@@ -0,0 +1,377 @@
+from abc import ABC, abstractmethod
+from time import perf_counter
+
+from ..array_table import ArrayTable
+from ..memory import Memory
+from ..nodes.constant import Constant
+from ..quadruple_list import QuadrupleList
+from ..semantic_cube import SemanticCube
+from ..utils.enums import Operations, Passes, Types
+from ..utils.types import MemoryAddress
+from ..vm import fused_comparisons
+from .bounds_check import callee_results, jumps
+from .control_flow import ControlFlowGraph
+from .definite_assignment import binary_operations
+
+# Jumps that fuse each comparison with a GOTOF.
+fused_jumps = {comparison: jump for jump, comparison in fused_comparisons.items()}
+
+conditional_jumps = [Operations.GOTOF, Operations.GOTOT]
+
+
+class Peephole:
+    arrays: ArrayTable
+    function_memory: Memory
+    global_memory: Memory
+    quads: QuadrupleList
+    return_addresses: set[MemoryAddress]
+    rules: list["PeepholeRule"]
+    seconds: dict[Passes, float]
+    sem_cube: SemanticCube
+    start: int
+
+    def __init__(
+        self,
+        quads: QuadrupleList,
+        arrays: ArrayTable,
+        global_memory: Memory,
+        function_memory: Memory,
+        start: int,
+        return_addresses: set[MemoryAddress],
+        rules: list["PeepholeRule"] | None = None,
+    ) -> None:
+        """
+        Apply rules that look at a few quadruples at a time to the quadruples of a function, removing the ones
+        that are not needed, until none of the rules can remove any more.
+
+        Arguments:
+        quads: QuadrupleList -- Quadruples of the whole program, where the function is the last one.
+        arrays: ArrayTable -- Descriptors of the array accesses.
+        global_memory: Memory -- Memory with the constants and global variables.
+        function_memory: Memory -- Memory of the function, with its temporaries.
+        start: int -- First quadruple of the function.
+        return_addresses: set[MemoryAddress] -- Addresses where the functions store their return values, whose
+        assignments are kept since the VM uses the last one as the exit status.
+        rules: list[PeepholeRule] | None -- Rules to apply in order, all of them by default.
+        """
+        self.arrays = arrays
+        self.function_memory = function_memory
+        self.global_memory = global_memory
+        self.quads = quads
+        self.return_addresses = return_addresses
+        self.rules = (
+            [JumpThreading(), RedundantCopies(), CompareAndBranch()]
+            if rules is None
+            else rules
+        )
+        self.seconds = {rule.name: 0 for rule in self.rules}
+        self.sem_cube = SemanticCube()
+        self.start = start
+
+    def run(self) -> dict[Passes, int]:
+        """
+        Optimize the quadruples of the function and get the number of quadruples removed by each rule. The time
+        taken by each rule is kept in seconds.
+        """
+        removed = {rule.name: 0 for rule in self.rules}
+        changed = True
+        while changed:
+            changed = False
+            for rule in self.rules:
+                start = perf_counter()
+                if len(indexes := rule.apply(self)) > 0:
+                    self.__remove(indexes)
+                    removed[rule.name] += len(indexes)
+                    changed = True
+                self.seconds[rule.name] += perf_counter() - start
+        return removed
+
+    def end(self) -> int:
+        """
+        Get the quadruple after the last one of the function.
+        """
+        return len(self.quads.quads)
+
+    def target(self, index: int) -> int:
+        """
+        Get the number of the quadruple that a jump goes to.
+
+        Arguments:
+        index: int -- Number of the jump quadruple.
+        """
+        return self.quads.target(index)
+
+    def jump(self, index: int, target: int) -> None:
+        """
+        Change the quadruple that a jump goes to.
+
+        Arguments:
+        index: int -- Number of the jump quadruple.
+        target: int -- Number of the quadruple to go to.
+        """
+        op_code, addr1, addr2, _ = self.quads.quads[index]
+        _, target_addr, _ = Constant(
+            str(target), Types.INT.value, self.global_memory
+        ).get()
+        self.quads.quads[index] = (op_code, addr1, addr2, target_addr)
+
+    def targets(self) -> set[int]:
+        """
+        Get the quadruples of the function that jumps go to.
+        """
+        return {
+            self.target(index)
+            for index in range(self.start, self.end())
+            if self.quads.quads[index][0] in jumps
+        }
+
+    def reads(self) -> dict[MemoryAddress, int]:
+        """
+        Get how many times the quadruples of the function read each of its temporaries. Any use of a temporary
+        other than the first store is counted as a read, so the ones stored more than once, like the results of
+        && and ||, are never seen as read only once.
+        """
+        reads = {temp: -1 for temp in self.function_memory.temps}
+        for index in range(self.start, self.end()):
+            op_code, addr1, addr2, addr3 = self.quads.quads[index]
+            addresses = [addr1, addr2]
+            if op_code not in callee_results:
+                # The result of a parameter is in the memory of the function called.
+                addresses.append(addr3)
+            if op_code is Operations.INDEX:
+                _, dims = self.arrays.descriptors[int(self.global_memory[addr1])]
+                addresses.extend(index_addr for index_addr, _, _, _ in dims)
+            for address in addresses:
+                if address in reads:
+                    reads[address] += 1
+        return reads
+
+    def is_temp(self, address: MemoryAddress) -> bool:
+        """
+        Check if an address is a temporary of the function that does not hold a pointer.
+
+        Arguments:
+        address: MemoryAddress -- Address to check.
+        """
+        return address in self.function_memory.temps and not self.is_ptr(address)
+
+    def is_ptr(self, address: MemoryAddress) -> bool:
+        """
+        Check if an address holds a pointer.
+
+        Arguments:
+        address: MemoryAddress -- Address to check.
+        """
+        return self.__memory(address).is_ptr(address)
+
+    def type_index(self, address: MemoryAddress) -> int:
+        """
+        Get the position of the type of an address in the resources of its memory.
+
+        Arguments:
+        address: MemoryAddress -- Address to check.
+        """
+        memory = self.__memory(address)
+        return (address - memory.bools.start_address) // memory.chunk_size
+
+    def __memory(self, address: MemoryAddress) -> Memory:
+        """
+        Get the memory an address belongs to.
+
+        Arguments:
+        address: MemoryAddress -- Address to check.
+        """
+        if address >= self.function_memory.bools.start_address:
+            return self.function_memory
+        return self.global_memory
+
+    def __remove(self, indexes: set[int]) -> None:
+        """
+        Remove quadruples of the function, making the jumps to them go to the quadruple that follows them.
+
+        Arguments:
+        indexes: set[int] -- Numbers of the quadruples to remove.
+        """
+        end = self.end()
+        new_indexes = {}
+        kept = self.start
+        for index in range(self.start, end + 1):
+            new_indexes[index] = kept
+            if index not in indexes:
+                kept += 1
+        for index in range(self.start, end):
+            if index not in indexes and self.quads.quads[index][0] in jumps:
+                self.jump(index, new_indexes[self.target(index)])
+        self.quads.quads[self.start :] = [
+            quad
+            for index, quad in enumerate(self.quads.quads[self.start :], self.start)
+            if index not in indexes
+        ]
+        self.quads.ptr = len(self.quads.quads)
+
+
+class PeepholeRule(ABC):
+    name: Passes
+
+    @abstractmethod
+    def apply(self, peephole: Peephole) -> set[int]:
+        """
+        Rewrite the quadruples of the function that the rule improves, and get the ones that are not needed
+        anymore.
+
+        Arguments:
+        peephole: Peephole -- Optimizer with the quadruples of the function.
+        """
+        pass
+
+
+class JumpThreading(PeepholeRule):
+    name = Passes.JUMP_THREADING
+
+    def apply(self, peephole: Peephole) -> set[int]:
+        """
+        Make jumps to a GOTO go where it goes, and conditional jumps to another one of the same value go where
+        it goes for that value, turn a GOTOT that follows a GOTOF of the same value into a GOTO, since it is
+        only reached when the value is true, and remove the GOTOs to the next quadruple and the quadruples that
+        can't be reached.
+
+        Arguments:
+        peephole: Peephole -- Optimizer with the quadruples of the function.
+        """
+        quads = peephole.quads.quads
+        targets = peephole.targets()
+        for index in range(peephole.start, peephole.end()):
+            op_code, addr1, _, addr3 = quads[index]
+            if (
+                op_code is Operations.GOTOT
+                and index - 1 >= peephole.start
+                and quads[index - 1][:2] == (Operations.GOTOF, addr1)
+                and index not in targets
+            ):
+                quads[index] = (Operations.GOTO, 0, 0, addr3)
+            if op_code not in jumps:
+                continue
+            target = peephole.target(index)
+            seen = {index}
+            while target < peephole.end() and target not in seen:
+                target_op_code, target_addr1, _, _ = quads[target]
+                if target_op_code is Operations.GOTO:
+                    next_target = peephole.target(target)
+                elif (
+                    op_code in conditional_jumps
+                    and target_op_code in conditional_jumps
+                    and target_addr1 == addr1
+                ):
+                    # The value is the same, so it jumps only if this jump was taken the same way.
+                    next_target = (
+                        peephole.target(target)
+                        if target_op_code is op_code
+                        else target + 1
+                    )
+                else:
+                    break
+                seen.add(target)
+                target = next_target
+            if target != peephole.target(index):
+                peephole.jump(index, target)
+
+        cfg = ControlFlowGraph(peephole.quads, peephole.global_memory, peephole.start)
+        reachable = cfg.reachable()
+        unreachable = {
+            index
+            for number, block in enumerate(cfg.blocks)
+            if number not in reachable
+            for index in range(block.start, block.start + len(block.quads))
+        }
+        return unreachable | {
+            index
+            for index in range(peephole.start, peephole.end())
+            if quads[index][0] is Operations.GOTO
+            and peephole.target(index) == index + 1
+        }
+
+
+class RedundantCopies(PeepholeRule):
+    name = Passes.REDUNDANT_COPIES
+
+    def apply(self, peephole: Peephole) -> set[int]:
+        """
+        Remove the assignments that copy a temporary right after it is produced, storing the value directly
+        where it is copied, and the ones that copy a value into a temporary that is only read by the next
+        quadruple, which reads the value instead. Both are only done between addresses of the same type, so
+        the values are converted the same way.
+
+        Arguments:
+        peephole: Peephole -- Optimizer with the quadruples of the function.
+        """
+        quads = peephole.quads.quads
+        reads = peephole.reads()
+        targets = peephole.targets()
+        removed: set[int] = set()
+        for index in range(peephole.start, peephole.end() - 1):
+            if index in removed or index + 1 in targets:
+                continue
+            op_code, addr1, addr2, addr3 = quads[index]
+            next_op_code, next_addr1, next_addr2, next_addr3 = quads[index + 1]
+            generic = peephole.sem_cube.get_generic(op_code)
+            if (
+                next_op_code is Operations.ASSIGNOP
+                and next_addr1 == addr3
+                and (generic in binary_operations or generic is Operations.ASSIGNOP)
+                and peephole.is_temp(addr3)
+                and reads[addr3] == 1
+                and not peephole.is_ptr(next_addr3)
+                and next_addr3 not in peephole.return_addresses
+                and peephole.type_index(next_addr3) == peephole.type_index(addr3)
+            ):
+                quads[index] = (op_code, addr1, addr2, next_addr3)
+                removed.add(index + 1)
+            elif (
+                op_code is Operations.ASSIGNOP
+                and peephole.is_temp(addr3)
+                and reads[addr3] == 1
+                and addr3 in (next_addr1, next_addr2)
+                and next_op_code not in [Operations.INDEX, Operations.PARAMPTR]
+                and not peephole.is_ptr(addr1)
+                and peephole.type_index(addr1) == peephole.type_index(addr3)
+            ):
+                quads[index + 1] = (
+                    next_op_code,
+                    addr1 if next_addr1 == addr3 else next_addr1,
+                    addr1 if next_addr2 == addr3 else next_addr2,
+                    next_addr3,
+                )
+                removed.add(index)
+        return removed
+
+
+class CompareAndBranch(PeepholeRule):
+    name = Passes.COMPARE_AND_BRANCH
+
+    def apply(self, peephole: Peephole) -> set[int]:
+        """
+        Replace a comparison whose result is only read by the GOTOF that follows it with a single jump that
+        compares the operands.
+
+        Arguments:
+        peephole: Peephole -- Optimizer with the quadruples of the function.
+        """
+        quads = peephole.quads.quads
+        reads = peephole.reads()
+        targets = peephole.targets()
+        removed: set[int] = set()
+        for index in range(peephole.start, peephole.end() - 1):
+            op_code, addr1, addr2, addr3 = quads[index]
+            next_op_code, next_addr1, _, next_addr3 = quads[index + 1]
+            comparison = peephole.sem_cube.get_generic(op_code)
+            if (
+                comparison in fused_jumps
+                and next_op_code is Operations.GOTOF
+                and next_addr1 == addr3
+                and peephole.is_temp(addr3)
+                and reads[addr3] == 1
+                and index + 1 not in targets
+            ):
+                quads[index] = (fused_jumps[comparison], addr1, addr2, next_addr3)
+                removed.add(index + 1)
+        return removed
@@ -0,0 +1,174 @@
+from typing import Tuple
+
+from ..array_table import ArrayTable
+from ..memory import Memory, MemoryList
+from ..nodes.constant import Constant
+from ..quadruple_list import QuadrupleList
+from ..semantic_cube import SemanticCube
+from ..utils.enums import Operations, Types
+from ..utils.types import MemoryAddress, Quadruple, Resources
+from .bounds_check import callee_results
+from .control_flow import ControlFlowGraph, Live
+from .definite_assignment import assignments, binary_operations
+
+# Quadruples that store a new pointer in the address of their result, instead of writing through it.
+pointer_results = [Operations.FIELDPTR, Operations.INDEX, Operations.SAVEPTR]
+
+
+class TemporaryAllocation:
+    arrays: ArrayTable
+    function_memory: Memory
+    global_memory: Memory
+    quads: QuadrupleList
+    sem_cube: SemanticCube
+    start: int
+
+    def __init__(
+        self,
+        quads: QuadrupleList,
+        arrays: ArrayTable,
+        global_memory: Memory,
+        function_memory: Memory,
+        start: int,
+    ) -> None:
+        """
+        Share the addresses of the temporaries of a function between the ones that are never alive at the
+        same time, and pack the memory of the function so its frames only have the addresses that are used.
+
+        Arguments:
+        quads: QuadrupleList -- Quadruples of the whole program, where the function is the last one.
+        arrays: ArrayTable -- Descriptors of the array accesses.
+        global_memory: Memory -- Memory with the constants and global variables.
+        function_memory: Memory -- Memory of the function, with its temporaries.
+        start: int -- First quadruple of the function.
+        """
+        self.arrays = arrays
+        self.function_memory = function_memory
+        self.global_memory = global_memory
+        self.quads = quads
+        self.sem_cube = SemanticCube()
+        self.start = start
+
+    def run(self) -> Resources:
+        """
+        Rewrite the addresses used by the quadruples of the function and get the resources it needs.
+        """
+        temps = self.function_memory.temps
+        quads = self.quads.quads[self.start :]
+        uses: list[Live] = []
+        defs: list[Live] = []
+        for quad in quads:
+            use, dfn = self.__uses_and_defs(quad)
+            uses.append(frozenset(use & temps))
+            defs.append(frozenset(dfn & temps))
+        # Temporaries that no quadruple uses anymore, because the ones that had them were optimized away, don't
+        # get a slot.
+        used = set().union(*uses, *defs)
+        live_out = ControlFlowGraph(
+            self.quads, self.global_memory, self.start
+        ).liveness(uses, defs)
+
+        # Temporaries interfere when one of them is stored while the other is still going to be read.
+        interference: dict[MemoryAddress, set[MemoryAddress]] = {
+            temp: set() for temp in used
+        }
+        for dfn, live in zip(defs, live_out):
+            for temp in dfn:
+                for other in live - {temp}:
+                    interference[temp].add(other)
+                    interference[other].add(temp)
+
+        memory_lists: list[MemoryList] = [
+            self.function_memory.bools,
+            self.function_memory.floats,
+            self.function_memory.ints,
+            self.function_memory.strings,
+            self.function_memory.ptrs,
+        ]
+        relocation: dict[MemoryAddress, MemoryAddress] = {}
+        resources = []
+        for memory_list in memory_lists:
+            # The rest of the addresses keep their order, so parameters stay where the callers expect them
+            # and arrays stay contiguous.
+            size = 0
+            list_temps = []
+            for index in range(len(memory_list.values)):
+                address = memory_list.start_address + index
+                if address in used:
+                    list_temps.append(address)
+                elif address not in temps:
+                    relocation[address] = memory_list.start_address + size
+                    size += 1
+            slots: dict[MemoryAddress, int] = {}
+            for temp in list_temps:
+                taken = {slots[other] for other in interference[temp] if other in slots}
+                slots[temp] = next(
+                    slot for slot in range(len(taken) + 1) if slot not in taken
+                )
+                relocation[temp] = memory_list.start_address + size + slots[temp]
+            resources.append(size + len(set(slots.values())))
+
+        for index, quad in enumerate(quads, self.start):
+            self.quads.quads[index] = self.__relocate(quad, relocation)
+        return tuple(resources)
+
+    def __uses_and_defs(
+        self, quad: Quadruple
+    ) -> Tuple[set[MemoryAddress], set[MemoryAddress]]:
+        """
+        Get the addresses of the current function that a quadruple reads and the ones it stores a new value in.
+
+        Arguments:
+        quad: Quadruple -- Quadruple to check.
+        """
+        op_code, addr1, addr2, addr3 = quad
+        op_code = self.sem_cube.get_generic(op_code)
+        uses = {addr1, addr2}
+        defs = set()
+        if op_code is Operations.INDEX:
+            _, dims = self.arrays.descriptors[int(self.global_memory[addr1])]
+            uses.update(index_addr for index_addr, _, _, _ in dims)
+        if op_code in callee_results:
+            # The result is in the memory of the function called.
+            pass
+        elif op_code in pointer_results or (
+            (op_code in binary_operations or op_code in assignments)
+            and not self.function_memory.is_ptr(addr3)
+        ):
+            defs.add(addr3)
+        else:
+            # Values stored in a pointer are written where it points to, so the pointer is read.
+            uses.add(addr3)
+        return uses, defs
+
+    def __relocate(
+        self, quad: Quadruple, relocation: dict[MemoryAddress, MemoryAddress]
+    ) -> Quadruple:
+        """
+        Get a quadruple with the new addresses of the current function.
+
+        Arguments:
+        quad: Quadruple -- Quadruple to rewrite.
+        relocation: dict[MemoryAddress, MemoryAddress] -- New address of each address of the function.
+        """
+        op_code, addr1, addr2, addr3 = quad
+        if op_code is Operations.INDEX:
+            base, dims = self.arrays.descriptors[int(self.global_memory[addr1])]
+            descriptor = (
+                relocation.get(base, base),
+                tuple(
+                    (relocation.get(index_addr, index_addr), lim_s, m, checked)
+                    for index_addr, lim_s, m, checked in dims
+                ),
+            )
+            _, addr1, _ = Constant(
+                str(self.arrays.add(descriptor)), Types.INT.value, self.global_memory
+            ).get()
+        if op_code not in callee_results:
+            addr3 = relocation.get(addr3, addr3)
+        return (
+            op_code,
+            relocation.get(addr1, addr1),
+            relocation.get(addr2, addr2),
+            addr3,
+        )
@@ -1,3 +1,5 @@
+from typing import TextIO
+
 from .utils.types import Quadruple, MemoryAddress
 from .memory import Memory
 from .nodes.constant import Constant
@@ -5,11 +7,13 @@ from .utils.enums import Types
 
 
 class QuadrupleList:
+    initialized: list[int]
     mem: Memory
     quads: list[Quadruple]
     ptr: int
 
     def __init__(self, mem: Memory) -> None:
+        self.initialized = []
         self.mem = mem
         self.ptr = 0
         self.quads = []
@@ -45,15 +49,44 @@ class QuadrupleList:
         index = int(self.mem[address])
         self.quads[index] = quad
 
-    def print(self, verbose: bool) -> None:
+    def target(self, index: int) -> int:
+        """
+        Get the number of the quadruple that a jump goes to.
+
+        Arguments:
+        index: int -- Number of the jump quadruple.
+        """
+        return int(self.mem[self.quads[index][3]])
+
+    def get_initialized(self, index: int) -> int:
+        """
+        Get the mask of the addresses of a quadruple that are known to be initialized, where the first
+        address is the lowest bit. If they are not known, all of them must be checked.
+
+        Arguments:
+        index: int -- Number of the quadruple.
+        """
+        return self.initialized[index] if index < len(self.initialized) else 0
+
+    def print(self, verbose: bool, stream: TextIO | None = None) -> None:
         """
         Print the values all the quadruples depending on the value of verbose.
+
+        Arguments:
+        verbose: bool -- Whether to also print every quadruple with its number as a comment.
+        stream: TextIO | None -- Stream to print to, the standard output if it is None.
         """
         if verbose:
             for index, quad in enumerate(self.quads):
-                print(f"# {index}\t{quad[0].value},{quad[1]},{quad[2]},{quad[3]}")
+                print(
+                    f"# {index}\t{quad[0].value},{quad[1]},{quad[2]},{quad[3]},{self.get_initialized(index)}",
+                    file=stream,
+                )
         for index, quad in enumerate(self.quads):
-            print(f"{quad[0].value},{quad[1]},{quad[2]},{quad[3]}")
+            print(
+                f"{quad[0].value},{quad[1]},{quad[2]},{quad[3]},{self.get_initialized(index)}",
+                file=stream,
+            )
 
     def reset_ptr(self) -> None:
         """
@@ -0,0 +1,369 @@
+import struct
+from array import array
+from typing import BinaryIO, Sequence
+
+from . import object_file
+from .array_table import ArrayTable
+from .class_dir import ClassDir
+from .class_info import ClassInfo
+from .func_dir import CFuncDir
+from .func_info import CFuncInfo
+from .memory import (
+    Memory,
+    chunk_size,
+    start_function_memory,
+    start_global_memory,
+)
+from .quadruple_list import QuadrupleList
+from .utils.enums import Operations
+from .utils.errors import LinkError, OOPLErrorTypes
+from .utils.types import (
+    ArrayDescriptor,
+    MemoryAddress,
+    MemoryType,
+    Quadruple,
+    Relocation,
+    Resources,
+)
+from .vm import fused_comparisons
+
+# Relocatable modules are compiled on their own and merged into a program by the linker. They have the same
+# sections as a binary object file, with the same layout, where every address is the one the module would
+# have if it was the whole program, followed by its symbols and relocations:
+#
+#   header              magic (4 bytes), version (u16)
+#   address space       3 x u32, as in the object file
+#   global resources    5 x u32
+#   constant pool       as in the object file
+#   functions           u32 count, then name and signature, whether it is defined by the module (u8), address
+#                       of its name, address of its return value (0 for void functions), start quadruple
+#                       (i32 each, -1 for functions of other modules) and 5 x u32 resources each
+#   classes             names and layouts of the attributes of every class the module declares
+#   array descriptors   as in the object file
+#   quadruples          as in the object file
+#   relocations         positions of the addresses to change among the addresses of the quadruples (u32
+#                       array), their kinds (u8 array) and the function they refer to (i32 array, -1 if none)
+#
+# A module calls the functions of other modules through their forward declarations, and the functions it
+# defines can be called by any other module. Every module starts with the two quadruples that call main,
+# which the linker replaces with a single pair for the whole program.
+#
+# Modules of version 1 are still read, their constant pool has no ints that don't fit in 64 bits.
+MAGIC = b"OOPM"
+VERSION = 2
+FIRST_VERSION = 1
+
+function_symbol = struct.Struct("<B3i5I")
+
+# Kinds of relocations
+# Address of the global memory, which is moved to where the global memory of the module is in the program.
+GLOBAL = 0
+# Address of an int constant with the number of a quadruple of the module.
+QUADRUPLE = 1
+# Address of an int constant with the number of an array descriptor of the module.
+ARRAY = 2
+# Address of the name of a function, which is replaced by the one of the module that defines it.
+FUNCTION = 3
+# Address where a function of another module leaves its return value.
+RETURN = 4
+
+jumps = [Operations.GOTO, Operations.GOTOF, Operations.GOTOT, *fused_comparisons]
+calls = [Operations.ERA, Operations.GOSUB]
+
+
+def signature(func_info: CFuncInfo) -> str:
+    """
+    Get the return type and the types of the parameters of a function, which must be the same in the module
+    that defines it and in the ones that call it.
+
+    Arguments:
+    func_info: CFuncInfo -- Information of the function.
+    """
+    params = ",".join(param_type for param_type, _, _ in func_info.param_list)
+    return f"{func_info.type}({params})"
+
+
+def class_layout(class_info: ClassInfo) -> str:
+    """
+    Get the types and names of the attributes of a class in the order they are stored, which must be the
+    same in every module that declares it.
+
+    Arguments:
+    class_info: ClassInfo -- Information of the class.
+    """
+    attributes = []
+    for value in class_info.var_table.values():
+        dims = (
+            ""
+            if value.array_info is None
+            else "".join(f"[{dim.lim_s}]" for dim in value.array_info.table)
+        )
+        attributes.append(f"{value.type} {value.name}{dims}")
+    return ";".join(attributes)
+
+
+class FunctionSymbol:
+    address: MemoryAddress
+    defined: bool
+    name: str
+    resources: Resources
+    return_address: MemoryAddress
+    signature: str
+    start_quad: int
+
+    def __init__(
+        self,
+        name: str,
+        signature: str,
+        defined: bool,
+        address: MemoryAddress,
+        return_address: MemoryAddress,
+        start_quad: int,
+        resources: Resources,
+    ) -> None:
+        """
+        Function defined or called by a module.
+
+        Arguments:
+        name: str -- Name of the function, which is Class.method for methods.
+        signature: str -- Return type and types of the parameters.
+        defined: bool -- Whether the module defines it.
+        address: MemoryAddress -- Address of the string constant with its name.
+        return_address: MemoryAddress -- Address where it leaves its return value, 0 for void functions.
+        start_quad: int -- Number of its first quadruple, -1 if another module defines it.
+        resources: Resources -- Amount of addresses of each type of its memory.
+        """
+        self.address = address
+        self.defined = defined
+        self.name = name
+        self.resources = resources
+        self.return_address = return_address
+        self.signature = signature
+        self.start_quad = start_quad
+
+
+class Module:
+    classes: dict[str, str]
+    descriptors: list[ArrayDescriptor]
+    functions: list[FunctionSymbol]
+    global_resources: Resources
+    initialized: Sequence[int]
+    name: str
+    quads: list[Quadruple]
+    relocations: list[Relocation]
+    values: list[list[MemoryType | None]]
+
+    def __init__(self, name: str) -> None:
+        """
+        Contents of a relocatable module read from a file.
+
+        Arguments:
+        name: str -- Path of the file, used in link errors.
+        """
+        self.classes = {}
+        self.descriptors = []
+        self.functions = []
+        self.global_resources = (0, 0, 0, 0, 0)
+        self.initialized = []
+        self.name = name
+        self.quads = []
+        self.relocations = []
+        self.values = []
+
+
+def is_module(data: bytes) -> bool:
+    """
+    Check if some data is a relocatable module by looking at its magic bytes.
+
+    Arguments:
+    data: bytes -- Start of the file.
+    """
+    return data[: len(MAGIC)] == MAGIC
+
+
+def relocations(
+    quads: QuadrupleList,
+    global_memory: Memory,
+    symbols: dict[str, int],
+    returns: dict[MemoryAddress, int],
+) -> list[Relocation]:
+    """
+    Get the relocation of every global address of the quadruples, which depends on the operation that uses it.
+
+    Arguments:
+    quads: QuadrupleList -- Quadruples of the whole module.
+    global_memory: Memory -- Memory with the constants and global variables.
+    symbols: dict[str, int] -- Position of each function in the functions of the module, by name.
+    returns: dict[MemoryAddress, int] -- Position of each function of other modules, by its return address.
+    """
+    result = []
+    for index, (op_code, *addresses) in enumerate(quads.quads):
+        for position, address in enumerate(addresses):
+            if not start_global_memory <= address < start_function_memory:
+                continue
+            slot = 3 * index + position
+            if position == 2 and op_code in jumps:
+                result.append((slot, QUADRUPLE, -1))
+            elif position == 0 and op_code is Operations.INDEX:
+                result.append((slot, ARRAY, -1))
+            elif position == 2 and op_code in calls:
+                result.append((slot, FUNCTION, symbols[str(global_memory[address])]))
+            elif address in returns:
+                result.append((slot, RETURN, returns[address]))
+            else:
+                result.append((slot, GLOBAL, -1))
+    return result
+
+
+def write(
+    stream: BinaryIO,
+    global_memory: Memory,
+    func_dir: CFuncDir,
+    class_dir: ClassDir,
+    arrays: ArrayTable,
+    quads: QuadrupleList,
+) -> None:
+    """
+    Write a compiled module as a relocatable module file.
+
+    Arguments:
+    stream: BinaryIO -- Stream where the module is written.
+    global_memory: Memory -- Memory with the constants and global variables.
+    func_dir: CFuncDir -- Directory with the functions of the module.
+    class_dir: ClassDir -- Directory with the classes of the module.
+    arrays: ArrayTable -- Descriptors of the array accesses.
+    quads: QuadrupleList -- Quadruples of the whole module.
+    """
+    called = {
+        str(global_memory[quad[3]])
+        for quad in quads.quads
+        if quad[0] in calls and quad[3] != 0
+    }
+    # Declarations of functions that are neither defined nor called are left out, so they don't need to be
+    # defined by any module.
+    functions = [
+        func_info
+        for name, func_info in func_dir.dir.items()
+        if func_info.is_body_defined or name in called
+    ]
+    symbols = {func_info.name: index for index, func_info in enumerate(functions)}
+    returns = {
+        func_info.return_address: index
+        for index, func_info in enumerate(functions)
+        if not func_info.is_body_defined and func_info.return_address != 0
+    }
+
+    writer = object_file.Writer(stream)
+    writer.pack(object_file.header, MAGIC, VERSION)
+    writer.pack(
+        object_file.address_space,
+        start_global_memory,
+        start_function_memory,
+        chunk_size,
+    )
+    writer.pack(object_file.resources, *global_memory.describe_resources())
+    object_file.write_constants(writer, object_file.memory_values(global_memory))
+
+    writer.pack(object_file.length, len(functions))
+    for func_info in functions:
+        writer.strings([func_info.name, signature(func_info)])
+        writer.pack(
+            function_symbol,
+            func_info.is_body_defined,
+            func_info.address,
+            func_info.return_address,
+            (
+                int(global_memory[func_info.start_quad])
+                if func_info.is_body_defined
+                else -1
+            ),
+            *func_info.resources,
+        )
+    class_infos = list(class_dir.values())
+    writer.strings([class_info.name for class_info in class_infos])
+    writer.strings([class_layout(class_info) for class_info in class_infos])
+
+    object_file.write_arrays(writer, arrays.descriptors)
+    object_file.write_quadruples(
+        writer,
+        quads.quads,
+        [quads.get_initialized(index) for index in range(len(quads.quads))],
+    )
+
+    records = relocations(quads, global_memory, symbols, returns)
+    writer.array(array("I", [slot for slot, _, _ in records]))
+    writer.array(array("B", [kind for _, kind, _ in records]))
+    writer.array(array(object_file.ADDRESS_TYPECODE, [sym for _, _, sym in records]))
+
+
+def read(data: bytes, name: str) -> Module:
+    """
+    Read the contents of a relocatable module file.
+
+    Arguments:
+    data: bytes -- Contents of the file.
+    name: str -- Path of the file, used in link errors.
+    """
+    reader = object_file.Reader(data)
+    magic, version = reader.unpack(object_file.header)
+    if magic != MAGIC or not FIRST_VERSION <= version <= VERSION:
+        raise LinkError(
+            OOPLErrorTypes.OBJECT_FILE,
+            f"{name} is not a relocatable module of versions {FIRST_VERSION} to {VERSION}",
+        )
+    if reader.unpack(object_file.address_space) != (
+        start_global_memory,
+        start_function_memory,
+        chunk_size,
+    ):
+        raise LinkError(
+            OOPLErrorTypes.OBJECT_FILE,
+            f"{name} was compiled for a different address space",
+        )
+
+    module = Module(name)
+    module.global_resources = reader.unpack(object_file.resources)
+    for type_index, (amount, (addresses, values)) in enumerate(
+        zip(module.global_resources, object_file.read_constants(reader, version >= 2))
+    ):
+        start = start_global_memory + type_index * chunk_size
+        type_values: list[MemoryType | None] = [None] * amount
+        for address, value in zip(addresses, values):
+            type_values[address - start] = value
+        module.values.append(type_values)
+    # Bools are stored as bytes.
+    module.values[0] = [
+        None if value is None else bool(value) for value in module.values[0]
+    ]
+
+    (count,) = reader.unpack(object_file.length)
+    for _ in range(count):
+        func_name, func_signature = reader.strings()
+        defined, address, return_address, start_quad, *func_resources = reader.unpack(
+            function_symbol
+        )
+        module.functions.append(
+            FunctionSymbol(
+                func_name,
+                func_signature,
+                bool(defined),
+                address,
+                return_address,
+                start_quad,
+                tuple(func_resources),
+            )
+        )
+    module.classes = dict(zip(reader.strings(), reader.strings()))
+
+    module.descriptors = object_file.read_arrays(reader)
+    quads, module.initialized = object_file.read_quadruples(reader)
+    module.quads = [quads[index] for index in range(len(quads))]
+
+    module.relocations = list(
+        zip(
+            reader.array("I"),
+            reader.array("B"),
+            reader.array(object_file.ADDRESS_TYPECODE),
+        )
+    )
+    return module
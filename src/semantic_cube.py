@@ -2,6 +2,14 @@ from typing import Any
 
 from .utils.enums import Types, Operations
 
+# Letter that typed operations use for the type of each operand
+type_letters = {
+    Types.BOOL.value: "B",
+    Types.FLOAT.value: "F",
+    Types.INT.value: "I",
+    Types.STRING.value: "S",
+}
+
 
 class SemanticCube:
     sem_cube: dict[Any, dict[Operations, dict[Any, Any]]]
@@ -148,3 +156,42 @@ class SemanticCube:
         right_type: str -- Type of right operator.
         """
         return False if self.get(left_type, oper, right_type) is None else True
+
+    def get_typed(
+        self, left_type: str, oper: Operations, right_type: str
+    ) -> Operations:
+        """
+        Get the version of an operation that is specialized for the types of its operands, or the operation
+        itself if there is none.
+
+        Arguments:
+        left_type: str -- Type of left operator.
+        oper: str -- Operation requested.
+        right_type: str -- Type of right operator.
+        """
+        if oper is Operations.PLUS and left_type == Types.STRING.value:
+            name = "CONCAT"
+        else:
+            name = oper.name
+        typed_name = (
+            f"{name}_{type_letters.get(left_type)}{type_letters.get(right_type)}"
+        )
+        return Operations.__members__.get(typed_name, oper)
+
+    def get_generic(self, oper: Operations) -> Operations:
+        """
+        Get the generic version of a typed operation, or the operation itself if it is not typed.
+
+        Arguments:
+        oper: Operations -- Operation to check.
+        """
+        if oper is Operations.CONCAT_SS:
+            return Operations.PLUS
+        name, _, letters = oper.name.rpartition("_")
+        if (
+            len(letters) == 2
+            and all(letter in type_letters.values() for letter in letters)
+            and name in Operations.__members__
+        ):
+            return Operations[name]
+        return oper
@@ -20,10 +20,12 @@ class Operations(Enum):
     EQGT = ">="
     EQLT = "<="
     ERA = "ERA"
+    FIELDPTR = "FIELDPTR"
     GOSUB = "GOSUB"
     GOTO = "GOTO"
     GOTOF = "GOTOF"
     GOTOT = "GOTOT"
+    INDEX = "INDEX"
     GT = ">"
     LT = "<"
     MINUS = "-"
@@ -31,12 +33,83 @@ class Operations(Enum):
     OPT_PARAM = "OPT_PARAM"
     OR = "||"
     PARAM = "PARAM"
+    PARAMPTR = "PARAMPTR"
     PLUS = "+"
     PRINT = "PRINT"
     READ = "READ"
     SAVEPTR = "SAVEPTR"
     TIMES = "*"
     VER = "VER"
+    # Operations that know the types of their operands (I: int, F: float, S: string, B: bool), so the VM does
+    # not need to convert their result.
+    PLUS_II = "PLUS_II"
+    PLUS_IF = "PLUS_IF"
+    PLUS_FI = "PLUS_FI"
+    PLUS_FF = "PLUS_FF"
+    MINUS_II = "MINUS_II"
+    MINUS_IF = "MINUS_IF"
+    MINUS_FI = "MINUS_FI"
+    MINUS_FF = "MINUS_FF"
+    TIMES_II = "TIMES_II"
+    TIMES_IF = "TIMES_IF"
+    TIMES_FI = "TIMES_FI"
+    TIMES_FF = "TIMES_FF"
+    DIVIDES_II = "DIVIDES_II"
+    DIVIDES_IF = "DIVIDES_IF"
+    DIVIDES_FI = "DIVIDES_FI"
+    DIVIDES_FF = "DIVIDES_FF"
+    GT_II = "GT_II"
+    GT_IF = "GT_IF"
+    GT_FI = "GT_FI"
+    GT_FF = "GT_FF"
+    LT_II = "LT_II"
+    LT_IF = "LT_IF"
+    LT_FI = "LT_FI"
+    LT_FF = "LT_FF"
+    EQGT_II = "EQGT_II"
+    EQGT_IF = "EQGT_IF"
+    EQGT_FI = "EQGT_FI"
+    EQGT_FF = "EQGT_FF"
+    EQLT_II = "EQLT_II"
+    EQLT_IF = "EQLT_IF"
+    EQLT_FI = "EQLT_FI"
+    EQLT_FF = "EQLT_FF"
+    EQ_II = "EQ_II"
+    EQ_IF = "EQ_IF"
+    EQ_FI = "EQ_FI"
+    EQ_FF = "EQ_FF"
+    DIFF_II = "DIFF_II"
+    DIFF_IF = "DIFF_IF"
+    DIFF_FI = "DIFF_FI"
+    DIFF_FF = "DIFF_FF"
+    CONCAT_SS = "CONCAT_SS"
+    GT_SS = "GT_SS"
+    LT_SS = "LT_SS"
+    EQGT_SS = "EQGT_SS"
+    EQLT_SS = "EQLT_SS"
+    EQ_SS = "EQ_SS"
+    DIFF_SS = "DIFF_SS"
+    AND_BB = "AND_BB"
+    OR_BB = "OR_BB"
+    EQ_BB = "EQ_BB"
+    # Jumps that compare their operands and go to their target when the comparison is false, replacing a
+    # comparison whose result is only used by a GOTOF.
+    GOTOF_LT = "GOTOF_LT"
+    GOTOF_GT = "GOTOF_GT"
+    GOTOF_EQLT = "GOTOF_EQLT"
+    GOTOF_EQGT = "GOTOF_EQGT"
+    GOTOF_EQ = "GOTOF_EQ"
+    GOTOF_DIFF = "GOTOF_DIFF"
+
+# Optimizations of the compiler, in the order they run
+class Passes(Enum):
+    CONSTANT_FOLDING = "constant-folding"
+    BOUNDS_CHECK_ELIMINATION = "bounds-check-elimination"
+    JUMP_THREADING = "jump-threading"
+    REDUNDANT_COPIES = "redundant-copies"
+    COMPARE_AND_BRANCH = "compare-and-branch"
+    TEMPORARY_ALLOCATION = "temporary-allocation"
+    DEFINITE_ASSIGNMENT = "definite-assignment"
 
 # To check keywords and types of actions permitted
 class ScopeTypes(Enum):
@@ -49,6 +122,8 @@ class ScopeTypes(Enum):
 
 # For better readability in VM's output
 class Segments(Enum):
+    ADDRESS_SPACE = "%%address_space"
+    ARRAYS = "%%arrays"
     FUNCTIONS = "%%functions"
     GLOBAL_MEMORY = "%%global_memory"
     GLOBAL_RESOURCES = "%%global_resources"
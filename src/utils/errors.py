@@ -1,6 +1,7 @@
 from enum import Enum
 from typing import TypeAlias
 
+
 # Generic error types
 class OOPLErrorTypes(Enum):
     ARRAY = "array"
@@ -8,11 +9,13 @@ class OOPLErrorTypes(Enum):
     EMPTY_QUADRUPLES = "empty quadruple list"
     IMPLICIT_DECLARATION = "implicit function declaration"
     NULL_DEREF = "null pointer dereference"
+    OBJECT_FILE = "object file"
     SCOPE = "scope"
     SEMANTIC = "semantic"
     SYNTAX = "syntax"
     TYPE_MISMATCH = "type mismatch"
     UNDECLARED_IDENTIFIER = "undeclared identifier"
+    UNDEFINED_SYMBOL = "undefined symbol"
     UNINITIALIZED_VARIABLE = "uninitialized variable"
     UNKNOWN_QUADRUPLE = "unknowkn quadruple"
 
@@ -45,5 +48,22 @@ class CError(OOPLError):
         self.line_number = line_number
 
 
+def find_column(file_content: list[str], lexpos: int, line_no: int) -> int:
+    """
+    Get the column of a position of a source file.
+
+    Arguments:
+    file_content: list[str] -- Lines of the file, with their line breaks.
+    lexpos: int -- Position from the start of the file.
+    line_no: int -- Line of the position.
+    """
+    for line in range(0, line_no - 1):
+        lexpos -= len(file_content[line])
+    return lexpos
+
+
 # Errors during runtime
 VMError: TypeAlias = OOPLError
+
+# Errors while linking modules
+LinkError: TypeAlias = OOPLError
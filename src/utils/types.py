@@ -16,6 +16,15 @@ MemoryTypeNames = [
 ]
 Quadruple = Tuple[Operations, MemoryAddress, MemoryAddress, MemoryAddress]
 TypeAddress = Tuple[str, MemoryAddress, str | None]
+# Address of the index, lim_s and m of a dimension of an array access, and whether the index has to be checked
+ArrayDimension = Tuple[MemoryAddress, int, int, bool]
+# Base address of the array and its dimensions
+ArrayDescriptor = Tuple[MemoryAddress, Tuple[ArrayDimension, ...]]
+# First quadruple of the condition, the update and the body of a for loop, and the jump at the end of its body
+ForLoop = Tuple[int, int, int, int]
+# Position of an address among the addresses of the quadruples of a module, kind of relocation and the function
+# it refers to, -1 if none
+Relocation = Tuple[int, int, int]
 
 # For resource handling in functions
 NumBools: TypeAlias = int
@@ -29,4 +38,5 @@ ParamName: TypeAlias = str
 ParamList: TypeAlias = list[Tuple[str, MemoryAddress, ParamName]]
 
 # Classes
-ObjPropAddresses: TypeAlias = dict[str, Tuple[MemoryAddress, MemoryAddress]]
+# Pointer parameters of a method that hold where the attributes of each type of the object start
+ThisParams: TypeAlias = dict[str, MemoryAddress]
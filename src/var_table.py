@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Optional, TextIO
 
 from .array_info import ArrayInfo
 from .containers.dir import Dir
@@ -52,12 +52,19 @@ class VarTable(Dir[VarInfo]):
             var_string += f"<var_name:{key},var_info:{value}>\n"
         return var_string
 
-    def print(self, table_name: str, verbose: bool) -> None:
+    def print(
+        self, table_name: str, verbose: bool, stream: TextIO | None = None
+    ) -> None:
         """
         Print information of the table depending on verbose flag value.
+
+        Arguments:
+        table_name: str -- Name printed before the table.
+        verbose: bool -- Whether to print the table, which is only printed as comments.
+        stream: TextIO | None -- Stream to print to, the standard output if it is None.
         """
         if verbose:
-            print(f"# {table_name}")
+            print(f"# {table_name}", file=stream)
             var_string_list = self.__str__().split("\n")
             for value in var_string_list:
-                print(f"# {value}")
+                print(f"# {value}", file=stream)
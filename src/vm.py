@@ -1,40 +1,160 @@
-from typing import Tuple
-import sys
+import operator
+from typing import Callable, Sequence, Tuple
 
 from .func_dir import VMFuncDir
-from .memory import Memory
-from .quadruple_list import QuadrupleList
-from .utils.types import Resources, Quadruple, MemoryType, MemoryAddress
+from .memory_layout import Frame, MemoryLayout, converters
+from .semantic_cube import SemanticCube
+from .utils.types import (
+    ArrayDescriptor,
+    MemoryAddress,
+    MemoryType,
+    Quadruple,
+    Resources,
+)
 from .utils.enums import Operations
 from .utils.errors import VMError, OOPLErrorTypes
 
-start_global_memory = 1
-start_function_memory = 5001
-chunk_size = 1000
+# Address space of the object files that don't describe it: global memory starts at 1, function memory at
+# 5001, and each type has 1000 addresses.
+legacy_address_space = (1, 5001, 1000)
+
+# Segments of the VM memory. The callee segment holds the memory of the function being called between its
+# ERA and GOSUB quadruples, so parameters can be passed to it.
+GLOBAL = 0
+FUNCTION = 1
+CALLEE = 2
+
+# Position of pointers in Resources
+PTR_INDEX = 4
+
+# Pointers hold the frame, position and type index of the value they point to, and its address for errors.
+# They are resolved when they are created, so they can point to the memory of another function.
+Reference = Tuple[Frame, int, int, MemoryAddress]
+
+# A step executes one quadruple and returns the index of the next quadruple to execute.
+Step = Callable[[], int]
+# Builders receive the quadruple, the layouts of the function it belongs to and of the function being called,
+# the index of the next quadruple and the mask of its addresses that are known to be initialized.
+Builder = Callable[[Quadruple, MemoryLayout, MemoryLayout, int, int], Step]
+
+# Bits of the mask of initialized addresses of a quadruple.
+ADDR1 = 1
+ADDR2 = 2
+ADDR3 = 4
+
+binary_operations: dict[Operations, Callable[[MemoryType, MemoryType], MemoryType]] = {
+    Operations.AND: lambda left, right: left and right,
+    Operations.DIFF: operator.ne,
+    Operations.DIVIDES: operator.truediv,
+    Operations.EQ: operator.eq,
+    Operations.EQGT: operator.ge,
+    Operations.EQLT: operator.le,
+    Operations.GT: operator.gt,
+    Operations.LT: operator.lt,
+    Operations.MINUS: operator.sub,
+    Operations.OR: lambda left, right: left or right,
+    Operations.PLUS: operator.add,
+    Operations.TIMES: operator.mul,
+}
+
+# Typed operations already produce a value with the type of the address their result is stored in, so it is
+# not converted. Each one runs the same operation as its generic version, except for integer division.
+typed_operations: dict[Operations, Callable[[MemoryType, MemoryType], MemoryType]] = {
+    Operations.DIVIDES_II: lambda left, right: int(left / right),
+}
+for op_code in Operations:
+    if (generic := SemanticCube().get_generic(op_code)) is not op_code:
+        typed_operations.setdefault(op_code, binary_operations[generic])
+
+# Comparison made by each jump that is fused with one.
+fused_comparisons: dict[Operations, Operations] = {
+    Operations.GOTOF_LT: Operations.LT,
+    Operations.GOTOF_GT: Operations.GT,
+    Operations.GOTOF_EQLT: Operations.EQLT,
+    Operations.GOTOF_EQGT: Operations.EQGT,
+    Operations.GOTOF_EQ: Operations.EQ,
+    Operations.GOTOF_DIFF: Operations.DIFF,
+}
 
 
 class VM:
-    function_memory: Memory
+    arrays: list[ArrayDescriptor]
+    builders: dict[Operations, Builder]
+    chunk_size: int
+    empty_layout: MemoryLayout
     func_dir: VMFuncDir
-    global_memory: Memory
-    temp_memory: Memory
-    memory_stack: list[Tuple[Memory, int]]
-    quads: QuadrupleList
+    function_layout: MemoryLayout
+    global_layout: MemoryLayout
+    initialized: Sequence[int]
     last_return: MemoryType
+    layouts: dict[str, MemoryLayout]
+    memory: list[Frame]
+    memory_stack: list[Tuple[Frame, MemoryLayout, int]]
+    program: list[Step] | None
+    quads: Sequence[Quadruple]
+    start_function_memory: int
+    start_global_memory: int
 
     def __init__(self) -> None:
+        self.arrays = []
         self.func_dir = VMFuncDir()
+        self.initialized = []
+        self.layouts = {}
         self.memory_stack = []
+        self.program = None
+        self.quads = []
+        self.init_address_space(*legacy_address_space)
+        self.builders = {
+            Operations.ASSIGNOP: self.__assign,
+            Operations.ENDSUB: self.__endsub,
+            Operations.ERA: self.__era,
+            Operations.FIELDPTR: self.__fieldptr,
+            Operations.GOSUB: self.__gosub,
+            Operations.GOTO: self.__goto,
+            Operations.GOTOF: self.__gotof,
+            Operations.GOTOT: self.__gotot,
+            Operations.INDEX: self.__index,
+            Operations.OPT_ASSIGN: self.__opt_assign,
+            Operations.OPT_PARAM: self.__opt_param,
+            Operations.PARAM: self.__param,
+            Operations.PARAMPTR: self.__paramptr,
+            Operations.PRINT: self.__print,
+            Operations.READ: self.__read_input,
+            Operations.SAVEPTR: self.__saveptr,
+            Operations.VER: self.__ver,
+        }
+        for op_code in [*binary_operations, *typed_operations]:
+            self.builders[op_code] = self.__binary
+        for op_code in fused_comparisons:
+            self.builders[op_code] = self.__gotof_compare
+
+    def init_address_space(
+        self, start_global_memory: int, start_function_memory: int, chunk_size: int
+    ) -> None:
+        """
+        Set where the segments start and how many addresses each type has, as the compiler assigned them.
+
+        Arguments:
+        start_global_memory: int -- First address of the global memory.
+        start_function_memory: int -- First address of the function memory.
+        chunk_size: int -- Amount of addresses reserved for each type.
+        """
+        self.start_global_memory = start_global_memory
+        self.start_function_memory = start_function_memory
+        self.chunk_size = chunk_size
+        self.empty_layout = MemoryLayout(
+            start_function_memory, chunk_size, (0, 0, 0, 0, 0)
+        )
 
     def init_global_memory(self, global_resources: Resources) -> None:
         """
         Starting a global memory that will be accessible to all contexts.
         """
-        self.global_memory = Memory(start_global_memory, chunk_size, global_resources)
-        self.function_memory = Memory(
-            start_function_memory, chunk_size, (0, 0, 0, 0, 0)
+        self.global_layout = MemoryLayout(
+            self.start_global_memory, self.chunk_size, global_resources
         )
-        self.quads = QuadrupleList(self.global_memory)
+        self.function_layout = self.empty_layout
+        self.memory = [self.global_layout.new_frame(), [], []]
 
     def add_function(self, name: str, start_quad: int, resources: Resources):
         """
@@ -47,14 +167,43 @@ class VM:
         """
         self.func_dir.add(name, start_quad, resources)
 
-    def add_quadruple(self, quad: Quadruple):
+    def add_array(self, descriptor: ArrayDescriptor) -> None:
+        """
+        Insert the descriptor of an array access, which INDEX quadruples refer to by the address of an int
+        constant with its position.
+
+        Arguments:
+        descriptor: ArrayDescriptor -- Base address of the array and, for each dimension, the address of the
+        index, lim_s, m and whether the index has to be checked.
+        """
+        self.arrays.append(descriptor)
+        self.program = None
+
+    def add_quadruple(self, quad: Quadruple, initialized: int = 0):
         """
         Insert a new quadruple to list.
 
         Arguments:
         quad: Quarduple -- The quadruple to be inserted.
+        initialized: int -- Mask of the addresses that the compiler proved to be initialized, so they are not checked.
+        """
+        self.quads.append(quad)
+        self.initialized.append(initialized)
+        self.program = None
+
+    def set_quadruples(
+        self, quads: Sequence[Quadruple], initialized: Sequence[int]
+    ) -> None:
+        """
+        Replace the quadruple list with one that is read when each function is decoded.
+
+        Arguments:
+        quads: Sequence[Quadruple] -- The quadruples of the program.
+        initialized: Sequence[int] -- Mask of the addresses of each quadruple that were proven to be initialized.
         """
-        self.quads.add(quad)
+        self.quads = quads
+        self.initialized = initialized
+        self.program = None
 
     def set_global_variable(self, addr: int, val: MemoryType):
         """
@@ -64,186 +213,814 @@ class VM:
         addr: int -- The space in the global memory where the variable should be stored.
         val: MemoryType: The type of the variable asigned.
         """
-        self.global_memory[addr] = val
+        convert = converters[self.global_layout.type_index(addr)]
+        self.memory[GLOBAL][self.global_layout.offset(addr)] = convert(val)
 
-    def __get_memory(self, address: MemoryAddress | None):
+    def __global(self, address: MemoryAddress) -> MemoryType | None:
         """
-        Get either the global or function memory depending in which range the address is in.
+        Get the value stored in a global address.
+
+        Arguments:
+        address: MemoryAddress -- Address in the global memory.
+        """
+        return self.memory[GLOBAL][self.global_layout.offset(address)]
+
+    def __prepare(self) -> list[Tuple[int, int, MemoryLayout]]:
+        """
+        Build the layout of every function and fill the program with steps that decode the quadruples of a
+        function the first time it runs. Get the first quadruple, the quadruple after the last one and the
+        layout of each function, in order.
+        """
+        layouts = self.layouts
+        layouts.clear()
+        starts = []
+        for name, func_info in self.func_dir.dir.items():
+            layouts[name] = MemoryLayout(
+                self.start_function_memory, self.chunk_size, func_info.resources
+            )
+            starts.append((int(self.__global(func_info.start_quad)), layouts[name]))
+        starts.sort(key=lambda start: start[0])
+
+        # Functions are contiguous, so a quadruple belongs to the last function that started before it. The
+        # quadruples before the first function call main.
+        functions = []
+        bounds = [(0, self.empty_layout), *starts, (len(self.quads), None)]
+        for (start, layout), (end, _) in zip(bounds, bounds[1:]):
+            if start < end:
+                functions.append((start, end, layout))
+
+        program: list[Step] = [self.__end_of_program] * (len(self.quads) + 1)
+        for start, end, layout in functions:
+            program[start:end] = [self.__decoder(start, end, layout)] * (end - start)
+        self.program = program
+        return functions
+
+    def __decoder(self, start: int, end: int, layout: MemoryLayout) -> Step:
+        """
+        Get a step that decodes the quadruples of a function and goes back to its first quadruple to run it.
+        The quadruples of a function are only reached through the first one, either by calling it or by
+        falling from the previous function.
+
+        Arguments:
+        start: int -- First quadruple of the function.
+        end: int -- Quadruple after the last one of the function.
+        layout: MemoryLayout -- Layout of the function memory.
+        """
+
+        def step() -> int:
+            self.__decode_function(start, end, layout)
+            return start
+
+        return step
+
+    def __decode_function(self, start: int, end: int, layout: MemoryLayout) -> None:
+        """
+        Translate the quadruples of a function into steps, so running a quadruple does not need to look up its
+        operation code. Every address is resolved to its position in the memory of the function, and control
+        flow targets are linked to the index of the quadruple they go to.
+
+        Arguments:
+        start: int -- First quadruple of the function.
+        end: int -- Quadruple after the last one of the function.
+        layout: MemoryLayout -- Layout of the function memory.
+        """
+        program = self.program
+        callee = self.empty_layout
+        for index in range(start, end):
+            quad = self.quads[index]
+            op_code, addr1, addr2, addr3 = quad
+            match op_code:
+                case Operations.GOTO | Operations.GOTOF | Operations.GOTOT:
+                    addr3 = int(self.__global(addr3))
+                case Operations.ERA:
+                    callee = self.layouts[str(self.__global(addr3))]
+                case Operations.GOSUB:
+                    func_info = self.func_dir.get(str(self.__global(addr3)))
+                    addr3 = int(self.__global(func_info.start_quad))
+                case Operations.INDEX:
+                    addr1 = int(self.__global(addr1))
+                case _ if op_code in fused_comparisons:
+                    addr3 = int(self.__global(addr3))
+            if (builder := self.builders.get(op_code)) is None:
+                raise VMError(
+                    OOPLErrorTypes.UNKNOWN_QUADRUPLE,
+                    f"cannot handle unknown quadruple {quad}",
+                )
+            program[index] = builder(
+                (op_code, addr1, addr2, addr3),
+                layout,
+                callee,
+                index + 1,
+                self.initialized[index],
+            )
+
+    def decode(self) -> None:
+        """
+        Translate every quadruple into a step before running, instead of doing it when each function is
+        called for the first time.
+        """
+        for function in self.__prepare():
+            self.__decode_function(*function)
+
+    def __layout_of(self, address: MemoryAddress, layout: MemoryLayout):
+        """
+        Get either the global layout or the given function layout depending in which range the address is in.
+
+        Arguments:
+        address: MemoryAddress -- Address targeted.
+        layout: MemoryLayout -- Layout of the function memory.
+        """
+        return layout if address >= self.start_function_memory else self.global_layout
+
+    def __locate(
+        self, address: MemoryAddress, layout: MemoryLayout, segment: int = FUNCTION
+    ) -> Tuple[int, int]:
+        """
+        Get the segment and position of an address.
 
         Arguments:
         address: MemoryAddress -- Address targeted.
+        layout: MemoryLayout -- Layout of the function memory.
+        segment: int -- Segment that holds the function memory.
+        """
+        if address >= self.start_function_memory:
+            return segment, layout.offset(address)
+        else:
+            return GLOBAL, self.global_layout.offset(address)
+
+    def __is_ptr(self, address: MemoryAddress, layout: MemoryLayout) -> bool:
+        """
+        Check if an address of a quadruple holds a pointer. It only depends on its range, so it is known before
+        running.
+
+        Arguments:
+        address: MemoryAddress -- Address to check.
+        layout: MemoryLayout -- Layout of the function memory.
         """
         return (
-            self.function_memory
-            if address is not None and address >= start_function_memory
-            else self.global_memory
+            address != 0
+            and self.__layout_of(address, layout).type_index(address) == PTR_INDEX
         )
 
-    def __reserve_memory(self, func_address: MemoryAddress) -> None:
-        """ "
-        Reserve the memory for the function that is being called.
+    def __follow(self, address: MemoryAddress) -> Reference:
+        """
+        Get the reference stored in a pointer to an address of the current function or the global memory.
 
         Arguments:
-        func_address: MemoryAddress -- Address where the function name is stored.
+        address: MemoryAddress -- Address the pointer points to.
         """
-        self.temp_memory = Memory(
-            start_function_memory,
-            chunk_size,
-            self.func_dir.get(str(self.global_memory[func_address])).resources,
+        if address >= self.start_function_memory:
+            layout = self.function_layout
+            frame = self.memory[FUNCTION]
+        else:
+            layout = self.global_layout
+            frame = self.memory[GLOBAL]
+        type_index, index = divmod(address - layout.base_address, layout.chunk_size)
+        return frame, layout.starts[type_index] + index, type_index, address
+
+    def __uninitialized(self, address: MemoryAddress) -> None:
+        raise VMError(
+            OOPLErrorTypes.UNINITIALIZED_VARIABLE,
+            f"the variable at address {address} is uninitialized",
         )
 
-    def __restore_state(self) -> bool:
+    def __reader(
+        self, address: MemoryAddress, layout: MemoryLayout, check: bool = True
+    ) -> Callable[[], MemoryType | None]:
         """
-        Delete the temporary function memory that was being executed and reawaken the previous function memory.
-        If there is no other one, then notify to use global memory.
+        Get a function that reads the value of an address, following it if it is a pointer.
+
+        Arguments:
+        address: MemoryAddress -- Address to read from.
+        layout: MemoryLayout -- Layout of the function memory.
+        check: bool -- Whether reading an uninitialized value is an error.
         """
-        self.temp_memory.clear()
-        self.function_memory, self.quads.ptr = self.memory_stack.pop()
-        if len(self.memory_stack) == 0:
-            return True
+        memory = self.memory
+        segment, offset = self.__locate(address, layout)
+
+        if self.__is_ptr(address, layout):
+
+            def read() -> MemoryType | None:
+                frame, target_offset, _, target = memory[segment][offset]
+                if (value := frame[target_offset]) is None and check:
+                    self.__uninitialized(target)
+                return value
+
         else:
-            return False
 
-    def __save_state(self, func_address: MemoryAddress, mem: Memory) -> None:
+            def read() -> MemoryType | None:
+                if (value := memory[segment][offset]) is None and check:
+                    self.__uninitialized(address)
+                return value
+
+        return read
+
+    def __writer(
+        self,
+        address: MemoryAddress,
+        layout: MemoryLayout,
+        segment: int = FUNCTION,
+        follow: bool = True,
+    ) -> Callable[[MemoryType], None]:
         """
-        Store the previous function memory being used to change context to the new one. Also, go towards the
-        quadruples that correspond to the new one.
+        Get a function that stores a value in an address converting it to the type of the address, following
+        it if it is a pointer.
+
+        Arguments:
+        address: MemoryAddress -- Address to write to.
+        layout: MemoryLayout -- Layout of the function memory.
+        segment: int -- Segment that holds the function memory.
+        follow: bool -- Whether a pointer is followed or written itself.
         """
-        self.memory_stack.append((self.function_memory, self.quads.ptr))
-        self.function_memory = self.temp_memory
-        self.quads.ptr = int(
-            mem[self.func_dir.get(str(self.global_memory[func_address])).start_quad]
-        )
+        memory = self.memory
+        segment, offset = self.__locate(address, layout, segment)
 
-    def __check_none(self, l: list[Tuple[MemoryType, MemoryAddress]]) -> None:
-        for val, addr in l:
-            if val is None:
-                raise VMError(
-                    OOPLErrorTypes.UNINITIALIZED_VARIABLE,
-                    f"the variable at address {addr} is uninitialized",
+        if follow and self.__is_ptr(address, layout):
+
+            def write(value: MemoryType) -> None:
+                frame, target_offset, type_index, _ = memory[segment][offset]
+                frame[target_offset] = converters[type_index](value)
+
+        else:
+            convert = converters[self.__layout_of(address, layout).type_index(address)]
+
+            def write(value: MemoryType) -> None:
+                memory[segment][offset] = convert(value)
+
+        return write
+
+    def __binary(
+        self,
+        quad: Quadruple,
+        layout: MemoryLayout,
+        callee: MemoryLayout,
+        next_quad: int,
+        initialized: int,
+    ) -> Step:
+        op_code, addr1, addr2, addr3 = quad
+        if op_code in typed_operations:
+            operation = typed_operations[op_code]
+        else:
+            generic = binary_operations[op_code]
+            convert = converters[self.__layout_of(addr3, layout).type_index(addr3)]
+
+            def operation(left: MemoryType, right: MemoryType) -> MemoryType:
+                return convert(generic(left, right))
+
+        if any(self.__is_ptr(address, layout) for address in (addr1, addr2, addr3)):
+            read1 = self.__reader(addr1, layout, not initialized & ADDR1)
+            read2 = self.__reader(addr2, layout, not initialized & ADDR2)
+            write3 = self.__writer(addr3, layout)
+
+            def step() -> int:
+                write3(operation(read1(), read2()))
+                return next_quad
+
+            return step
+
+        # Most quadruples only use direct addresses, so they access the memory without any extra call.
+        memory = self.memory
+        segment1, offset1 = self.__locate(addr1, layout)
+        segment2, offset2 = self.__locate(addr2, layout)
+        segment3, offset3 = self.__locate(addr3, layout)
+
+        if initialized & (ADDR1 | ADDR2) == ADDR1 | ADDR2:
+
+            def step() -> int:
+                memory[segment3][offset3] = operation(
+                    memory[segment1][offset1], memory[segment2][offset2]
                 )
+                return next_quad
 
-    def run(self) -> MemoryType:
-        """
-        Carry out the operations described on the quadruples and also solve the expressions.
-        """
-        for quad in self.quads:
-            op_code, addr1, addr2, addr3 = quad
-            mem1 = self.__get_memory(addr1)
-            mem2 = self.__get_memory(addr2)
-            mem3 = self.__get_memory(addr3)
-
-            if addr1 != 0 and mem1.is_ptr(addr1):
-                temp_mem = self.__get_memory(int(mem1[addr1]))
-                addr1 = int(mem1[addr1])
-                mem1 = temp_mem
-            if addr2 != 0 and mem2.is_ptr(addr2):
-                temp_mem = self.__get_memory(int(mem2[addr2]))
-                addr2 = int(mem2[addr2])
-                mem2 = temp_mem
-            # When using arrays, the last element of a quadruple could be a pointer, so we need to check to obtain its content
-            if addr3 != 0 and mem3.is_ptr(addr3) and op_code is not Operations.SAVEPTR:
-                temp_mem = self.__get_memory(int(mem3[addr3]))
-                addr3 = int(mem3[addr3])
-                mem3 = temp_mem
-
-            # print((op_code, addr1, addr2, addr3))
+            return step
 
-            match op_code:
-                case Operations.PRINT:
-                    self.__check_none([(mem1[addr1], addr1)])
-                    print(mem1[addr1], end="")
-                case Operations.GOSUB:
-                    self.__save_state(addr3, mem1)
-                case Operations.ERA:
-                    self.__reserve_memory(addr3)
-                case Operations.GOTO:
-                    self.__check_none([(mem3[addr3], addr3)])
-                    self.quads.ptr = int(mem3[addr3])
-                case Operations.READ:
-                    mem3[addr3] = input()
-                case Operations.GOTOF:
-                    self.__check_none([(mem1[addr1], addr1), (mem3[addr3], addr3)])
-                    if not mem1[addr1]:
-                        self.quads.ptr = int(mem3[addr3])
-                case Operations.GOTOT:
-                    self.__check_none([(mem1[addr1], addr1), (mem3[addr3], addr3)])
-                    if mem1[addr1]:
-                        self.quads.ptr = int(mem3[addr3])
-                case Operations.ASSIGNOP:
-                    self.__check_none([(mem1[addr1], addr1)])
-                    self.last_return = mem1[addr1]
-                    mem3[addr3] = mem1[addr1]
-                case Operations.PARAM:
-                    # Need to use temporary memory to pass value from one context to another
-                    # (previous function to new one)
-                    self.__check_none([(mem1[addr1], addr1)])
-                    self.temp_memory[addr3] = mem1[addr1]
-                case Operations.OPT_ASSIGN:
-                    if mem1[addr1] is not None:
-                        mem3[addr3] = mem1[addr1]
-                case Operations.OPT_PARAM:
-                    if mem1[addr1] is not None:
-                        self.temp_memory[addr3] = mem1[addr1]
-                case Operations.SAVEPTR:
-                    self.__check_none([(mem1[addr1], addr1)])
-                    mem3.save_ptr(addr3, mem1[addr1])
-                case Operations.AND:
-                    self.__check_none([(mem1[addr1], addr1), (mem2[addr2], addr2)])
-                    mem3[addr3] = mem1[addr1] and mem2[addr2]
-                case Operations.DIFF:
-                    self.__check_none([(mem1[addr1], addr1), (mem2[addr2], addr2)])
-                    mem3[addr3] = mem1[addr1] != mem2[addr2]
-                case Operations.DIVIDES:
-                    self.__check_none([(mem1[addr1], addr1), (mem2[addr2], addr2)])
-                    mem3[addr3] = mem1[addr1] / mem2[addr2]
-                case Operations.EQ:
-                    self.__check_none([(mem1[addr1], addr1), (mem2[addr2], addr2)])
-                    mem3[addr3] = mem1[addr1] == mem2[addr2]
-                case Operations.EQGT:
-                    self.__check_none([(mem1[addr1], addr1), (mem2[addr2], addr2)])
-                    mem3[addr3] = mem1[addr1] >= mem2[addr2]
-                case Operations.EQLT:
-                    self.__check_none([(mem1[addr1], addr1), (mem2[addr2], addr2)])
-                    mem3[addr3] = mem1[addr1] <= mem2[addr2]
-                case Operations.GT:
-                    self.__check_none([(mem1[addr1], addr1), (mem2[addr2], addr2)])
-                    mem3[addr3] = mem1[addr1] > mem2[addr2]
-                case Operations.LT:
-                    self.__check_none([(mem1[addr1], addr1), (mem2[addr2], addr2)])
-                    mem3[addr3] = mem1[addr1] < mem2[addr2]
-                case Operations.MINUS:
-                    self.__check_none([(mem1[addr1], addr1), (mem2[addr2], addr2)])
-                    mem3[addr3] = mem1[addr1] - mem2[addr2]
-                case Operations.OR:
-                    self.__check_none([(mem1[addr1], addr1), (mem2[addr2], addr2)])
-                    mem3[addr3] = mem1[addr1] or mem2[addr2]
-                case Operations.PLUS:
-                    self.__check_none([(mem1[addr1], addr1), (mem2[addr2], addr2)])
-                    mem3[addr3] = mem1[addr1] + mem2[addr2]
-                case Operations.TIMES:
-                    self.__check_none([(mem1[addr1], addr1), (mem2[addr2], addr2)])
-                    mem3[addr3] = mem1[addr1] * mem2[addr2]
-                # Check that the value is not out of bounds of the dimension
-                case Operations.VER:
-                    self.__check_none(
-                        [
-                            (mem1[addr1], addr1),
-                            (mem2[addr2], addr2),
-                            (mem3[addr3], addr3),
-                        ]
+        def step() -> int:
+            left = memory[segment1][offset1]
+            right = memory[segment2][offset2]
+            if left is None:
+                self.__uninitialized(addr1)
+            if right is None:
+                self.__uninitialized(addr2)
+            memory[segment3][offset3] = operation(left, right)
+            return next_quad
+
+        return step
+
+    def __assign(
+        self,
+        quad: Quadruple,
+        layout: MemoryLayout,
+        callee: MemoryLayout,
+        next_quad: int,
+        initialized: int,
+    ) -> Step:
+        _, addr1, _, addr3 = quad
+        if initialized & ADDR1 and not (
+            self.__is_ptr(addr1, layout) or self.__is_ptr(addr3, layout)
+        ):
+            memory = self.memory
+            segment1, offset1 = self.__locate(addr1, layout)
+            segment3, offset3 = self.__locate(addr3, layout)
+            convert = converters[self.__layout_of(addr3, layout).type_index(addr3)]
+
+            def step() -> int:
+                self.last_return = memory[segment1][offset1]
+                memory[segment3][offset3] = convert(self.last_return)
+                return next_quad
+
+            return step
+
+        read1 = self.__reader(addr1, layout, not initialized & ADDR1)
+        write3 = self.__writer(addr3, layout)
+
+        def step() -> int:
+            self.last_return = read1()
+            write3(self.last_return)
+            return next_quad
+
+        return step
+
+    def __param(
+        self,
+        quad: Quadruple,
+        layout: MemoryLayout,
+        callee: MemoryLayout,
+        next_quad: int,
+        initialized: int,
+    ) -> Step:
+        # Need to use the memory of the function being called to pass value from one context to another
+        # (previous function to new one)
+        _, addr1, _, addr3 = quad
+        read1 = self.__reader(addr1, layout, not initialized & ADDR1)
+        write3 = self.__writer(addr3, callee, CALLEE)
+
+        def step() -> int:
+            write3(read1())
+            return next_quad
+
+        return step
+
+    def __opt_assign(
+        self,
+        quad: Quadruple,
+        layout: MemoryLayout,
+        callee: MemoryLayout,
+        next_quad: int,
+        initialized: int,
+    ) -> Step:
+        _, addr1, _, addr3 = quad
+        read1 = self.__reader(addr1, layout, False)
+        write3 = self.__writer(addr3, layout)
+
+        def step() -> int:
+            if (value := read1()) is not None:
+                write3(value)
+            return next_quad
+
+        return step
+
+    def __opt_param(
+        self,
+        quad: Quadruple,
+        layout: MemoryLayout,
+        callee: MemoryLayout,
+        next_quad: int,
+        initialized: int,
+    ) -> Step:
+        _, addr1, _, addr3 = quad
+        read1 = self.__reader(addr1, layout, False)
+        write3 = self.__writer(addr3, callee, CALLEE)
+
+        def step() -> int:
+            if (value := read1()) is not None:
+                write3(value)
+            return next_quad
+
+        return step
+
+    def __saveptr(
+        self,
+        quad: Quadruple,
+        layout: MemoryLayout,
+        callee: MemoryLayout,
+        next_quad: int,
+        initialized: int,
+    ) -> Step:
+        _, addr1, _, addr3 = quad
+        read1 = self.__reader(addr1, layout, not initialized & ADDR1)
+        memory = self.memory
+        segment3, offset3 = self.__locate(addr3, layout)
+
+        def step() -> int:
+            memory[segment3][offset3] = self.__follow(int(read1()))
+            return next_quad
+
+        return step
+
+    def __fieldptr(
+        self,
+        quad: Quadruple,
+        layout: MemoryLayout,
+        callee: MemoryLayout,
+        next_quad: int,
+        initialized: int,
+    ) -> Step:
+        _, addr1, addr2, addr3 = quad
+        read2 = self.__reader(addr2, layout, not initialized & ADDR2)
+        memory = self.memory
+        segment1, offset1 = self.__locate(addr1, layout)
+        segment3, offset3 = self.__locate(addr3, layout)
+
+        def step() -> int:
+            frame, offset, type_index, address = memory[segment1][offset1]
+            index = int(read2())
+            memory[segment3][offset3] = (
+                frame,
+                offset + index,
+                type_index,
+                address + index,
+            )
+            return next_quad
+
+        return step
+
+    def __paramptr(
+        self,
+        quad: Quadruple,
+        layout: MemoryLayout,
+        callee: MemoryLayout,
+        next_quad: int,
+        initialized: int,
+    ) -> Step:
+        _, addr1, _, addr3 = quad
+        memory = self.memory
+        segment1, offset1 = self.__locate(addr1, layout)
+        segment3, offset3 = self.__locate(addr3, callee, CALLEE)
+
+        if self.__is_ptr(addr1, layout):
+            # The reference is passed along as it is.
+            def step() -> int:
+                memory[segment3][offset3] = memory[segment1][offset1]
+                return next_quad
+
+            return step
+
+        type_index = self.__layout_of(addr1, layout).type_index(addr1)
+
+        def step() -> int:
+            memory[segment3][offset3] = (
+                memory[segment1],
+                offset1,
+                type_index,
+                addr1,
+            )
+            return next_quad
+
+        return step
+
+    def __print(
+        self,
+        quad: Quadruple,
+        layout: MemoryLayout,
+        callee: MemoryLayout,
+        next_quad: int,
+        initialized: int,
+    ) -> Step:
+        read1 = self.__reader(quad[1], layout, not initialized & ADDR1)
+
+        def step() -> int:
+            print(read1(), end="")
+            return next_quad
+
+        return step
+
+    def __read_input(
+        self,
+        quad: Quadruple,
+        layout: MemoryLayout,
+        callee: MemoryLayout,
+        next_quad: int,
+        initialized: int,
+    ) -> Step:
+        write3 = self.__writer(quad[3], layout)
+
+        def step() -> int:
+            write3(input())
+            return next_quad
+
+        return step
+
+    def __ver(
+        self,
+        quad: Quadruple,
+        layout: MemoryLayout,
+        callee: MemoryLayout,
+        next_quad: int,
+        initialized: int,
+    ) -> Step:
+        # Check that the value is not out of bounds of the dimension
+        _, addr1, addr2, addr3 = quad
+        read1 = self.__reader(addr1, layout, not initialized & ADDR1)
+        read2 = self.__reader(addr2, layout, not initialized & ADDR2)
+        read3 = self.__reader(addr3, layout, not initialized & ADDR3)
+
+        def step() -> int:
+            index = read1()
+            lower = read2()
+            upper = read3()
+            if not (lower <= index and index < upper):
+                raise Exception("Out of bounds error.")
+            return next_quad
+
+        return step
+
+    def __index(
+        self,
+        quad: Quadruple,
+        layout: MemoryLayout,
+        callee: MemoryLayout,
+        next_quad: int,
+        initialized: int,
+    ) -> Step:
+        _, number, _, addr3 = quad
+        base, dims = self.arrays[number]
+        memory = self.memory
+        segment, offset = self.__locate(base, layout)
+        type_index = self.__layout_of(base, layout).type_index(base)
+        segment3, offset3 = self.__locate(addr3, layout)
+        direct = not any(self.__is_ptr(index, layout) for index, _, _, _ in dims)
+
+        if direct and len(dims) <= 2 and not any(checked for _, _, _, checked in dims):
+            # The compiler proved that these indexes are initialized ints within bounds, so only the
+            # position is computed.
+            (index1, _, m1, _), *rest = dims
+            segment1, offset1 = self.__locate(index1, layout)
+            if len(rest) == 0:
+
+                def step() -> int:
+                    position = memory[segment1][offset1]
+                    memory[segment3][offset3] = (
+                        memory[segment],
+                        offset + position,
+                        type_index,
+                        base + position,
                     )
-                    if not (mem2[addr2] <= mem1[addr1] and mem1[addr1] < mem3[addr3]):
+                    return next_quad
+
+                return step
+
+            [(index2, _, _, _)] = rest
+            segment2, offset2 = self.__locate(index2, layout)
+
+            def step() -> int:
+                position = memory[segment1][offset1] * m1 + memory[segment2][offset2]
+                memory[segment3][offset3] = (
+                    memory[segment],
+                    offset + position,
+                    type_index,
+                    base + position,
+                )
+                return next_quad
+
+            return step
+
+        if direct and len(dims) <= 2 and all(checked for _, _, _, checked in dims):
+            # Most accesses use one or two direct indexes, so they are read without any extra call.
+            (index1, lim_s1, m1, _), *rest = dims
+            segment1, offset1 = self.__locate(index1, layout)
+            if len(rest) == 0:
+
+                def step() -> int:
+                    if (value1 := memory[segment1][offset1]) is None:
+                        self.__uninitialized(index1)
+                    if not (0 <= value1 and value1 < lim_s1):
                         raise Exception("Out of bounds error.")
-                case Operations.ENDSUB:
-                    if op_code is Operations.ENDSUB:
-                        if self.__restore_state():
-                            return self.last_return
-                case _:
-                    raise VMError(
-                        OOPLErrorTypes.UNKNOWN_QUADRUPLE,
-                        f"cannot handle unknown quadruple {quad}",
+                    position = int(value1)
+                    memory[segment3][offset3] = (
+                        memory[segment],
+                        offset + position,
+                        type_index,
+                        base + position,
                     )
+                    return next_quad
+
+                return step
+
+            [(index2, lim_s2, _, _)] = rest
+            segment2, offset2 = self.__locate(index2, layout)
+
+            def step() -> int:
+                if (value1 := memory[segment1][offset1]) is None:
+                    self.__uninitialized(index1)
+                if (value2 := memory[segment2][offset2]) is None:
+                    self.__uninitialized(index2)
+                if not (0 <= value1 and value1 < lim_s1):
+                    raise Exception("Out of bounds error.")
+                if not (0 <= value2 and value2 < lim_s2):
+                    raise Exception("Out of bounds error.")
+                position = int(value1 * m1) + int(value2)
+                memory[segment3][offset3] = (
+                    memory[segment],
+                    offset + position,
+                    type_index,
+                    base + position,
+                )
+                return next_quad
+
+            return step
+
+        reads = [
+            (self.__reader(index, layout, checked), lim_s, m, checked)
+            for index, lim_s, m, checked in dims
+        ]
+
+        def step() -> int:
+            position = 0
+            for read, lim_s, m, checked in reads:
+                index = read()
+                if checked and not (0 <= index and index < lim_s):
+                    raise Exception("Out of bounds error.")
+                position += int(index * m)
+            memory[segment3][offset3] = (
+                memory[segment],
+                offset + position,
+                type_index,
+                base + position,
+            )
+            return next_quad
+
+        return step
+
+    def __goto(
+        self,
+        quad: Quadruple,
+        layout: MemoryLayout,
+        callee: MemoryLayout,
+        next_quad: int,
+        initialized: int,
+    ) -> Step:
+        target = quad[3]
+
+        def step() -> int:
+            return target
+
+        return step
+
+    def __gotof(
+        self,
+        quad: Quadruple,
+        layout: MemoryLayout,
+        callee: MemoryLayout,
+        next_quad: int,
+        initialized: int,
+    ) -> Step:
+        target = quad[3]
+        if initialized & ADDR1 and not self.__is_ptr(quad[1], layout):
+            memory = self.memory
+            segment1, offset1 = self.__locate(quad[1], layout)
+
+            def step() -> int:
+                return next_quad if memory[segment1][offset1] else target
+
+            return step
+
+        read1 = self.__reader(quad[1], layout)
+
+        def step() -> int:
+            return next_quad if read1() else target
+
+        return step
+
+    def __gotof_compare(
+        self,
+        quad: Quadruple,
+        layout: MemoryLayout,
+        callee: MemoryLayout,
+        next_quad: int,
+        initialized: int,
+    ) -> Step:
+        op_code, addr1, addr2, target = quad
+        compare = binary_operations[fused_comparisons[op_code]]
+        if initialized & (ADDR1 | ADDR2) == ADDR1 | ADDR2 and not (
+            self.__is_ptr(addr1, layout) or self.__is_ptr(addr2, layout)
+        ):
+            memory = self.memory
+            segment1, offset1 = self.__locate(addr1, layout)
+            segment2, offset2 = self.__locate(addr2, layout)
+
+            def step() -> int:
+                if compare(memory[segment1][offset1], memory[segment2][offset2]):
+                    return next_quad
+                return target
+
+            return step
+
+        read1 = self.__reader(addr1, layout, not initialized & ADDR1)
+        read2 = self.__reader(addr2, layout, not initialized & ADDR2)
+
+        def step() -> int:
+            return next_quad if compare(read1(), read2()) else target
+
+        return step
+
+    def __gotot(
+        self,
+        quad: Quadruple,
+        layout: MemoryLayout,
+        callee: MemoryLayout,
+        next_quad: int,
+        initialized: int,
+    ) -> Step:
+        read1 = self.__reader(quad[1], layout, not initialized & ADDR1)
+        target = quad[3]
+
+        def step() -> int:
+            return target if read1() else next_quad
+
+        return step
+
+    def __era(
+        self,
+        quad: Quadruple,
+        layout: MemoryLayout,
+        callee: MemoryLayout,
+        next_quad: int,
+        initialized: int,
+    ) -> Step:
+        # Reserve the memory for the function that is being called.
+        memory = self.memory
+
+        def step() -> int:
+            memory[CALLEE] = callee.acquire()
+            return next_quad
+
+        return step
+
+    def __gosub(
+        self,
+        quad: Quadruple,
+        layout: MemoryLayout,
+        callee: MemoryLayout,
+        next_quad: int,
+        initialized: int,
+    ) -> Step:
+        # Store the function memory being used to change context to the one of the called function. Also, go
+        # towards the quadruples that correspond to it.
+        memory = self.memory
+        start_quad = quad[3]
+
+        def step() -> int:
+            self.memory_stack.append(
+                (memory[FUNCTION], self.function_layout, next_quad)
+            )
+            memory[FUNCTION] = memory[CALLEE]
+            self.function_layout = callee
+            return start_quad
+
+        return step
+
+    def __endsub(
+        self,
+        quad: Quadruple,
+        layout: MemoryLayout,
+        callee: MemoryLayout,
+        next_quad: int,
+        initialized: int,
+    ) -> Step:
+        # Reawaken the previous function memory. If there is no other one, the program is finished.
+        memory = self.memory
+
+        def step() -> int:
+            # The frame of the function that ends can't be reached anymore, so it is recycled.
+            self.function_layout.release(memory[FUNCTION])
+            memory[FUNCTION], self.function_layout, return_quad = (
+                self.memory_stack.pop()
+            )
+            return return_quad if len(self.memory_stack) > 0 else -1
+
+        return step
+
+    def __end_of_program(self) -> int:
         raise VMError(
             OOPLErrorTypes.EMPTY_QUADRUPLES, "cannot run on an empty quadruple list"
         )
+
+    def frame_pool_stats(self) -> dict[str, Tuple[int, int]]:
+        """
+        Get the amount of frames that each function reused from its pool and the amount it had to create.
+        """
+        return {
+            name: (layout.hits, layout.misses) for name, layout in self.layouts.items()
+        }
+
+    def run(self) -> MemoryType:
+        """
+        Carry out the operations described on the quadruples and also solve the expressions.
+        """
+        if self.program is None:
+            self.__prepare()
+        program = self.program
+        quad = 0
+        while quad >= 0:
+            quad = program[quad]()
+        return self.last_return